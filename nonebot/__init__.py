@@ -53,8 +53,14 @@ from nonebot.compat import model_dump
 from nonebot.log import logger as logger
 from nonebot.adapters import Bot, Adapter
 from nonebot.config import DOTENV_TYPE, Env, Config
-from nonebot.utils import escape_tag, resolve_dot_notation
+from nonebot.log import use_log_queue, event_log_sampler
 from nonebot.drivers import Driver, ASGIMixin, combine_driver
+from nonebot.utils import (
+    escape_tag,
+    resolve_dot_notation,
+    shutdown_sync_executors,
+    configure_sync_executors,
+)
 
 try:
     __version__ = version("nonebot2")
@@ -307,6 +313,9 @@ def init(*, _env_file: Optional[DOTENV_TYPE] = None, **kwargs: Any) -> None:
         logger.configure(
             extra={"nonebot_log_level": config.log_level}, patcher=_log_patcher
         )
+        if config.log_queue:
+            use_log_queue()
+        event_log_sampler.rate = config.log_event_sampling
         logger.opt(colors=True).info(
             f"Current <y><b>Env: {escape_tag(env.environment)}</b></y>"
         )
@@ -314,8 +323,48 @@ def init(*, _env_file: Optional[DOTENV_TYPE] = None, **kwargs: Any) -> None:
             f"Loaded <y><b>Config</b></y>: {escape_tag(str(model_dump(config)))}"
         )
 
+        configure_sync_executors(
+            config.sync_policies,
+            config.sync_thread_workers,
+            config.sync_process_workers,
+        )
+
         DriverClass = _resolve_combine_expr(config.driver)
         _driver = DriverClass(env, config)
+        _driver.on_shutdown(shutdown_sync_executors)
+
+        from nonebot.matcher import matchers
+        from nonebot.message import metrics, get_event_batcher, get_event_scheduler
+
+        _driver.on_startup(matchers.expiry.start)
+        _driver.on_shutdown(matchers.expiry.stop)
+
+        scheduler = get_event_scheduler()
+        scheduler.configure(
+            max_concurrency=config.event_concurrency,
+            bot_concurrency=config.event_bot_concurrency,
+            plugin_concurrency=config.event_plugin_concurrency,
+            queue_size=config.event_queue_size,
+            overload_policy=config.event_overload_policy,
+        )
+        _driver.on_shutdown(scheduler.shutdown)
+
+        batcher = get_event_batcher()
+        batcher.configure(
+            max_batch_size=config.event_batch_size,
+            max_delay=config.event_batch_delay.total_seconds(),
+        )
+        _driver.on_shutdown(batcher.shutdown)
+
+        metrics.enable(config.metrics)
+        if config.metrics and config.metrics_path is not None:
+            if isinstance(_driver, ASGIMixin):
+                metrics.setup_http_server(_driver, config.metrics_path)
+            else:
+                logger.warning(
+                    f"Driver {_driver.type} does not support http server, "
+                    "metrics endpoint is not available"
+                )
 
 
 def run(*args: Any, **kwargs: Any) -> None:
@@ -331,7 +380,14 @@ def run(*args: Any, **kwargs: Any) -> None:
         ```
     """
     logger.success("Running NoneBot...")
-    get_driver().run(*args, **kwargs)
+    driver = get_driver()
+    if driver.config.dispatch_workers:
+        from nonebot.worker import WorkerPool
+
+        WorkerPool(
+            driver.config.dispatch_workers, driver.config.dispatch_worker_initializer
+        ).install(driver)
+    driver.run(*args, **kwargs)
 
 
 from nonebot.plugin import on as on
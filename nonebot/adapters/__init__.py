@@ -11,8 +11,10 @@ from nonebot.internal.adapter import Bot as Bot
 from nonebot.internal.adapter import Event as Event
 from nonebot.internal.adapter import Adapter as Adapter
 from nonebot.internal.adapter import Message as Message
+from nonebot.internal.adapter import MessageBuilder as MessageBuilder
 from nonebot.internal.adapter import MessageSegment as MessageSegment
 from nonebot.internal.adapter import MessageTemplate as MessageTemplate
+from nonebot.internal.adapter import CompactMessageSegment as CompactMessageSegment
 
 __autodoc__ = {
     "Bot": True,
@@ -26,4 +28,6 @@ __autodoc__ = {
     "MessageSegment.__str__": True,
     "MessageSegment.__add__": True,
     "MessageTemplate": True,
+    "MessageBuilder": True,
+    "CompactMessageSegment": True,
 }
@@ -7,6 +7,7 @@ FrontMatter:
     description: nonebot.compat 模块
 """
 
+from weakref import WeakKeyDictionary
 from dataclasses import dataclass, is_dataclass
 from typing_extensions import Self, Annotated, get_args, get_origin, is_typeddict
 from typing import (
@@ -151,6 +152,27 @@ if PYDANTIC_V2:  # pragma: pydantic-v2
             """Get the default value of the field."""
             return self.field_info.get_default(call_default_factory=True)
 
+        def _type_adapter(self, config: Optional[ConfigDict]) -> TypeAdapter[Any]:
+            """Get the cached TypeAdapter of the field for the given config.
+
+            Building a TypeAdapter is expensive, reuse it for every validation.
+            """
+            try:
+                key = None if config is None else frozenset(config.items())
+            except TypeError:
+                # config with unhashable values is not cached
+                return self._build_type_adapter(config)
+            adapters = _type_adapters.setdefault(self, {})
+            if (adapter := adapters.get(key)) is None:
+                adapter = adapters[key] = self._build_type_adapter(config)
+            return adapter
+
+        def _build_type_adapter(self, config: Optional[ConfigDict]) -> TypeAdapter[Any]:
+            type: Any = Annotated[self.annotation, self.field_info]
+            return TypeAdapter(
+                type, config=None if self._annotation_has_config() else config
+            )
+
         def _type_display(self):
             """Get the display of the type of the field."""
             return display_as_type(self.annotation)
@@ -160,6 +182,11 @@ if PYDANTIC_V2:  # pragma: pydantic-v2
             # to allow store them in a set.
             return id(self)
 
+    _type_adapters: "WeakKeyDictionary[ModelField, Dict[Any, TypeAdapter[Any]]]" = (
+        WeakKeyDictionary()
+    )
+    """TypeAdapter cache of fields, keyed by field and config"""
+
     def extract_field_info(field_info: BaseFieldInfo) -> Dict[str, Any]:
         """Get FieldInfo init kwargs from a FieldInfo instance."""
 
@@ -171,10 +198,7 @@ if PYDANTIC_V2:  # pragma: pydantic-v2
         model_field: ModelField, value: Any, config: Optional[ConfigDict] = None
     ) -> Any:
         """Validate the value pass to the field."""
-        type: Any = Annotated[model_field.annotation, model_field.field_info]
-        return TypeAdapter(
-            type, config=None if model_field._annotation_has_config() else config
-        ).validate_python(value)
+        return model_field._type_adapter(config).validate_python(value)
 
     def model_fields(model: Type[BaseModel]) -> List[ModelField]:
         """Get field list of a model."""
@@ -37,7 +37,8 @@ from pydantic.networks import IPvAnyAddress
 
 from nonebot.log import logger
 from nonebot.typing import origin_is_union
-from nonebot.utils import deep_update, type_is_complex, lenient_issubclass
+from nonebot.internal.scheduler import OverloadPolicy
+from nonebot.utils import SyncPolicy, deep_update, type_is_complex, lenient_issubclass
 from nonebot.compat import (
     PYDANTIC_V2,
     ConfigDict,
@@ -420,6 +421,19 @@ class Config(BaseSettings):
         LOG_LEVEL=INFO
         ```
     """
+    log_queue: bool = False
+    """是否使用非阻塞日志输出，日志将放入队列后由后台线程写入 stdout。
+
+    参考 {ref}`nonebot.log.use_log_queue`。
+    """
+    log_event_sampling: int = Field(default=1, ge=1)
+    """事件日志采样间隔，每 N 个事件仅输出一次事件接收与处理流程日志。
+
+    用法:
+        ```conf
+        LOG_EVENT_SAMPLING=100
+        ```
+    """
 
     # bot connection configs
     api_timeout: Optional[float] = 30.0
@@ -466,6 +480,79 @@ class Config(BaseSettings):
         ```
     """
 
+    sync_policies: Dict[str, SyncPolicy] = {}
+    """同步函数的执行方式，参考 {ref}`nonebot.utils.SyncPolicy`。
+
+    键为函数名 `module:qualname`，优先于 {ref}`nonebot.utils.sync_policy` 装饰器。
+
+    用法:
+        ```conf
+        SYNC_POLICIES={"my_plugin:is_admin": "inline"}
+        ```
+    """
+    sync_thread_workers: Optional[int] = None
+    """同步函数独立线程池的最大线程数，默认由 Python 决定。"""
+    sync_process_workers: Optional[int] = None
+    """同步函数进程池的最大进程数，默认为 CPU 核心数。"""
+
+    event_concurrency: Optional[int] = None
+    """同时处理的事件数量上限，默认不限制。"""
+    event_bot_concurrency: Optional[int] = None
+    """单个机器人同时处理的事件数量上限，默认不限制。"""
+    event_plugin_concurrency: Optional[int] = None
+    """单个插件同时运行的事件响应器数量上限，默认不限制。"""
+    event_queue_size: int = 1024
+    """等待处理的事件队列长度上限。"""
+    event_overload_policy: OverloadPolicy = "drop_oldest"
+    """事件队列已满时的处理方式，参考 {ref}`nonebot.message.OverloadPolicy`。
+
+    用法:
+        ```conf
+        EVENT_CONCURRENCY=64
+        EVENT_OVERLOAD_POLICY=drop_meta_event
+        ```
+    """
+
+    event_batch_size: int = 32
+    """事件微批处理的批次大小上限。"""
+    event_batch_delay: timedelta = timedelta(milliseconds=5)
+    """事件在微批处理缓冲区中的最长等待时长。
+
+    用法:
+        ```conf
+        EVENT_BATCH_DELAY=0.01
+        ```
+    """
+
+    dispatch_workers: int = 0
+    """事件分发工作进程数量，参考 {ref}`nonebot.worker.WorkerPool`。
+
+    大于 `0` 时，所有经由 {ref}`nonebot.message.handle_event` 处理的事件
+    (包括事件调度器与微批处理器提交的事件) 都将被转发至工作进程处理；
+    为 `0` 时在驱动器进程中处理事件。
+    """
+    dispatch_worker_initializer: Optional[str] = None
+    """事件分发工作进程初始化函数，格式为 `module:function`。
+
+    用法:
+        ```conf
+        DISPATCH_WORKERS=4
+        DISPATCH_WORKER_INITIALIZER=bot:init_worker
+        ```
+    """
+
+    metrics: bool = False
+    """是否开启事件处理耗时统计，参考 {ref}`nonebot.message.Metrics`。"""
+    metrics_path: Optional[str] = None
+    """Prometheus 指标接口路径，仅在开启耗时统计且驱动器支持 ASGI 时生效。
+
+    用法:
+        ```conf
+        METRICS=true
+        METRICS_PATH=/metrics
+        ```
+    """
+
     # adapter configs
     # adapter configs are defined in adapter/config.py
 
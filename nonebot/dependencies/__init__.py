@@ -18,6 +18,7 @@ from typing import (
     Generic,
     TypeVar,
     Callable,
+    ClassVar,
     Iterable,
     Optional,
     Awaitable,
@@ -27,10 +28,10 @@ from typing import (
 from nonebot.log import logger
 from nonebot.typing import _DependentCallable
 from nonebot.exception import SkippedException
-from nonebot.utils import run_sync, is_coroutine_callable
 from nonebot.compat import FieldInfo, ModelField, PydanticUndefined
+from nonebot.utils import CachedSyncPolicy, run_sync_with_policy, is_coroutine_callable
 
-from .utils import check_field_type, get_typed_signature
+from .utils import check_field_type, field_needs_check, get_typed_signature
 
 R = TypeVar("R")
 T = TypeVar("T", bound="Dependent")
@@ -58,6 +59,11 @@ class Param(abc.ABC, FieldInfo):
     ) -> Optional["Param"]:
         return
 
+    _lookup_key: ClassVar[Optional[str]] = None
+    """参数值直接取自同名调用参数时的参数名，无需调用 `_solve`"""
+    _concurrent: ClassVar[bool] = False
+    """存在多个此类参数时是否并发解析"""
+
     @abc.abstractmethod
     async def _solve(self, **kwargs: Any) -> Any:
         raise NotImplementedError
@@ -65,6 +71,61 @@ class Param(abc.ABC, FieldInfo):
     async def _check(self, **kwargs: Any) -> None:
         return
 
+    def _needs_check(self) -> bool:
+        """是否需要执行 `_check`"""
+        return type(self)._check is not Param._check
+
+
+@dataclass(frozen=True)
+class CallPlan:
+    """依赖注入容器的调用计划，在解析时编译以避免每次调用时的重复检查。
+
+    参数:
+        is_coroutine: 可调用对象是否为协程函数
+        checks: 需要执行预检查的参数
+        lookups: 直接取自调用参数的字段及其参数名
+        fields: 需要依次解析的字段及其是否需要类型检查
+        depends: 需要解析的子依赖字段及其是否需要类型检查
+        sync_policy: 同步函数的执行方式
+    """
+
+    is_coroutine: bool
+    checks: Tuple[Param, ...]
+    lookups: Tuple[Tuple[ModelField, str], ...]
+    fields: Tuple[Tuple[ModelField, bool], ...]
+    depends: Tuple[Tuple[ModelField, bool], ...]
+    sync_policy: CachedSyncPolicy
+
+    @classmethod
+    def compile(
+        cls,
+        call: Callable[..., Any],
+        params: Tuple[ModelField, ...],
+        parameterless: Tuple[Param, ...],
+    ) -> "CallPlan":
+        checks = [param for param in parameterless if param._needs_check()]
+        lookups: List[Tuple[ModelField, str]] = []
+        fields: List[Tuple[ModelField, bool]] = []
+        depends: List[Tuple[ModelField, bool]] = []
+        for model_field in params:
+            param = cast(Param, model_field.field_info)
+            if param._needs_check():
+                checks.append(param)
+            if param._lookup_key is not None:
+                lookups.append((model_field, param._lookup_key))
+            elif param._concurrent:
+                depends.append((model_field, field_needs_check(model_field)))
+            else:
+                fields.append((model_field, field_needs_check(model_field)))
+        return cls(
+            is_coroutine_callable(call),
+            tuple(checks),
+            tuple(lookups),
+            tuple(fields),
+            tuple(depends),
+            CachedSyncPolicy(call),
+        )
+
 
 @dataclass(frozen=True)
 class Dependent(Generic[R]):
@@ -81,6 +142,16 @@ class Dependent(Generic[R]):
     call: _DependentCallable[R]
     params: Tuple[ModelField, ...] = field(default_factory=tuple)
     parameterless: Tuple[Param, ...] = field(default_factory=tuple)
+    _plan: CallPlan = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_plan",
+            CallPlan.compile(
+                cast(Callable[..., Any], self.call), self.params, self.parameterless
+            ),
+        )
 
     def __repr__(self) -> str:
         if inspect.isfunction(self.call) or inspect.isclass(self.call):
@@ -96,16 +167,20 @@ class Dependent(Generic[R]):
     async def __call__(self, **kwargs: Any) -> R:
         try:
             # do pre-check
-            await self.check(**kwargs)
+            if self._plan.checks:
+                await self.check(**kwargs)
 
             # solve param values
             values = await self.solve(**kwargs)
 
             # call function
-            if is_coroutine_callable(self.call):
+            if self._plan.is_coroutine:
                 return await cast(Callable[..., Awaitable[R]], self.call)(**values)
-            else:
-                return await run_sync(cast(Callable[..., R], self.call))(**values)
+            return await run_sync_with_policy(
+                self._plan.sync_policy.get(),
+                cast(Callable[..., R], self.call),
+                **values,
+            )
         except SkippedException as e:
             logger.trace(f"{self} skipped due to {e}")
             raise
@@ -176,16 +251,18 @@ class Dependent(Generic[R]):
         return cls(call, params, parameterless_params)
 
     async def check(self, **params: Any) -> None:
-        await asyncio.gather(*(param._check(**params) for param in self.parameterless))
-        await asyncio.gather(
-            *(cast(Param, param.field_info)._check(**params) for param in self.params)
-        )
+        for param in self._plan.checks:
+            await param._check(**params)
 
-    async def _solve_field(self, field: ModelField, params: Dict[str, Any]) -> Any:
+    async def _solve_field(
+        self, field: ModelField, params: Dict[str, Any], check: bool = True
+    ) -> Any:
         param = cast(Param, field.field_info)
         value = await param._solve(**params)
         if value is PydanticUndefined:
             value = field.get_default()
+        if not check:
+            return value
         v = check_field_type(field, value)
         return v if param.validate else value
 
@@ -195,10 +272,34 @@ class Dependent(Generic[R]):
             await param._solve(**params)
 
         # solve param values
-        values = await asyncio.gather(
-            *(self._solve_field(field, params) for field in self.params)
-        )
-        return {field.name: value for field, value in zip(self.params, values)}
+        plan = self._plan
+        values: Dict[str, Any] = {}
+        for model_field, key in plan.lookups:
+            if key in params:
+                values[model_field.name] = params[key]
+            else:
+                values[model_field.name] = await self._solve_field(model_field, params)
+        for model_field, check in plan.fields:
+            values[model_field.name] = await self._solve_field(
+                model_field, params, check
+            )
+
+        # solve sub dependencies concurrently only when necessary
+        if len(plan.depends) == 1:
+            model_field, check = plan.depends[0]
+            values[model_field.name] = await self._solve_field(
+                model_field, params, check
+            )
+        elif plan.depends:
+            results = await asyncio.gather(
+                *(
+                    self._solve_field(model_field, params, check)
+                    for model_field, check in plan.depends
+                )
+            )
+            for (model_field, _), value in zip(plan.depends, results):
+                values[model_field.name] = value
+        return values
 
 
 __autodoc__ = {"CustomConfig": False}
@@ -47,6 +47,14 @@ def get_typed_annotation(param: inspect.Parameter, globalns: Dict[str, Any]) ->
     return annotation
 
 
+def field_needs_check(field: ModelField) -> bool:
+    """字段是否需要类型检查，无类型注解且无约束的字段接受任意值"""
+
+    return field.annotation is not Any or bool(
+        getattr(field.field_info, "metadata", None)
+    )
+
+
 def check_field_type(field: ModelField, value: Any) -> Any:
     """检查字段类型是否匹配"""
 
@@ -2,5 +2,7 @@ from .bot import Bot as Bot
 from .event import Event as Event
 from .adapter import Adapter as Adapter
 from .message import Message as Message
+from .message import MessageBuilder as MessageBuilder
 from .message import MessageSegment as MessageSegment
 from .template import MessageTemplate as MessageTemplate
+from .message import CompactMessageSegment as CompactMessageSegment
@@ -1,5 +1,17 @@
 import abc
-from typing import Any, Type, TypeVar
+from contextvars import ContextVar
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Dict,
+    Type,
+    Tuple,
+    TypeVar,
+    Callable,
+    Hashable,
+    Optional,
+    Generator,
+)
 
 from pydantic import BaseModel
 
@@ -9,6 +21,11 @@ from nonebot.compat import PYDANTIC_V2, ConfigDict
 from .message import Message
 
 E = TypeVar("E", bound="Event")
+T = TypeVar("T")
+
+_event_cache: ContextVar[Optional[Tuple["Event", Dict[Hashable, Any]]]] = ContextVar(
+    "_event_cache", default=None
+)
 
 
 class Event(abc.ABC, BaseModel):
@@ -87,3 +104,62 @@ class Event(abc.ABC, BaseModel):
     def is_tome(self) -> bool:
         """获取事件是否与机器人有关的方法。"""
         raise NotImplementedError
+
+    @contextmanager
+    def _cache_scope(self) -> Generator[None, None, None]:
+        """开启当前事件的派生值缓存作用域。
+
+        NoneBot 在处理事件时自动开启，作用域内对同一事件的
+        {ref}`nonebot.adapters.Event.get_cached_value` 调用共享计算结果。
+        """
+        token = _event_cache.set((self, {}))
+        try:
+            yield
+        finally:
+            _event_cache.reset(token)
+
+    def get_cached_value(self, key: Hashable, func: Callable[[], T]) -> T:
+        """获取当前事件处理过程中缓存的派生值，不存在时调用 `func` 计算并缓存。
+
+        不在事件的缓存作用域内时，每次调用都会重新计算。
+
+        参数:
+            key: 缓存键
+            func: 计算派生值的函数
+        """
+        scope = _event_cache.get()
+        if scope is None or scope[0] is not self:
+            return func()
+        cache = scope[1]
+        try:
+            return cache[key]
+        except KeyError:
+            result = cache[key] = func()
+            return result
+
+    def clear_cache(self) -> None:
+        """清除当前事件缓存的派生值。
+
+        NoneBot 会在事件预处理、运行预处理与事件响应器运行结束后自动调用，
+        在其他位置 (如规则检查中) 修改事件消息后需要手动调用该方法。
+        """
+        scope = _event_cache.get()
+        if scope is not None and scope[0] is self:
+            scope[1].clear()
+
+    def get_cached_message(self) -> "Message":
+        """获取缓存的事件消息内容，参考 {ref}`nonebot.adapters.Event.get_message`。
+
+        返回的消息不会被拷贝，需要修改时请先拷贝。
+        """
+        return self.get_cached_value("message", self.get_message)
+
+    def get_cached_plaintext(self) -> str:
+        """获取缓存的消息纯文本，参考 {ref}`nonebot.adapters.Event.get_plaintext`。"""
+        return self.get_cached_value("plaintext", self.get_plaintext)
+
+    def get_cached_message_str(self) -> str:
+        """获取缓存的消息字符串，即 `str(event.get_message())`。"""
+        return self.get_cached_value(
+            "message_str", lambda: str(self.get_cached_message())
+        )
@@ -1,7 +1,9 @@
 import abc
-from copy import deepcopy
+import sys
+from copy import copy, deepcopy
+from functools import lru_cache
 from typing_extensions import Self
-from dataclasses import field, asdict, dataclass
+from dataclasses import field, asdict, fields, dataclass
 from typing import (
     Any,
     Dict,
@@ -11,7 +13,9 @@ from typing import (
     Union,
     Generic,
     TypeVar,
+    ClassVar,
     Iterable,
+    NoReturn,
     Optional,
     SupportsIndex,
     overload,
@@ -24,12 +28,88 @@ from .template import MessageTemplate
 TMS = TypeVar("TMS", bound="MessageSegment")
 TM = TypeVar("TM", bound="Message")
 
+_IMMUTABLE_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+def _frozen_error(*args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError("Frozen message segment data can not be modified, copy it first")
+
+
+class _FrozenDict(Dict[str, Any]):
+    """只读的消息段数据"""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _frozen_error
+    clear = pop = popitem = setdefault = update = _frozen_error
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    def __copy__(self) -> Self:
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Self:
+        return self
+
+
+class _FrozenList(List[Any]):
+    """只读的消息段数据列表"""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _frozen_error
+    append = extend = insert = pop = remove = clear = _frozen_error
+    sort = reverse = _frozen_error
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
+
+    def __copy__(self) -> Self:
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Self:
+        return self
+
+
+def _freeze_data(value: Any) -> Any:
+    if isinstance(value, (_FrozenDict, _FrozenList, *_IMMUTABLE_TYPES)):
+        return value
+    elif isinstance(value, dict):
+        return _FrozenDict((k, _freeze_data(v)) for k, v in value.items())
+    elif isinstance(value, list):
+        return _FrozenList(_freeze_data(v) for v in value)
+    elif isinstance(value, tuple):
+        return tuple(_freeze_data(v) for v in value)
+    return value
+
+
+def _copy_data(value: Any) -> Any:
+    # frozen containers are thawed into plain ones
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    elif isinstance(value, dict):
+        return {k: _copy_data(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_copy_data(v) for v in value]
+    elif isinstance(value, tuple) and type(value) is tuple:
+        return tuple(_copy_data(v) for v in value)
+    return deepcopy(value)
+
+
+@lru_cache(maxsize=None)
+def _data_fields(cls: Type["MessageSegment"]) -> Tuple[str, ...]:
+    """消息段的数据字段，包括协议适配器子类添加的字段"""
+    return tuple(f.name for f in fields(cls) if f.name != "type")
+
 
 @custom_validation
 @dataclass
 class MessageSegment(abc.ABC, Generic[TM]):
     """消息段基类"""
 
+    __slots__ = ()
+
     type: str
     """消息段类型"""
     data: Dict[str, Any] = field(default_factory=dict)
@@ -91,8 +171,31 @@ class MessageSegment(abc.ABC, Generic[TM]):
     def join(self: TMS, iterable: Iterable[Union[TMS, TM]]) -> TM:
         return self.get_message_class()(self).join(iterable)
 
+    @property
+    def frozen(self) -> bool:
+        """消息段数据是否已冻结"""
+        return isinstance(self.data, _FrozenDict)
+
+    def freeze(self) -> Self:
+        """冻结消息段数据。
+
+        冻结后的消息段数据 (包括嵌套的 `dict` 与 `list`) 不可修改，
+        可以在多个消息之间共享而无需拷贝。
+        子类添加的字段同样被冻结。
+
+        返回:
+            消息段自身
+        """
+        for name in _data_fields(type(self)):
+            setattr(self, name, _freeze_data(getattr(self, name)))
+        return self
+
     def copy(self) -> Self:
-        return deepcopy(self)
+        """拷贝消息段，返回的消息段数据 (包括子类添加的字段) 可以修改"""
+        segment = copy(self)
+        for name in _data_fields(type(self)):
+            setattr(segment, name, _copy_data(getattr(self, name)))
+        return segment
 
     @abc.abstractmethod
     def is_text(self) -> bool:
@@ -100,6 +203,122 @@ class MessageSegment(abc.ABC, Generic[TM]):
         raise NotImplementedError
 
 
+class _FrozenText(str):
+    __slots__ = ()
+
+
+class CompactMessageSegment(MessageSegment[TM]):
+    """紧凑消息段基类。
+
+    使用 `__slots__` 存储，消息段类型字符串被驻留；
+    仅包含 `text` 字段的纯文本消息段直接存储字符串，
+    在首次访问 `data` 时才构造数据字典。
+    适用于需要在内存中保存大量消息段的场景。
+
+    子类需要声明 `__slots__ = ()`，且无需使用 `dataclass` 装饰，
+    否则将重新拥有实例字典。
+    """
+
+    __slots__ = ("type", "_data")
+
+    text_type: ClassVar[str] = "text"
+    """直接存储字符串的纯文本消息段类型"""
+
+    def __init__(self, type: str, data: Optional[Dict[str, Any]] = None) -> None:
+        self.type = sys.intern(type)
+        self.data = {} if data is None else data
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """消息段数据"""
+        data = self._data
+        if isinstance(data, str):
+            data_class = _FrozenDict if isinstance(data, _FrozenText) else dict
+            data = self._data = data_class(text=str(data))
+        return data
+
+    @data.setter
+    def data(self, value: Dict[str, Any]) -> None:
+        if (
+            self.type == self.text_type
+            and len(value) == 1
+            and isinstance(text := value.get("text"), str)
+        ):
+            self._data = (
+                _FrozenText(text) if isinstance(value, _FrozenDict) else str(text)
+            )
+        else:
+            self._data = value
+
+    @property
+    def plain_text(self) -> Optional[str]:
+        """纯文本消息段的文本，获取时不会构造数据字典；其他类型的消息段为 `None`"""
+        data = self._data
+        if isinstance(data, str):
+            return data
+        return data.get("text") if self.type == self.text_type else None
+
+    def _peek_data(self) -> Dict[str, Any]:
+        data = self._data
+        return {"text": str(data)} if isinstance(data, str) else data
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__qualname__}"
+            f"(type={self.type!r}, data={self._peek_data()!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self) or not isinstance(
+            other, CompactMessageSegment
+        ):
+            return NotImplemented
+        if self.type != other.type:
+            return False
+        data, other_data = self._data, other._data
+        if isinstance(data, str) and isinstance(other_data, str):
+            return data == other_data
+        return self._peek_data() == other._peek_data()
+
+    __hash__ = None  # type: ignore
+
+    def get(self, key: str, default: Any = None):
+        return self._asdict().get(key, default)
+
+    def keys(self):
+        return self._asdict().keys()
+
+    def values(self):
+        return self._asdict().values()
+
+    def items(self):
+        return self._asdict().items()
+
+    def _asdict(self) -> Dict[str, Any]:
+        return {"type": self.type, "data": _copy_data(self._peek_data())}
+
+    @property
+    def frozen(self) -> bool:
+        return isinstance(self._data, (_FrozenText, _FrozenDict))
+
+    def freeze(self) -> Self:
+        data = self._data
+        if not isinstance(data, str):
+            self._data = _freeze_data(data)
+        elif not isinstance(data, _FrozenText):
+            self._data = _FrozenText(data)
+        return self
+
+    def copy(self) -> Self:
+        segment = copy(self)
+        data = self._data
+        segment._data = str(data) if isinstance(data, str) else _copy_data(data)
+        return segment
+
+
+_MESSAGE_CACHE_ATTRS = frozenset({"_frozen", "_type_index", "_plain_text"})
+
+
 @custom_validation
 class Message(List[TMS], abc.ABC):
     """消息序列
@@ -108,6 +327,10 @@ class Message(List[TMS], abc.ABC):
         message: 消息内容
     """
 
+    _frozen: bool = False
+    _type_index: Optional[Dict[str, List[int]]] = None
+    _plain_text: Optional[str] = None
+
     def __init__(
         self,
         message: Union[str, None, Iterable[TMS], TMS] = None,
@@ -187,6 +410,7 @@ class Message(List[TMS], abc.ABC):
         return result + self
 
     def __iadd__(self, other: Union[str, TMS, Iterable[TMS]]) -> Self:
+        self._before_mutation()
         if isinstance(other, str):
             self.extend(self._construct(other))
         elif isinstance(other, MessageSegment):
@@ -268,11 +492,11 @@ class Message(List[TMS], abc.ABC):
         elif isinstance(arg1, slice) and arg2 is None:
             return self.__class__(super().__getitem__(arg1))
         elif isinstance(arg1, str) and arg2 is None:
-            return self.__class__(seg for seg in self if seg.type == arg1)
+            return self.__class__(self._segments_of(arg1))
         elif isinstance(arg1, str) and isinstance(arg2, int):
-            return [seg for seg in self if seg.type == arg1][arg2]
+            return super().__getitem__(self._get_type_index().get(arg1, [])[arg2])
         elif isinstance(arg1, str) and isinstance(arg2, slice):
-            return self.__class__([seg for seg in self if seg.type == arg1][arg2])
+            return self.__class__(self._segments_of(arg1)[arg2])
         else:
             raise ValueError("Incorrect arguments to slice")  # pragma: no cover
 
@@ -285,7 +509,7 @@ class Message(List[TMS], abc.ABC):
             消息内是否存在给定消息段或给定类型的消息段
         """
         if isinstance(value, str):
-            return next((seg for seg in self if seg.type == value), None) is not None
+            return value in self._get_type_index()
         return super().__contains__(value)
 
     def has(self, value: Union[TMS, str]) -> bool:
@@ -306,10 +530,10 @@ class Message(List[TMS], abc.ABC):
             ValueError: 消息段不存在
         """
         if isinstance(value, str):
-            first_segment = next((seg for seg in self if seg.type == value), None)
-            if first_segment is None:
+            positions = self._get_type_index().get(value)
+            if positions is None:
                 raise ValueError(f"Segment with type {value!r} is not in message")
-            return super().index(first_segment, *args)
+            return super().index(super().__getitem__(positions[0]), *args)
         return super().index(value, *args)
 
     def get(self, type_: str, count: Optional[int] = None) -> Self:
@@ -324,16 +548,7 @@ class Message(List[TMS], abc.ABC):
         """
         if count is None:
             return self[type_]
-
-        iterator, filtered = (
-            seg for seg in self if seg.type == type_
-        ), self.__class__()
-        for _ in range(count):
-            seg = next(iterator, None)
-            if seg is None:
-                break
-            filtered.append(seg)
-        return filtered
+        return self.__class__(self._segments_of(type_)[: max(count, 0)])
 
     def count(self, value: Union[TMS, str]) -> int:
         """计算指定消息段的个数
@@ -344,7 +559,9 @@ class Message(List[TMS], abc.ABC):
         返回:
             个数
         """
-        return len(self[value]) if isinstance(value, str) else super().count(value)
+        if isinstance(value, str):
+            return len(self._get_type_index().get(value, ()))
+        return super().count(value)
 
     def only(self, value: Union[TMS, str]) -> bool:
         """检查消息中是否仅包含指定消息段
@@ -356,7 +573,7 @@ class Message(List[TMS], abc.ABC):
             是否仅包含指定消息段
         """
         if isinstance(value, str):
-            return all(seg.type == value for seg in self)
+            return not self or self._get_type_index().keys() == {value}
         return all(seg == value for seg in self)
 
     def append(self, obj: Union[str, TMS]) -> Self:
@@ -365,6 +582,7 @@ class Message(List[TMS], abc.ABC):
         参数:
             obj: 要添加的消息段
         """
+        self._before_mutation()
         if isinstance(obj, MessageSegment):
             super().append(obj)
         elif isinstance(obj, str):
@@ -379,6 +597,11 @@ class Message(List[TMS], abc.ABC):
         参数:
             obj: 要添加的消息数组
         """
+        self._before_mutation()
+        if isinstance(obj, Message) and type(self).append is Message.append:
+            # segments of a message need no further checks
+            super().extend(obj)
+            return self
         for segment in obj:
             self.append(segment)
         return self
@@ -392,19 +615,118 @@ class Message(List[TMS], abc.ABC):
         返回:
             连接后的消息
         """
-        ret = self.__class__()
+        builder = MessageBuilder(self.__class__, merge_text=False)
         for index, msg in enumerate(iterable):
             if index != 0:
-                ret.extend(self)
+                builder.extend(self)
             if isinstance(msg, MessageSegment):
-                ret.append(msg.copy())
+                builder.append(msg.copy())
             else:
-                ret.extend(msg.copy())
-        return ret
+                builder.extend(msg.copy())
+        return builder.build()
 
     def copy(self) -> Self:
-        """深拷贝消息"""
-        return deepcopy(self)
+        """拷贝消息。
+
+        已冻结的消息段在拷贝之间共享，其余消息段逐个拷贝。返回的消息未冻结。
+        子类实例的其他属性将被深拷贝。
+        """
+        result = self.__class__()
+        list.extend(result, (seg if seg.frozen else seg.copy() for seg in self))
+        if attrs := {
+            key: value
+            for key, value in self.__dict__.items()
+            if key not in _MESSAGE_CACHE_ATTRS
+        }:
+            result.__dict__.update(deepcopy(attrs))
+        return result
+
+    @property
+    def frozen(self) -> bool:
+        """消息是否已冻结"""
+        return self._frozen
+
+    def freeze(self) -> Self:
+        """冻结消息。
+
+        冻结后的消息及其消息段数据均不可修改，修改时将抛出 `TypeError`。
+        {ref}`nonebot.adapters.Message.copy` 将共享冻结的消息段，
+        需要修改时请先拷贝消息或消息段。
+
+        返回:
+            消息自身
+        """
+        for seg in self:
+            seg.freeze()
+        self._frozen = True
+        return self
+
+    def _before_mutation(self) -> None:
+        if self._frozen:
+            raise TypeError("Frozen message can not be modified, copy it first")
+        if self._type_index is not None:
+            self._type_index = None
+
+    def _get_type_index(self) -> Dict[str, List[int]]:
+        """消息段类型到位置的索引，在首次按类型查询时构建，修改消息后失效"""
+        if (index := self._type_index) is None:
+            index = {}
+            for position, seg in enumerate(self):
+                if (positions := index.get(seg.type)) is None:
+                    index[seg.type] = [position]
+                else:
+                    positions.append(position)
+            self._type_index = index
+        return index
+
+    def _segments_of(self, type_: str) -> List[TMS]:
+        get_segment = super().__getitem__
+        return [get_segment(i) for i in self._get_type_index().get(type_, ())]
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Self:
+        if self._frozen:
+            return self
+        result = self.__class__()
+        memo[id(self)] = result
+        list.extend(result, (deepcopy(seg, memo) for seg in self))
+        result.__dict__.update(deepcopy(self.__dict__, memo))
+        return result
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        self._before_mutation()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index: Any) -> None:
+        self._before_mutation()
+        super().__delitem__(index)
+
+    def __imul__(self, value: SupportsIndex) -> Self:
+        self._before_mutation()
+        return super().__imul__(value)
+
+    def insert(self, index: SupportsIndex, obj: TMS) -> None:
+        self._before_mutation()
+        super().insert(index, obj)
+
+    def pop(self, index: SupportsIndex = -1) -> TMS:
+        self._before_mutation()
+        return super().pop(index)
+
+    def remove(self, value: TMS) -> None:
+        self._before_mutation()
+        super().remove(value)
+
+    def clear(self) -> None:
+        self._before_mutation()
+        super().clear()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        self._before_mutation()
+        super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self._before_mutation()
+        super().reverse()
 
     def include(self, *types: str) -> Self:
         """过滤消息
@@ -415,7 +737,9 @@ class Message(List[TMS], abc.ABC):
         返回:
             新构造的消息
         """
-        return self.__class__(seg for seg in self if seg.type in types)
+        index, get_segment = self._get_type_index(), super().__getitem__
+        positions = sorted(i for type_ in set(types) for i in index.get(type_, ()))
+        return self.__class__(get_segment(i) for i in positions)
 
     def exclude(self, *types: str) -> Self:
         """过滤消息
@@ -429,6 +753,143 @@ class Message(List[TMS], abc.ABC):
         return self.__class__(seg for seg in self if seg.type not in types)
 
     def extract_plain_text(self) -> str:
-        """提取消息内纯文本消息"""
+        """提取消息内纯文本消息。
+
+        已冻结的消息将缓存提取结果。
+        """
+        if (text := self._plain_text) is not None:
+            return text
+        text = "".join(str(seg) for seg in self if seg.is_text())
+        if self._frozen:
+            self._plain_text = text
+        return text
+
+
+class MessageBuilder(Generic[TM]):
+    """消息构建器。
 
-        return "".join(str(seg) for seg in self if seg.is_text())
+    在多次拼接后一次性构造消息，避免逐次相加时反复拷贝消息，适用于循环中构建长消息。
+    与 `Message.__add__` 不同，添加的消息段不会被拷贝。
+
+    启用 `merge_text` 时，连续添加的字符串将合并后再构造消息段，
+    相邻的纯文本消息段 (数据仅包含 `text` 字段) 也将合并为一个，
+    合并后的文本由消息类型的 `_construct` 构造，无法构造为单个纯文本消息段时保持不变。
+
+    参数:
+        message_class: 消息类型
+        merge_text: 是否合并相邻的纯文本，默认为 `True`
+    """
+
+    def __init__(self, message_class: Type[TM], *, merge_text: bool = True) -> None:
+        self.message_class = message_class
+        self.merge_text = merge_text
+        self._segments: List[MessageSegment] = []
+        self._pending: List[str] = []
+        self._text_run: List[Tuple[MessageSegment, str]] = []
+
+    def __repr__(self) -> str:
+        return (
+            f"MessageBuilder({self.message_class.__name__}, "
+            f"merge_text={self.merge_text})"
+        )
+
+    def __len__(self) -> int:
+        """已添加的消息段数量，尚未构造的字符串与未合并的纯文本不计入"""
+        return len(self._segments)
+
+    def __iadd__(self, other: Union[str, MessageSegment, Iterable[MessageSegment]]):
+        if isinstance(other, (str, MessageSegment)):
+            return self.append(other)
+        elif isinstance(other, Iterable):
+            return self.extend(other)
+        raise TypeError(f"Unsupported type {type(other)!r}")
+
+    def append(self, obj: Union[str, MessageSegment]) -> Self:
+        """添加一个消息段或字符串
+
+        参数:
+            obj: 要添加的消息段或字符串
+        """
+        if isinstance(obj, str):
+            if self.merge_text:
+                self._pending.append(obj)
+            else:
+                self._add_segments(self.message_class._construct(obj))
+        elif isinstance(obj, MessageSegment):
+            self._flush_pending()
+            self._add_segments((obj,))
+        else:
+            raise ValueError(f"Unexpected type: {type(obj)} {obj}")
+        return self
+
+    def extend(self, obj: Iterable[Union[str, MessageSegment]]) -> Self:
+        """添加多个消息段或字符串
+
+        参数:
+            obj: 要添加的消息或消息段序列
+        """
+        if isinstance(obj, Message) and not self.merge_text:
+            self._segments.extend(obj)
+            return self
+        for item in obj:
+            self.append(item)
+        return self
+
+    def build(self) -> TM:
+        """构造消息，构建器可以继续使用"""
+        self._flush_pending()
+        self._close_text_run()
+        message = self.message_class()
+        list.extend(message, self._segments)
+        return message
+
+    def _flush_pending(self) -> None:
+        if self._pending:
+            text = "".join(self._pending)
+            self._pending.clear()
+            self._add_segments(self.message_class._construct(text))
+
+    def _add_segments(self, segments: Iterable[MessageSegment]) -> None:
+        if not self.merge_text:
+            self._segments.extend(segments)
+            return
+        for seg in segments:
+            if (text := self._mergeable_text(seg)) is not None and (
+                self._text_run and self._is_same_kind(self._segments[-1], seg)
+            ):
+                self._text_run.append((seg, text))
+                continue
+            self._close_text_run()
+            self._segments.append(seg)
+            if text is not None:
+                self._text_run.append((seg, text))
+
+    def _close_text_run(self) -> None:
+        if len(self._text_run) > 1:
+            head = self._segments[-1]
+            text = "".join(text for _, text in self._text_run)
+            merged = list(self.message_class._construct(text))
+            # keep the segments apart when the message class does not
+            # construct the joined text back into a single plain text segment
+            if (
+                len(merged) == 1
+                and self._is_same_kind(head, merged[0])
+                and self._mergeable_text(merged[0]) == text
+            ):
+                self._segments[-1] = merged[0]
+            else:
+                self._segments.extend(seg for seg, _ in self._text_run[1:])
+        self._text_run.clear()
+
+    @staticmethod
+    def _mergeable_text(seg: MessageSegment) -> Optional[str]:
+        if not seg.is_text():
+            return None
+        data = seg._peek_data() if isinstance(seg, CompactMessageSegment) else seg.data
+        if len(data) == 1 and isinstance(text := data.get("text"), str):
+            return text
+        return None
+
+    @staticmethod
+    def _is_same_kind(a: MessageSegment, b: MessageSegment) -> bool:
+        return a.__class__ is b.__class__ and a.type == b.type
@@ -14,8 +14,10 @@ from typing import (
     Mapping,
     TypeVar,
     Callable,
+    Iterable,
     Optional,
     Sequence,
+    NamedTuple,
     cast,
     overload,
 )
@@ -36,6 +38,46 @@ TF = TypeVar("TF", str, "Message")
 FormatSpecFunc: TypeAlias = Callable[[Any], str]
 FormatSpecFunc_T = TypeVar("FormatSpecFunc_T", bound=FormatSpecFunc)
 
+_PLAN_CACHE_SIZE = 1024
+
+
+class _TemplateField(NamedTuple):
+    literal: Any
+    """字段前的字面量，已转换为消息类型，无字面量时为 `None`"""
+    literal_text: str
+    """字段前的原始字面量文本"""
+    field_name: Optional[str]
+    format_spec: str
+    conversion: Optional[str]
+
+
+def _plan_template(
+    parsed: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]],
+    factory: Union[Type[str], Type["Message"]],
+) -> Tuple[_TemplateField, ...]:
+    """预先将解析结果中的字面量转换为消息类型"""
+    plan: List[_TemplateField] = []
+    for literal_text, field_name, format_spec, conversion in parsed:
+        literal = None
+        if literal_text:
+            literal = (
+                literal_text if issubclass(factory, str) else factory() + literal_text
+            )
+        plan.append(
+            _TemplateField(
+                literal, literal_text, field_name, format_spec or "", conversion
+            )
+        )
+    return tuple(plan)
+
+
+@functools.lru_cache(maxsize=_PLAN_CACHE_SIZE)
+def _compile_template(
+    format_string: str, factory: Union[Type[str], Type["Message"]]
+) -> Tuple[_TemplateField, ...]:
+    """解析格式字符串并转换字面量，结果按格式字符串与消息类型缓存"""
+    return _plan_template(Formatter().parse(format_string), factory)
+
 
 class MessageTemplate(Formatter, Generic[TF]):
     """消息模板格式化实现类。
@@ -134,14 +176,18 @@ class MessageTemplate(Formatter, Generic[TF]):
         used_args: Set[Union[int, str]],
         auto_arg_index: int = 0,
     ) -> Tuple[TF, int]:
-        results: List[Any] = [self.factory()]
+        builder = _TemplateBuilder(self)
 
-        for literal_text, field_name, format_spec, conversion in self.parse(
-            format_string
-        ):
+        # only the default parser can be cached by format string
+        plan = (
+            _compile_template(format_string, self.factory)
+            if type(self).parse is Formatter.parse
+            else _plan_template(self.parse(format_string), self.factory)
+        )
+        for literal, literal_text, field_name, format_spec, conversion in plan:
             # output the literal text
-            if literal_text:
-                results.append(literal_text)
+            if literal is not None:
+                builder.add_literal(literal, literal_text)
 
             # if there's a field, output it
             if field_name is not None:
@@ -179,9 +225,9 @@ class MessageTemplate(Formatter, Generic[TF]):
                 formatted_text = (
                     self.format_field(obj, format_spec) if format_spec else obj
                 )
-                results.append(formatted_text)
+                builder.add_value(formatted_text)
 
-        return functools.reduce(self._add, results), auto_arg_index
+        return builder.build(), auto_arg_index
 
     def get_field(
         self, field_name: str, args: Sequence[Any], kwargs: Mapping[str, Any]
@@ -214,3 +260,64 @@ class MessageTemplate(Formatter, Generic[TF]):
             return a + b
         except TypeError:
             return a + str(b)
+
+
+class _TemplateBuilder(Generic[TF]):
+    """在单次遍历中拼接模板的字面量与字段，避免逐个相加产生中间消息。
+
+    消息类型或模板重写了拼接方法时，与原先一样从空消息开始逐个相加。
+    """
+
+    def __init__(self, template: MessageTemplate[TF]) -> None:
+        from .message import Message, MessageBuilder
+
+        self.template = template
+        self.factory = template.factory
+        self.texts: List[str] = []
+        self.builder: Optional[MessageBuilder] = (
+            None
+            if issubclass(self.factory, str)
+            else MessageBuilder(self.factory, merge_text=False)
+        )
+        self.result: Optional[TF] = None
+
+        factory = cast(Type[Any], self.factory)
+        if type(template)._add is not MessageTemplate._add or (
+            factory.__add__ is not str.__add__
+            and (
+                factory.__add__ is not Message.__add__
+                or factory.append is not Message.append
+            )
+        ):
+            self.result = self.factory()
+
+    def add_literal(self, literal: TF, literal_text: str) -> None:
+        if self.result is not None:
+            self.result = self.template._add(self.result, literal_text)
+            return
+        # literals are shared by the cached plan
+        literal = literal if isinstance(literal, str) else literal.copy()
+        if self.builder is None:
+            self.texts.append(cast(str, literal))
+        else:
+            self.builder.extend(cast("Message", literal))
+
+    def add_value(self, value: Any) -> None:
+        if self.result is None:
+            part = self.template._add(self.factory(), value)
+            if isinstance(part, self.factory):
+                if self.builder is None:
+                    self.texts.append(cast(str, part))
+                else:
+                    self.builder.extend(cast("Message", part))
+                return
+            # fall back to adding one by one, eg. a message field in str template
+            self.result = self.build()
+        self.result = self.template._add(self.result, value)
+
+    def build(self) -> TF:
+        if self.result is not None:
+            return self.result
+        if self.builder is None:
+            return cast(TF, "".join(self.texts))
+        return cast(TF, self.builder.build())
@@ -0,0 +1,158 @@
+import asyncio
+from time import perf_counter
+from typing import Any, List, TypeVar, Callable, Optional, Awaitable, Collection
+
+from nonebot.utils import _executor_wait
+from nonebot.dependencies import Dependent
+from nonebot.internal.metrics import metrics
+
+C = TypeVar("C")
+
+IO_BOUND_COST: float = 1e-3
+"""检查器耗时 (秒) 达到该值时视为 I/O 密集型，与其他 I/O 密集型检查器并发执行"""
+
+_COST_ATTR = "__checker_cost__"
+_COST_DECAY = 0.9
+_REPLAN_INTERVAL = 256
+
+
+def checker_cost(cost: float) -> Callable[[C], C]:
+    """声明检查器的预估耗时 (秒)。
+
+    耗时较低的检查器将按顺序直接执行，得到决定性结果后跳过其余检查器；
+    耗时达到 {ref}`nonebot.internal.checker.IO_BOUND_COST` 的检查器将并发执行。
+    未声明耗时的检查器将根据运行耗时统计自动调整。
+
+    参数:
+        cost: 预估耗时
+
+    用法:
+        ```python
+        @checker_cost(float("inf"))
+        async def is_admin(bot: Bot, event: Event) -> bool:
+            return await bot.call_api(...)
+        ```
+    """
+
+    def decorator(call: C) -> C:
+        setattr(call, _COST_ATTR, cost)
+        return call
+
+    return decorator
+
+
+class _CheckerEntry:
+    __slots__ = ("checker", "declared", "cost")
+
+    def __init__(self, checker: Dependent[Any]) -> None:
+        self.checker = checker
+        self.declared: Optional[float] = getattr(checker.call, _COST_ATTR, None)
+        self.cost: float = 0.0 if self.declared is None else self.declared
+
+    def record(self, elapsed: float) -> bool:
+        """记录一次运行耗时，返回是否变为 I/O 密集型"""
+        self.cost = self.cost * _COST_DECAY + elapsed * (1 - _COST_DECAY)
+        return self.cost >= IO_BOUND_COST
+
+
+class CheckerPlan:
+    """检查器的执行计划。
+
+    低耗时检查器按耗时升序逐个执行，遇到决定性结果时立即返回；
+    I/O 密集型检查器在其后并发执行。
+
+    参数:
+        checkers: 检查器集合
+        stage: 耗时统计中的处理阶段名称
+    """
+
+    __slots__ = (
+        "checkers",
+        "stage",
+        "_size",
+        "_entries",
+        "_inline",
+        "_concurrent",
+        "_dirty",
+        "_runs",
+    )
+
+    def __init__(self, checkers: Collection[Dependent[Any]], stage: str) -> None:
+        self.checkers = checkers
+        self.stage = stage
+        self._size = len(checkers)
+        self._entries = [_CheckerEntry(checker) for checker in checkers]
+        self._inline: List[_CheckerEntry] = []
+        self._concurrent: List[_CheckerEntry] = []
+        self._dirty = True
+        self._runs = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"CheckerPlan(inline={[e.checker for e in self._inline]}, "
+            f"concurrent={[e.checker for e in self._concurrent]})"
+        )
+
+    def is_stale(self, checkers: Collection[Dependent[Any]]) -> bool:
+        """检查器集合是否已被修改"""
+        return checkers is not self.checkers or len(checkers) != self._size
+
+    def _plan(self) -> None:
+        self._inline = sorted(
+            (e for e in self._entries if e.cost < IO_BOUND_COST),
+            key=lambda e: e.cost,
+        )
+        self._concurrent = [e for e in self._entries if e.cost >= IO_BOUND_COST]
+        self._dirty = False
+
+    def _timed(
+        self, call: Callable[[Dependent[Any]], Awaitable[Any]]
+    ) -> Callable[[Dependent[Any]], Awaitable[Any]]:
+        def timed_call(checker: Dependent[Any]) -> Awaitable[Any]:
+            return metrics.timed(self.stage, checker.call, call(checker))
+
+        return timed_call
+
+    async def run(
+        self, call: Callable[[Dependent[Any]], Awaitable[Any]], decisive: bool
+    ) -> bool:
+        """执行检查器。
+
+        参数:
+            call: 运行单个检查器的函数
+            decisive: 决定性结果，任一检查器结果与之相同时立即返回该结果
+        """
+        self._runs += 1
+        if self._dirty or self._runs % _REPLAN_INTERVAL == 0:
+            self._plan()
+
+        if metrics.enabled:
+            call = self._timed(call)
+
+        for entry in self._inline:
+            if entry.declared is None:
+                # waiting for an idle executor thread is not the checker's cost
+                wait = [0.0]
+                token = _executor_wait.set(wait)
+                start = perf_counter()
+                try:
+                    result = await call(entry.checker)
+                finally:
+                    _executor_wait.reset(token)
+                elapsed = max(perf_counter() - start - wait[0], 0.0)
+                # reorder on next run when the checker turns out to be slow
+                self._dirty = entry.record(elapsed) or self._dirty
+            else:
+                result = await call(entry.checker)
+            if bool(result) is decisive:
+                return decisive
+
+        if len(self._concurrent) == 1:
+            results = [await call(self._concurrent[0].checker)]
+        elif self._concurrent:
+            results = await asyncio.gather(
+                *(call(entry.checker) for entry in self._concurrent)
+            )
+        else:
+            return not decisive
+        return decisive if any(bool(r) is decisive for r in results) else not decisive
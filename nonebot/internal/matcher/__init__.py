@@ -5,8 +5,13 @@ from .provider import DEFAULT_PROVIDER_CLASS as DEFAULT_PROVIDER_CLASS
 matchers = MatcherManager()
 
 from .matcher import Matcher as Matcher
+from .expiry import ExpiryStats as ExpiryStats
+from .index import MatcherIndex as MatcherIndex
 from .matcher import current_bot as current_bot
+from .expiry import ExpiryService as ExpiryService
 from .matcher import MatcherSource as MatcherSource
 from .matcher import current_event as current_event
+from .session import WaitingSession as WaitingSession
 from .matcher import current_handler as current_handler
 from .matcher import current_matcher as current_matcher
+from .session import SessionRegistry as SessionRegistry
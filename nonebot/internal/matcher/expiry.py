@@ -0,0 +1,150 @@
+import heapq
+import asyncio
+import weakref
+import itertools
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Type, Tuple, Union, Optional, NamedTuple
+
+from .session import WaitingSession
+
+if TYPE_CHECKING:
+    from .matcher import Matcher
+    from .manager import MatcherManager
+
+_Target = Union[Type["Matcher"], WaitingSession]
+
+
+class ExpiryStats(NamedTuple):
+    """过期清理统计"""
+
+    live_sessions: int
+    """等待用户回复的会话数量"""
+    expired_sessions: int
+    """因过期被移除的会话数量"""
+    live_matchers: int
+    """设置了过期时间且尚未过期的事件响应器数量"""
+    expired_matchers: int
+    """因过期被移除的事件响应器数量"""
+    scheduled: int
+    """计时器中等待检查的条目数量"""
+
+
+class ExpiryService:
+    """事件响应器与等待中会话的过期清理服务。
+
+    使用最小堆记录过期时间点，在最早的过期时间点到达时移除已过期的事件响应器与会话，
+    无需等待事件到达。添加与移除的复杂度均为 `O(log n)`。
+
+    计时器中仅保存弱引用，已被移除或已继续运行的会话不会因计时器而滞留在内存中。
+    服务需要在事件循环中通过 {ref}`nonebot.matcher.ExpiryService.start` 启动，
+    未启动时仍在事件检查时惰性移除过期的事件响应器与会话。
+
+    参数:
+        manager: 事件响应器管理器
+    """
+
+    def __init__(self, manager: "MatcherManager") -> None:
+        self._manager = manager
+        self._heap: List[Tuple[datetime, int, "weakref.ref[_Target]"]] = []
+        self._ids = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._deadline: Optional[datetime] = None
+        self._expired_matchers: int = 0
+
+    def __repr__(self) -> str:
+        return f"ExpiryService(running={self.running}, scheduled={len(self._heap)})"
+
+    @property
+    def running(self) -> bool:
+        """服务是否已启动"""
+        return self._loop is not None
+
+    def stats(self) -> ExpiryStats:
+        """获取过期清理统计"""
+        now = datetime.now()
+        return ExpiryStats(
+            live_sessions=len(self._manager.sessions),
+            expired_sessions=self._manager.sessions.expired,
+            live_matchers=sum(
+                bool(matcher.expire_time and matcher.expire_time >= now)
+                for priority_matchers in self._manager.values()
+                for matcher in priority_matchers
+            ),
+            expired_matchers=self._expired_matchers,
+            scheduled=len(self._heap),
+        )
+
+    def schedule(self, target: _Target) -> None:
+        """在过期时间点移除事件响应器或等待中的会话，服务未启动时不做任何操作"""
+        if self._loop is None or target.expire_time is None:
+            return
+        heapq.heappush(
+            self._heap, (target.expire_time, next(self._ids), weakref.ref(target))
+        )
+        if self._deadline is None or target.expire_time < self._deadline:
+            self._arm()
+
+    def expire_matcher(self, matcher: Type["Matcher"]) -> bool:
+        """移除一个已过期的事件响应器。
+
+        返回:
+            事件响应器是否仍存在并被移除
+        """
+        try:
+            matcher.destroy()
+        except Exception:
+            return False
+        self._expired_matchers += 1
+        return True
+
+    async def start(self) -> None:
+        """在当前事件循环中启动服务，并记录已有的事件响应器与会话"""
+        self._loop = asyncio.get_running_loop()
+        self._heap = [
+            (target.expire_time, next(self._ids), weakref.ref(target))
+            for target in (
+                *(
+                    matcher
+                    for priority_matchers in self._manager.values()
+                    for matcher in priority_matchers
+                ),
+                *self._manager.sessions,
+            )
+            if target.expire_time is not None
+        ]
+        heapq.heapify(self._heap)
+        self._arm()
+
+    async def stop(self) -> None:
+        """停止服务"""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self._deadline = self._loop = None
+        self._heap.clear()
+
+    def _arm(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self._deadline = None
+        if not self._heap or self._loop is None:
+            return
+        self._deadline = self._heap[0][0]
+        delay = (self._deadline - datetime.now()).total_seconds()
+        self._timer = self._loop.call_later(max(delay, 0), self._expire)
+
+    def _expire(self) -> None:
+        self._timer = self._deadline = None
+        now = datetime.now()
+        while self._heap and self._heap[0][0] < now:
+            deadline, _, ref = heapq.heappop(self._heap)
+            if (target := ref()) is None or target.expire_time is None:
+                continue
+            if target.expire_time != deadline:
+                # expire time has been changed after scheduling
+                heapq.heappush(self._heap, (target.expire_time, next(self._ids), ref))
+            elif isinstance(target, WaitingSession):
+                self._manager.sessions.expire(target)
+            else:
+                self.expire_matcher(target)
+        self._arm()
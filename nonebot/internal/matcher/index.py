@@ -0,0 +1,234 @@
+from itertools import chain
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Set, Dict, List, Type, Tuple, Optional, Sequence
+
+from nonebot.typing import T_State
+from nonebot.consts import CMD_KEY, PREFIX_KEY
+
+from .matcher import Matcher
+
+if TYPE_CHECKING:
+    from nonebot.adapters import Bot, Event
+
+_DEFAULT_CHECK_PERM = Matcher.__dict__["check_perm"]
+_DEFAULT_CHECK_RULE = Matcher.__dict__["check_rule"]
+
+
+_KEY_PRIORITY = (
+    "command",
+    "fullmatch",
+    "fullmatch_ci",
+    "startswith",
+    "endswith",
+    "keyword",
+    "regex",
+)
+
+
+def _is_default_check(matcher: Type[Matcher]) -> bool:
+    """检查事件响应器是否使用默认的权限与规则检查方法"""
+    return (
+        getattr(matcher.check_perm, "__func__", None) is _DEFAULT_CHECK_PERM.__func__
+        and getattr(matcher.check_rule, "__func__", None)
+        is _DEFAULT_CHECK_RULE.__func__
+    )
+
+
+def _literal_key(matcher: Type[Matcher]) -> Optional[Tuple[str, Tuple[Any, ...]]]:
+    """提取事件响应器规则中可用于预筛选的字面量。
+
+    同一事件响应器存在多个可索引规则时，选择筛选能力最强的规则：
+    命令 > 完全匹配 > 前缀匹配 > 后缀匹配 > 关键词 > 正则必需字面量。
+    """
+    from nonebot.rule import (
+        RegexRule,
+        CommandRule,
+        EndswithRule,
+        KeywordsRule,
+        FullmatchRule,
+        StartswithRule,
+        ShellCommandRule,
+    )
+
+    keys: Dict[str, Tuple[Any, ...]] = {}
+    for checker in matcher.rule.checkers:
+        call = checker.call
+        if isinstance(call, (CommandRule, ShellCommandRule)):
+            keys["command"] = call.cmds
+        elif isinstance(call, FullmatchRule):
+            keys["fullmatch_ci" if call.ignorecase else "fullmatch"] = call.msg
+        # ignorecase prefix/suffix match follows `re.IGNORECASE` semantics,
+        # which can not be reproduced with a simple lookup
+        elif isinstance(call, StartswithRule) and not call.ignorecase:
+            keys["startswith"] = call.msg
+        elif isinstance(call, EndswithRule) and not call.ignorecase:
+            keys["endswith"] = call.msg
+        elif isinstance(call, KeywordsRule):
+            keys["keyword"] = call.keywords
+        elif isinstance(call, RegexRule) and call.literal:
+            keys["regex"] = (call.literal,)
+
+    for kind in _KEY_PRIORITY:
+        if kind in keys:
+            return kind, keys[kind]
+
+
+class MatcherIndex:
+    """单一优先级内事件响应器的分发索引
+
+    按照事件响应器的响应类型、命令、完全匹配、前缀、后缀、关键词字面量
+    与正则表达式的必需字面量预先分桶，
+    使事件仅需检查可能响应的事件响应器。被排除的事件响应器必定无法通过
+    响应类型或规则检查，因此分发结果与逐个检查所有事件响应器一致。
+
+    参数:
+        matchers: 同一优先级的事件响应器列表
+    """
+
+    def __init__(self, matchers: Sequence[Type[Matcher]]) -> None:
+        self.matchers: Tuple[Type[Matcher], ...] = tuple(matchers)
+
+        self._types: List[str] = []
+        self._unindexed: Dict[str, List[int]] = defaultdict(list)
+        self._by_type_cache: Dict[str, List[int]] = {}
+
+        self._commands: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        self._fullmatch: Dict[str, List[int]] = defaultdict(list)
+        self._fullmatch_ci: Dict[str, List[int]] = defaultdict(list)
+        self._startswith: Dict[str, List[int]] = defaultdict(list)
+        self._endswith: Dict[str, List[int]] = defaultdict(list)
+        self._keywords: Dict[str, List[int]] = defaultdict(list)
+        self._regex: Dict[str, List[int]] = defaultdict(list)
+
+        for index, matcher in enumerate(self.matchers):
+            self._types.append(matcher.type)
+            # expired matchers must reach `_check_matcher` to be destroyed,
+            # custom check methods may not follow the default semantics
+            key = (
+                _literal_key(matcher)
+                if matcher.expire_time is None and _is_default_check(matcher)
+                else None
+            )
+            if key is None:
+                self._unindexed[matcher.type].append(index)
+                continue
+
+            kind, literals = key
+            if kind == "command":
+                for cmd in literals:
+                    self._commands[cmd].append(index)
+            elif kind == "fullmatch":
+                for text in literals:
+                    self._fullmatch[text].append(index)
+            elif kind == "fullmatch_ci":
+                for text in literals:
+                    self._fullmatch_ci[text].append(index)
+            elif kind == "startswith":
+                for prefix in literals:
+                    self._startswith[prefix].append(index)
+            elif kind == "endswith":
+                for suffix in literals:
+                    self._endswith[suffix].append(index)
+            elif kind == "keyword":
+                for keyword in literals:
+                    self._keywords[keyword].append(index)
+            else:
+                for literal in literals:
+                    self._regex[literal].append(index)
+
+    def __repr__(self) -> str:
+        return f"MatcherIndex(matchers={self.matchers!r})"
+
+    def _type_candidates(self, event_type: str) -> List[int]:
+        if (result := self._by_type_cache.get(event_type)) is None:
+            result = sorted(
+                chain(self._unindexed.get("", ()), self._unindexed.get(event_type, ()))
+                if event_type
+                else self._unindexed.get("", ())
+            )
+            self._by_type_cache[event_type] = result
+        return result
+
+    def _literal_candidates(self, event: "Event", state: T_State) -> Set[int]:
+        from nonebot.rule import LiteralRule
+
+        hits: Set[int] = set()
+
+        if self._commands:
+            prefix = state.get(PREFIX_KEY)
+            cmd = prefix and prefix.get(CMD_KEY)
+            if cmd is not None:
+                hits.update(self._commands.get(cmd, ()))
+
+        if self._regex:
+            try:
+                msg = event.get_cached_message_str()
+            except Exception:
+                pass
+            else:
+                for literal in LiteralRule.scan(msg).found:
+                    hits.update(self._regex.get(literal, ()))
+
+        if not (
+            self._fullmatch
+            or self._fullmatch_ci
+            or self._startswith
+            or self._endswith
+            or self._keywords
+        ):
+            return hits
+
+        try:
+            text = event.get_cached_plaintext()
+        except Exception:
+            return hits
+
+        if text:
+            hits.update(self._fullmatch.get(text, ()))
+            hits.update(self._fullmatch_ci.get(text.casefold(), ()))
+
+        result = LiteralRule.scan(text)
+        for literals, table in (
+            (result.prefixes, self._startswith),
+            (result.suffixes, self._endswith),
+            # keyword rules never match empty text
+            (result.found if text else (), self._keywords),
+        ):
+            if table:
+                for literal in literals:
+                    hits.update(table.get(literal, ()))
+        return hits
+
+    def select(
+        self, bot: "Bot", event: "Event", state: T_State
+    ) -> Sequence[Type[Matcher]]:
+        """选出可能响应事件的事件响应器，保持原有顺序。
+
+        参数:
+            bot: Bot 对象
+            event: Event 对象
+            state: 会话状态
+
+        返回:
+            可能响应事件的事件响应器列表
+        """
+        if (
+            Matcher.__dict__["check_perm"] is not _DEFAULT_CHECK_PERM
+            or Matcher.__dict__["check_rule"] is not _DEFAULT_CHECK_RULE
+        ):
+            return self.matchers
+
+        try:
+            event_type = event.get_type()
+        except Exception:
+            # let the matcher check report the error
+            return self.matchers
+
+        candidates = self._type_candidates(event_type)
+        if hits := {
+            index
+            for index in self._literal_candidates(event, state)
+            if self._types[index] in ("", event_type)
+        }:
+            candidates = sorted(chain(candidates, hits))
+        return tuple(self.matchers[index] for index in candidates)
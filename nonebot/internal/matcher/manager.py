@@ -1,5 +1,7 @@
+from typing_extensions import TypeAlias
 from typing import (
     TYPE_CHECKING,
+    Any,
     List,
     Type,
     Tuple,
@@ -14,6 +16,8 @@ from typing import (
     overload,
 )
 
+from .expiry import ExpiryService
+from .session import SessionRegistry
 from .provider import DEFAULT_PROVIDER_CLASS, MatcherProvider
 
 if TYPE_CHECKING:
@@ -21,6 +25,8 @@ if TYPE_CHECKING:
 
 T = TypeVar("T")
 
+MatcherSnapshot: TypeAlias = Tuple[Tuple[int, Tuple[Type["Matcher"], ...]], ...]
+
 
 class MatcherManager(MutableMapping[int, List[Type["Matcher"]]]):
     """事件响应器管理器
@@ -30,6 +36,14 @@ class MatcherManager(MutableMapping[int, List[Type["Matcher"]]]):
 
     def __init__(self):
         self.provider: MatcherProvider = DEFAULT_PROVIDER_CLASS({})
+        self.sessions: SessionRegistry = SessionRegistry(self._session_scope)
+        """等待用户回复的会话，仅在事件响应器存储器的当前上下文中可见"""
+        self.expiry: ExpiryService = ExpiryService(self)
+        """事件响应器与会话的过期清理服务"""
+
+        self._version: int = 0
+        self._snapshot: MatcherSnapshot = ()
+        self._snapshot_key: Optional[Tuple[Any, ...]] = None
 
     def __repr__(self) -> str:
         return f"MatcherManager(provider={self.provider!r})"
@@ -48,9 +62,11 @@ class MatcherManager(MutableMapping[int, List[Type["Matcher"]]]):
 
     def __setitem__(self, key: int, value: List[Type["Matcher"]]) -> None:
         self.provider[key] = value
+        self._version += 1
 
     def __delitem__(self, key: int) -> None:
         del self.provider[key]
+        self._version += 1
 
     def __eq__(self, other: object) -> bool:
         return isinstance(other, MatcherManager) and self.provider == other.provider
@@ -76,22 +92,82 @@ class MatcherManager(MutableMapping[int, List[Type["Matcher"]]]):
         return self.provider.get(key, default)
 
     def pop(self, key: int) -> List[Type["Matcher"]]:
+        self._version += 1
         return self.provider.pop(key)
 
     def popitem(self) -> Tuple[int, List[Type["Matcher"]]]:
+        self._version += 1
         return self.provider.popitem()
 
     def clear(self) -> None:
         self.provider.clear()
+        self._version += 1
 
     def update(self, __m: MutableMapping[int, List[Type["Matcher"]]]) -> None:
         self.provider.update(__m)
+        self._version += 1
 
     def setdefault(
         self, key: int, default: List[Type["Matcher"]]
     ) -> List[Type["Matcher"]]:
+        self._version += 1
         return self.provider.setdefault(key, default)
 
+    def add_matcher(self, matcher: Type["Matcher"]) -> None:
+        """添加一个事件响应器至其优先级
+
+        参数:
+            matcher: 事件响应器
+        """
+        self.provider[matcher.priority].append(matcher)
+        self._version += 1
+        self.expiry.schedule(matcher)
+
+    def remove_matcher(self, matcher: Type["Matcher"]) -> None:
+        """从其优先级中移除一个事件响应器
+
+        参数:
+            matcher: 事件响应器
+
+        异常:
+            ValueError: 事件响应器不存在
+        """
+        self.provider[matcher.priority].remove(matcher)
+        self._version += 1
+
+    def snapshot(self) -> MatcherSnapshot:
+        """获取按优先级排序的事件响应器快照
+
+        快照仅在事件响应器被添加或移除后重新生成，且未变化优先级的事件响应器元组会被复用。
+        快照不可变，遍历期间新增的事件响应器（如临时事件响应器）不会影响本次遍历。
+
+        返回:
+            `(priority, matchers)` 元组，按优先级升序排列
+        """
+        # matcher lists may be replaced or changed without going through manager
+        # (e.g. provider context switching), so check list identity and length too
+        key = (
+            self._version,
+            id(self.provider),
+            tuple((k, id(v), len(v)) for k, v in self.provider.items()),
+        )
+        if key != self._snapshot_key:
+            previous = dict(self._snapshot)
+            snapshot: List[Tuple[int, Tuple[Type["Matcher"], ...]]] = []
+            for priority in sorted(self.provider.keys()):
+                current = tuple(self.provider[priority])
+                if (cached := previous.get(priority)) is not None and cached == current:
+                    current = cached
+                snapshot.append((priority, current))
+            self._snapshot = tuple(snapshot)
+            self._snapshot_key = key
+        return self._snapshot
+
+    def _session_scope(self, matcher: Type["Matcher"]) -> Any:
+        # provider contexts replace the matcher lists, so a waiting session is
+        # scoped to the list of its priority when it is added
+        return self.provider.get(matcher.priority)
+
     def set_provider(self, provider_class: Type[MatcherProvider]) -> None:
         """设置事件响应器存储器
 
@@ -99,3 +175,4 @@ class MatcherManager(MutableMapping[int, List[Type["Matcher"]]]):
             provider_class: 事件响应器存储器类
         """
         self.provider = provider_class(self.provider)
+        self._version += 1
@@ -24,10 +24,11 @@ from typing import (
     overload,
 )
 
-from nonebot.log import logger
 from nonebot.internal.rule import Rule
-from nonebot.utils import classproperty
+from nonebot.log import logger, log_enabled
+from nonebot.internal.metrics import metrics
 from nonebot.dependencies import Param, Dependent
+from nonebot.utils import LayeredState, classproperty
 from nonebot.internal.permission import User, Permission
 from nonebot.internal.adapter import (
     Bot,
@@ -69,6 +70,7 @@ from nonebot.internal.params import (
 )
 
 from . import matchers
+from .session import WaitingSession
 
 if TYPE_CHECKING:
     from nonebot.plugin import Plugin
@@ -315,14 +317,14 @@ class Matcher(metaclass=MatcherMeta):
 
         logger.trace(f"Define new matcher {NewMatcher}")
 
-        matchers[priority].append(NewMatcher)
+        matchers.add_matcher(NewMatcher)
 
         return NewMatcher  # type: ignore
 
     @classmethod
     def destroy(cls) -> None:
         """销毁当前的事件响应器"""
-        matchers[cls.priority].remove(cls)
+        matchers.remove_matcher(cls)
 
     @classproperty
     def plugin(cls) -> Optional["Plugin"]:
@@ -773,6 +775,32 @@ class Matcher(metaclass=MatcherMeta):
             )
         return Permission(User.from_event(event, perm=self.permission))
 
+    async def wait_session(
+        self,
+        bot: Bot,
+        event: Event,
+        stack: Optional[AsyncExitStack] = None,
+        dependency_cache: Optional[T_DependencyCache] = None,
+    ) -> None:
+        """记录等待用户回复的会话状态。
+
+        下一个满足更新后类型与权限的事件将以优先级 `0` 继续运行剩余的事件处理函数，
+        参考 {ref}`nonebot.matcher.WaitingSession`。
+        """
+        type_ = await self.update_type(bot, event, stack, dependency_cache)
+        permission = await self.update_permission(bot, event, stack, dependency_cache)
+        timeout = bot.config.session_expire_timeout
+        waiting = WaitingSession(
+            self.__class__,
+            type_,
+            permission,
+            self.remain_handlers,
+            self.state,
+            expire_time=timeout and datetime.now() + timeout,
+        )
+        matchers.sessions.add(waiting)
+        matchers.expiry.schedule(waiting)
+
     async def resolve_reject(self):
         handler = current_handler.get()
         self.remain_handlers.insert(0, handler)
@@ -799,35 +827,49 @@ class Matcher(metaclass=MatcherMeta):
         stack: Optional[AsyncExitStack] = None,
         dependency_cache: Optional[T_DependencyCache] = None,
     ):
-        logger.trace(
-            f"{self} run with incoming args: "
-            f"bot={bot}, event={event!r}, state={state!r}"
-        )
+        if log_enabled("TRACE"):
+            logger.trace(
+                f"{self} run with incoming args: "
+                f"bot={bot}, event={event!r}, state={state!r}"
+            )
+        show_log = log_enabled("DEBUG")
 
         with self.ensure_context(bot, event):
             try:
                 # Refresh preprocess state
-                self.state.update(state)
+                if isinstance(state, LayeredState):
+                    state.merge_into(self.state)
+                else:
+                    self.state.update(state)
 
                 while self.remain_handlers:
                     handler = self.remain_handlers.pop(0)
                     current_handler.set(handler)
-                    logger.debug(f"Running handler {handler}")
+                    if show_log:
+                        logger.debug(f"Running handler {handler}")
+                    coro = handler(
+                        matcher=self,
+                        bot=bot,
+                        event=event,
+                        state=self.state,
+                        stack=stack,
+                        dependency_cache=dependency_cache,
+                    )
                     try:
-                        await handler(
-                            matcher=self,
-                            bot=bot,
-                            event=event,
-                            state=self.state,
-                            stack=stack,
-                            dependency_cache=dependency_cache,
-                        )
+                        if metrics.enabled:
+                            await metrics.timed(
+                                "handler", handler.call, coro, type(self)
+                            )
+                        else:
+                            await coro
                     except SkippedException:
-                        logger.debug(f"Handler {handler} skipped")
+                        if show_log:
+                            logger.debug(f"Handler {handler} skipped")
             except StopPropagation:
                 self.block = True
             finally:
-                logger.info(f"{self} running complete")
+                if log_enabled("INFO"):
+                    logger.info(f"{self} running complete")
 
     # 运行handlers
     async def run(
@@ -843,44 +885,8 @@ class Matcher(metaclass=MatcherMeta):
 
         except RejectedException:
             await self.resolve_reject()
-            type_ = await self.update_type(bot, event, stack, dependency_cache)
-            permission = await self.update_permission(
-                bot, event, stack, dependency_cache
-            )
-
-            self.new(
-                type_,
-                Rule(),
-                permission,
-                self.remain_handlers,
-                temp=True,
-                priority=0,
-                block=True,
-                source=self.__class__._source,
-                expire_time=bot.config.session_expire_timeout,
-                default_state=self.state,
-                default_type_updater=self.__class__._default_type_updater,
-                default_permission_updater=self.__class__._default_permission_updater,
-            )
+            await self.wait_session(bot, event, stack, dependency_cache)
         except PausedException:
-            type_ = await self.update_type(bot, event, stack, dependency_cache)
-            permission = await self.update_permission(
-                bot, event, stack, dependency_cache
-            )
-
-            self.new(
-                type_,
-                Rule(),
-                permission,
-                self.remain_handlers,
-                temp=True,
-                priority=0,
-                block=True,
-                source=self.__class__._source,
-                expire_time=bot.config.session_expire_timeout,
-                default_state=self.state,
-                default_type_updater=self.__class__._default_type_updater,
-                default_permission_updater=self.__class__._default_permission_updater,
-            )
+            await self.wait_session(bot, event, stack, dependency_cache)
         except FinishedException:
             pass
@@ -0,0 +1,245 @@
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Type,
+    Tuple,
+    Callable,
+    Iterator,
+    Optional,
+)
+
+from nonebot.typing import T_State
+from nonebot.internal.rule import Rule
+from nonebot.dependencies import Dependent
+from nonebot.internal.permission import User, Permission
+
+if TYPE_CHECKING:
+    from nonebot.adapters import Event
+
+    from .matcher import Matcher
+
+
+class WaitingSession:
+    """等待用户回复的事件响应器状态。
+
+    事件响应器暂停 (`pause`/`reject`/`got`) 后，剩余的事件处理函数与会话状态被记录在此，
+    满足类型与权限的下一个事件将以优先级 `0` 继续运行原事件响应器。
+
+    会话不再注册至 `matchers[0]`，权限检查与继续运行均通过 {ref}`view` 完成，
+    其为原事件响应器的子类，与此前注册的临时事件响应器一致。
+
+    参数:
+        matcher: 原事件响应器
+        type_: 继续运行所需的事件类型，空字符串表示任意
+        permission: 继续运行所需的权限
+        handlers: 剩余的事件处理函数
+        state: 会话状态
+        expire_time: 过期时间点
+    """
+
+    __slots__ = (
+        "matcher",
+        "type",
+        "permission",
+        "handlers",
+        "state",
+        "expire_time",
+        "_scope",
+        "_view",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        matcher: Type["Matcher"],
+        type_: str,
+        permission: Permission,
+        handlers: List[Dependent[Any]],
+        state: T_State,
+        expire_time: Optional[datetime] = None,
+    ) -> None:
+        self.matcher = matcher
+        self.type = type_
+        self.permission = permission
+        self.handlers = handlers
+        self.state = state
+        self.expire_time = expire_time
+        self._scope: Any = None
+        self._view: Optional[Type["Matcher"]] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"WaitingSession(matcher={self.matcher!r}, type={self.type!r}, "
+            f"permission={self.permission!r})"
+        )
+
+    @property
+    def sessions(self) -> Optional[Tuple[str, ...]]:
+        """权限限定的会话 ID，权限不是单一 {ref}`nonebot.permission.User` 时为 `None`"""
+        if len(self.permission.checkers) == 1 and isinstance(
+            user := next(iter(self.permission.checkers)).call, User
+        ):
+            return user.users
+        return None
+
+    def expired(self, now: Optional[datetime] = None) -> bool:
+        """是否已过期"""
+        return bool(self.expire_time and (now or datetime.now()) > self.expire_time)
+
+    @property
+    def view(self) -> Type["Matcher"]:
+        """会话对应的临时事件响应器类
+
+        优先级为 `0` 的原事件响应器子类，不注册至 `matchers`，
+        用于检查权限 (`check_perm`) 以及运行处理器与运行前后钩子。
+        """
+        if self._view is None:
+            matcher = self.matcher
+            self._view = type(
+                matcher.__name__,
+                (matcher,),
+                {
+                    "_source": matcher._source,
+                    "type": self.type,
+                    "rule": Rule(),
+                    "permission": self.permission,
+                    "handlers": self.handlers,
+                    "temp": True,
+                    "expire_time": self.expire_time,
+                    "priority": 0,
+                    "block": True,
+                    "_default_state": self.state,
+                    "_default_type_updater": matcher._default_type_updater,
+                    "_default_permission_updater": (
+                        matcher._default_permission_updater
+                    ),
+                },
+            )
+        return self._view
+
+    def resume(self) -> "Matcher":
+        """创建继续运行的事件响应器实例"""
+        return self.view()
+
+
+class SessionRegistry:
+    """等待用户回复的会话索引。
+
+    权限为单一 {ref}`nonebot.permission.User` 的等待状态按照会话 ID 索引，
+    事件仅需检查同一会话的等待状态；自定义权限的等待状态需要逐个检查。
+
+    参数:
+        scope: 获取事件响应器当前作用域的函数，等待状态仅在添加时的作用域中可见
+    """
+
+    def __init__(
+        self, scope: Optional[Callable[[Type["Matcher"]], Any]] = None
+    ) -> None:
+        self.scope = scope
+        self._sessions: Dict[str, List[WaitingSession]] = {}
+        self._unindexed: List[WaitingSession] = []
+        self._count: int = 0
+        self.expired: int = 0
+        """因过期被移除的会话数量"""
+
+    def __repr__(self) -> str:
+        return f"SessionRegistry(waiting={len(self)})"
+
+    def __len__(self) -> int:
+        if self.scope is None:
+            return self._count
+        return sum(1 for _ in self)
+
+    def __iter__(self) -> Iterator[WaitingSession]:
+        seen = set()
+        for waiting in (
+            *(w for ws in self._sessions.values() for w in ws),
+            *self._unindexed,
+        ):
+            if id(waiting) not in seen and self._visible(waiting):
+                seen.add(id(waiting))
+                yield waiting
+
+    def _visible(self, waiting: WaitingSession) -> bool:
+        return self.scope is None or self.scope(waiting.matcher) is waiting._scope
+
+    def __contains__(self, waiting: object) -> bool:
+        return any(w is waiting for w in self)
+
+    def add(self, waiting: WaitingSession) -> None:
+        """添加一个等待状态"""
+        if self.scope is not None:
+            waiting._scope = self.scope(waiting.matcher)
+        if (sessions := waiting.sessions) is None:
+            self._unindexed.append(waiting)
+        else:
+            for session in sessions:
+                self._sessions.setdefault(session, []).append(waiting)
+        self._count += 1
+
+    def discard(self, waiting: WaitingSession) -> bool:
+        """移除一个等待状态。
+
+        返回:
+            等待状态是否存在，已被其他事件取走时返回 `False`
+        """
+        if (sessions := waiting.sessions) is None:
+            try:
+                self._unindexed.remove(waiting)
+            except ValueError:
+                return False
+        else:
+            found = False
+            for session in sessions:
+                if (bucket := self._sessions.get(session)) and waiting in bucket:
+                    bucket.remove(waiting)
+                    found = True
+                    if not bucket:
+                        del self._sessions[session]
+            if not found:
+                return False
+        self._count -= 1
+        return True
+
+    def expire(self, waiting: WaitingSession) -> bool:
+        """移除一个已过期的等待状态并计数。
+
+        返回:
+            等待状态是否存在
+        """
+        if not self.discard(waiting):
+            return False
+        self.expired += 1
+        return True
+
+    def clear(self) -> None:
+        """移除所有等待状态"""
+        self._sessions.clear()
+        self._unindexed.clear()
+        self._count = 0
+
+    def select(self, event: "Event") -> List[WaitingSession]:
+        """获取事件可能继续的等待状态，已过期的等待状态将被移除"""
+        if not self._count:
+            return []
+
+        candidates = list(self._unindexed)
+        try:
+            session = event.get_session_id()
+        except Exception:
+            pass
+        else:
+            if indexed := self._sessions.get(session):
+                candidates[:0] = indexed
+
+        now = datetime.now()
+        result: List[WaitingSession] = []
+        for waiting in candidates:
+            if waiting.expired(now):
+                self.expire(waiting)
+            elif self._visible(waiting):
+                result.append(waiting)
+        return result
@@ -0,0 +1,226 @@
+from time import perf_counter
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Type,
+    Tuple,
+    TypeVar,
+    Optional,
+    Awaitable,
+    NamedTuple,
+)
+
+from nonebot.utils import get_name
+from nonebot.internal.driver import URL, Request, Response, ASGIMixin, HTTPServerSetup
+
+if TYPE_CHECKING:
+    from nonebot.internal.matcher import Matcher
+
+R = TypeVar("R")
+
+BUCKETS: Tuple[float, ...] = (
+    *(round(base * 10.0**exp, 9) for exp in range(-6, 1) for base in (1.0, 2.5, 5.0)),
+    10.0,
+)
+"""耗时直方图的桶上界 (秒)，从 1 微秒至 10 秒"""
+
+current_matcher: ContextVar[Optional[Type["Matcher"]]] = ContextVar(
+    "current_matcher", default=None
+)
+"""当前正在检查或运行的事件响应器，用于标记检查器耗时"""
+
+
+class MetricKey(NamedTuple):
+    """耗时统计项"""
+
+    stage: str
+    """处理阶段，如 `event_preprocessor`、`rule`、`handler`"""
+    target: str
+    """被统计的函数名称"""
+    plugin: Optional[str]
+    """所在插件名称"""
+    module: Optional[str]
+    """所在模块路径名"""
+    lineno: Optional[int]
+    """事件响应器定义所在行号"""
+
+
+class Histogram:
+    """耗时直方图"""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(BUCKETS) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.max: float = 0.0
+
+    def __repr__(self) -> str:
+        return f"Histogram(count={self.count}, sum={self.sum:.6f}, max={self.max:.6f})"
+
+    def observe(self, value: float) -> None:
+        """记录一次耗时"""
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """估算耗时分位数，返回所在桶的上界"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Metrics:
+    """事件处理耗时统计。
+
+    默认关闭，关闭时各处理阶段仅检查 {ref}`nonebot.message.Metrics.enabled` 标记。
+    """
+
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        """是否记录耗时"""
+        self._histograms: Dict[MetricKey, Histogram] = {}
+        self._call_tags: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+
+    def __repr__(self) -> str:
+        return f"Metrics(enabled={self.enabled}, series={len(self._histograms)})"
+
+    def enable(self, enabled: bool = True) -> None:
+        """开启或关闭耗时统计"""
+        self.enabled = enabled
+
+    def reset(self) -> None:
+        """清空已记录的耗时"""
+        self._histograms.clear()
+
+    def snapshot(self) -> Dict[MetricKey, Histogram]:
+        """获取已记录的耗时直方图"""
+        return dict(self._histograms)
+
+    def _tags(
+        self, call: Any, matcher: Optional[Type["Matcher"]]
+    ) -> Tuple[Optional[str], Optional[str], Optional[int]]:
+        if matcher is not None:
+            source = matcher._source
+            return (
+                matcher.plugin_name,
+                matcher.module_name,
+                source.lineno if source else None,
+            )
+
+        if isinstance(call, str):
+            return None, None, None
+        if (tags := self._call_tags.get(id(call))) is None:
+            from nonebot.plugin import get_plugin_by_module_name
+
+            module = getattr(call, "__module__", None)
+            plugin = module and get_plugin_by_module_name(module)
+            # processors live as long as the process, so `id` is stable
+            tags = self._call_tags[id(call)] = (plugin and plugin.name, module)
+        return (*tags, None)
+
+    def observe(
+        self,
+        stage: str,
+        call: Any,
+        elapsed: float,
+        matcher: Optional[Type["Matcher"]] = None,
+    ) -> None:
+        """记录一次耗时。
+
+        参数:
+            stage: 处理阶段
+            call: 被统计的函数或名称
+            elapsed: 耗时 (秒)
+            matcher: 所属事件响应器，默认为当前事件响应器
+        """
+        matcher = matcher or current_matcher.get()
+        key = MetricKey(
+            stage,
+            call if isinstance(call, str) else get_name(call),
+            *self._tags(call, matcher),
+        )
+        if (histogram := self._histograms.get(key)) is None:
+            histogram = self._histograms[key] = Histogram()
+        histogram.observe(elapsed)
+
+    async def timed(
+        self,
+        stage: str,
+        call: Any,
+        awaitable: Awaitable[R],
+        matcher: Optional[Type["Matcher"]] = None,
+    ) -> R:
+        """等待并记录一个可等待对象的耗时"""
+        start = perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.observe(stage, call, perf_counter() - start, matcher)
+
+    def render(self) -> str:
+        """以 Prometheus 文本格式导出已记录的耗时"""
+        lines = [
+            "# HELP nonebot_latency_seconds Event handling latency",
+            "# TYPE nonebot_latency_seconds histogram",
+        ]
+        for key, histogram in self._histograms.items():
+            labels = ",".join(
+                f'{name}="{_escape(value)}"'
+                for name, value in key._asdict().items()
+                if value is not None
+            )
+            seen = 0
+            for bound, count in zip(BUCKETS, histogram.counts):
+                seen += count
+                lines.append(
+                    f'nonebot_latency_seconds_bucket{{{labels},le="{bound}"}} {seen}'
+                )
+            lines.extend(
+                (
+                    f'nonebot_latency_seconds_bucket{{{labels},le="+Inf"}} '
+                    f"{histogram.count}",
+                    f"nonebot_latency_seconds_sum{{{labels}}} {histogram.sum}",
+                    f"nonebot_latency_seconds_count{{{labels}}} {histogram.count}",
+                )
+            )
+        return "\n".join(lines) + "\n"
+
+    def setup_http_server(self, driver: ASGIMixin, path: str = "/metrics") -> None:
+        """在驱动器上注册 Prometheus 指标接口。
+
+        参数:
+            driver: 支持 ASGI 的驱动器
+            path: 接口路径
+        """
+
+        async def handle(request: Request) -> Response:
+            return Response(
+                200,
+                headers={"Content-Type": "text/plain; version=0.0.4"},
+                content=self.render(),
+            )
+
+        driver.setup_http_server(HTTPServerSetup(URL(path), "GET", "metrics", handle))
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = Metrics()
+"""全局事件处理耗时统计"""
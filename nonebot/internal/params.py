@@ -5,6 +5,7 @@ from typing_extensions import Self, Annotated, get_args, override, get_origin
 from typing import (
     TYPE_CHECKING,
     Any,
+    Dict,
     Type,
     Tuple,
     Union,
@@ -21,10 +22,11 @@ from nonebot.dependencies.utils import check_field_type
 from nonebot.typing import T_State, T_Handler, T_DependencyCache
 from nonebot.compat import FieldInfo, ModelField, PydanticUndefined, extract_field_info
 from nonebot.utils import (
+    CachedSyncPolicy,
     get_name,
-    run_sync,
     is_gen_callable,
     run_sync_ctx_manager,
+    run_sync_with_policy,
     is_async_gen_callable,
     is_coroutine_callable,
     generic_check_issubclass,
@@ -42,16 +44,19 @@ class DependsInner:
         *,
         use_cache: bool = True,
         validate: Union[bool, PydanticFieldInfo] = False,
+        inline: bool = False,
     ) -> None:
         self.dependency = dependency
         self.use_cache = use_cache
         self.validate = validate
+        self.inline = inline
 
     def __repr__(self) -> str:
         dep = get_name(self.dependency)
         cache = "" if self.use_cache else ", use_cache=False"
         validate = f", validate={self.validate}" if self.validate else ""
-        return f"DependsInner({dep}{cache}{validate})"
+        inline = ", inline=True" if self.inline else ""
+        return f"DependsInner({dep}{cache}{validate}{inline})"
 
 
 def Depends(
@@ -59,6 +64,7 @@ def Depends(
     *,
     use_cache: bool = True,
     validate: Union[bool, PydanticFieldInfo] = False,
+    inline: bool = False,
 ) -> Any:
     """子依赖装饰器
 
@@ -66,6 +72,8 @@ def Depends(
         dependency: 依赖函数。默认为参数的类型注释。
         use_cache: 是否使用缓存。默认为 `True`。
         validate: 是否使用 Pydantic 类型校验。默认为 `False`。
+        inline: 是否在事件循环中直接调用同步依赖函数。
+            仅适用于耗时极短且无阻塞的依赖函数。默认为 `False`。
 
     用法:
         ```python
@@ -85,7 +93,9 @@ def Depends(
             ...
         ```
     """
-    return DependsInner(dependency, use_cache=use_cache, validate=validate)
+    return DependsInner(
+        dependency, use_cache=use_cache, validate=validate, inline=inline
+    )
 
 
 class DependParam(Param):
@@ -96,12 +106,32 @@ class DependParam(Param):
     本注入应该具有最高优先级，因此应该在其他参数之前检查。
     """
 
+    _concurrent = True
+
     def __init__(
-        self, *args, dependent: Dependent, use_cache: bool, **kwargs: Any
+        self,
+        *args,
+        dependent: Dependent,
+        use_cache: bool,
+        inline: bool = False,
+        **kwargs: Any,
     ) -> None:
         super().__init__(*args, **kwargs)
         self.dependent = dependent
         self.use_cache = use_cache
+        self.inline = inline
+
+        call = dependent.call
+        self._kind: Literal["gen", "async_gen", "coroutine", "sync"]
+        if is_gen_callable(call):
+            self._kind = "gen"
+        elif is_async_gen_callable(call):
+            self._kind = "async_gen"
+        elif is_coroutine_callable(call):
+            self._kind = "coroutine"
+        else:
+            self._kind = "sync"
+        self._sync_policy = CachedSyncPolicy(call)
 
     def __repr__(self) -> str:
         return f"Depends({self.dependent}, use_cache={self.use_cache})"
@@ -112,6 +142,7 @@ class DependParam(Param):
         sub_dependent: Dependent,
         use_cache: bool,
         validate: Union[bool, PydanticFieldInfo],
+        inline: bool = False,
     ) -> Self:
         kwargs = {}
         if isinstance(validate, PydanticFieldInfo):
@@ -120,6 +151,7 @@ class DependParam(Param):
         kwargs["validate"] = bool(validate)
         kwargs["dependent"] = sub_dependent
         kwargs["use_cache"] = use_cache
+        kwargs["inline"] = inline
 
         return cls(**kwargs)
 
@@ -160,7 +192,10 @@ class DependParam(Param):
         )
 
         return cls._from_field(
-            sub_dependent, depends_inner.use_cache, depends_inner.validate
+            sub_dependent,
+            depends_inner.use_cache,
+            depends_inner.validate,
+            depends_inner.inline,
         )
 
     @classmethod
@@ -173,7 +208,9 @@ class DependParam(Param):
             dependent = Dependent[Any].parse(
                 call=value.dependency, allow_types=allow_types
             )
-            return cls._from_field(dependent, value.use_cache, value.validate)
+            return cls._from_field(
+                dependent, value.use_cache, value.validate, value.inline
+            )
 
     @override
     async def _solve(
@@ -196,34 +233,73 @@ class DependParam(Param):
         )
 
         # run dependency function
-        task: asyncio.Task[Any]
-        if use_cache and call in dependency_cache:
-            return await dependency_cache[call]
-        elif is_gen_callable(call) or is_async_gen_callable(call):
-            assert isinstance(
-                stack, AsyncExitStack
-            ), "Generator dependency should be called in context"
-            if is_gen_callable(call):
-                cm = run_sync_ctx_manager(contextmanager(call)(**sub_values))
-            else:
-                cm = asynccontextmanager(call)(**sub_values)
-            task = asyncio.create_task(stack.enter_async_context(cm))
-            dependency_cache[call] = task
-            return await task
-        elif is_coroutine_callable(call):
-            task = asyncio.create_task(call(**sub_values))
-            dependency_cache[call] = task
-            return await task
+        while use_cache and (cached := dependency_cache.get(call)) is not None:
+            try:
+                # shield the shared future from the cancellation of this consumer
+                return await asyncio.shield(cached)
+            except asyncio.CancelledError:
+                if not cached.cancelled():
+                    raise
+                # the consumer running the dependency was cancelled,
+                # the remaining consumers run it again
+
+        # share the result with concurrent consumers through a future
+        # instead of wrapping every dependency call in a task
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        dependency_cache[call] = future
+        try:
+            result = await self._call(call, sub_values, stack)
+        except Exception as e:
+            future.set_exception(e)
+            # mark the exception as retrieved, it is raised to the caller
+            future.exception()
+            raise
+        except BaseException:
+            if dependency_cache.get(call) is future:
+                del dependency_cache[call]
+            future.cancel()
+            raise
+        future.set_result(result)
+        return result
+
+    async def _call(
+        self,
+        call: Callable[..., Any],
+        sub_values: Dict[str, Any],
+        stack: Optional[AsyncExitStack],
+    ) -> Any:
+        if self._kind == "coroutine":
+            return await call(**sub_values)
+        elif self._kind == "sync":
+            return await run_sync_with_policy(
+                "inline" if self.inline else self._sync_policy.get(),
+                call,
+                **sub_values,
+            )
+
+        assert isinstance(
+            stack, AsyncExitStack
+        ), "Generator dependency should be called in context"
+        if self._kind == "async_gen":
+            return await stack.enter_async_context(
+                asynccontextmanager(call)(**sub_values)
+            )
+        elif self.inline or self._sync_policy.get() == "inline":
+            return stack.enter_context(contextmanager(call)(**sub_values))
         else:
-            task = asyncio.create_task(run_sync(call)(**sub_values))
-            dependency_cache[call] = task
-            return await task
+            return await stack.enter_async_context(
+                run_sync_ctx_manager(contextmanager(call)(**sub_values))
+            )
 
     @override
     async def _check(self, **kwargs: Any) -> None:
         # run sub dependent pre-checkers
         await self.dependent.check(**kwargs)
 
+    @override
+    def _needs_check(self) -> bool:
+        return bool(self.dependent._plan.checks)
+
 
 class BotParam(Param):
     """{ref}`nonebot.adapters.Bot` 注入参数。
@@ -233,6 +309,8 @@ class BotParam(Param):
     为保证兼容性，本注入还会解析名为 `bot` 且没有类型注解的参数。
     """
 
+    _lookup_key = "bot"
+
     def __init__(
         self, *args, checker: Optional[ModelField] = None, **kwargs: Any
     ) -> None:
@@ -274,6 +352,10 @@ class BotParam(Param):
         if self.checker is not None:
             check_field_type(self.checker, bot)
 
+    @override
+    def _needs_check(self) -> bool:
+        return self.checker is not None
+
 
 class EventParam(Param):
     """{ref}`nonebot.adapters.Event` 注入参数
@@ -283,6 +365,8 @@ class EventParam(Param):
     为保证兼容性，本注入还会解析名为 `event` 且没有类型注解的参数。
     """
 
+    _lookup_key = "event"
+
     def __init__(
         self, *args, checker: Optional[ModelField] = None, **kwargs: Any
     ) -> None:
@@ -324,6 +408,10 @@ class EventParam(Param):
         if self.checker is not None:
             check_field_type(self.checker, event)
 
+    @override
+    def _needs_check(self) -> bool:
+        return self.checker is not None
+
 
 class StateParam(Param):
     """事件处理状态注入参数
@@ -333,6 +421,8 @@ class StateParam(Param):
     为保证兼容性，本注入还会解析名为 `state` 且没有类型注解的参数。
     """
 
+    _lookup_key = "state"
+
     def __repr__(self) -> str:
         return "StateParam()"
 
@@ -361,6 +451,8 @@ class MatcherParam(Param):
     为保证兼容性，本注入还会解析名为 `matcher` 且没有类型注解的参数。
     """
 
+    _lookup_key = "matcher"
+
     def __init__(
         self, *args, checker: Optional[ModelField] = None, **kwargs: Any
     ) -> None:
@@ -402,6 +494,10 @@ class MatcherParam(Param):
         if self.checker is not None:
             check_field_type(self.checker, matcher)
 
+    @override
+    def _needs_check(self) -> bool:
+        return self.checker is not None
+
 
 class ArgInner:
     def __init__(
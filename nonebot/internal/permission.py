@@ -1,4 +1,3 @@
-import asyncio
 from typing_extensions import Self
 from contextlib import AsyncExitStack
 from typing import Set, List, Type, Tuple, Union, ClassVar, NoReturn, Optional
@@ -9,6 +8,7 @@ from nonebot.exception import SkippedException
 from nonebot.typing import T_DependencyCache, T_PermissionChecker
 
 from .adapter import Bot, Event
+from .checker import CheckerPlan, checker_cost
 from .params import Param, BotParam, EventParam, DependParam, DefaultParam
 
 
@@ -28,7 +28,7 @@ class Permission:
         ```
     """
 
-    __slots__ = ("checkers",)
+    __slots__ = ("checkers", "_plan")
 
     HANDLER_PARAM_TYPES: ClassVar[List[Type[Param]]] = [
         DependParam,
@@ -49,6 +49,7 @@ class Permission:
             for checker in checkers
         }
         """存储 `PermissionChecker`"""
+        self._plan: Optional[CheckerPlan] = None
 
     def __repr__(self) -> str:
         return f"Permission({', '.join(repr(checker) for checker in self.checkers)})"
@@ -62,6 +63,8 @@ class Permission:
     ) -> bool:
         """检查是否满足某个权限。
 
+        低耗时的检查器依次执行，任一检查器通过时跳过其余检查器。
+
         参数:
             bot: Bot 对象
             event: Event 对象
@@ -70,22 +73,22 @@ class Permission:
         """
         if not self.checkers:
             return True
-        results = await asyncio.gather(
-            *(
-                run_coro_with_catch(
-                    checker(
-                        bot=bot,
-                        event=event,
-                        stack=stack,
-                        dependency_cache=dependency_cache,
-                    ),
-                    (SkippedException,),
-                    False,
-                )
-                for checker in self.checkers
+        plan = self._plan
+        if plan is None or plan.is_stale(self.checkers):
+            plan = self._plan = CheckerPlan(self.checkers, "permission")
+        return await plan.run(
+            lambda checker: run_coro_with_catch(
+                checker(
+                    bot=bot,
+                    event=event,
+                    stack=stack,
+                    dependency_cache=dependency_cache,
+                ),
+                (SkippedException,),
+                False,
             ),
+            True,
         )
-        return any(results)
 
     def __and__(self, other: object) -> NoReturn:
         raise RuntimeError("And operation between Permissions is not allowed.")
@@ -111,6 +114,7 @@ class Permission:
             return Permission(other, *self.checkers)
 
 
+@checker_cost(0)
 class User:
     """检查当前事件是否属于指定会话。
 
@@ -1,4 +1,3 @@
-import asyncio
 from contextlib import AsyncExitStack
 from typing import Set, List, Type, Union, ClassVar, NoReturn, Optional
 
@@ -7,6 +6,7 @@ from nonebot.exception import SkippedException
 from nonebot.typing import T_State, T_RuleChecker, T_DependencyCache
 
 from .adapter import Bot, Event
+from .checker import CheckerPlan
 from .params import Param, BotParam, EventParam, StateParam, DependParam, DefaultParam
 
 
@@ -26,7 +26,7 @@ class Rule:
         ```
     """
 
-    __slots__ = ("checkers",)
+    __slots__ = ("checkers", "_plan")
 
     HANDLER_PARAM_TYPES: ClassVar[List[Type[Param]]] = [
         DependParam,
@@ -48,6 +48,7 @@ class Rule:
             for checker in checkers
         }
         """存储 `RuleChecker`"""
+        self._plan: Optional[CheckerPlan] = None
 
     def __repr__(self) -> str:
         return f"Rule({', '.join(repr(checker) for checker in self.checkers)})"
@@ -62,6 +63,8 @@ class Rule:
     ) -> bool:
         """检查是否符合所有规则
 
+        低耗时的检查器依次执行，任一检查器不通过时跳过其余检查器。
+
         参数:
             bot: Bot 对象
             event: Event 对象
@@ -71,22 +74,22 @@ class Rule:
         """
         if not self.checkers:
             return True
+        plan = self._plan
+        if plan is None or plan.is_stale(self.checkers):
+            plan = self._plan = CheckerPlan(self.checkers, "rule")
         try:
-            results = await asyncio.gather(
-                *(
-                    checker(
-                        bot=bot,
-                        event=event,
-                        state=state,
-                        stack=stack,
-                        dependency_cache=dependency_cache,
-                    )
-                    for checker in self.checkers
-                )
+            return await plan.run(
+                lambda checker: checker(
+                    bot=bot,
+                    event=event,
+                    state=state,
+                    stack=stack,
+                    dependency_cache=dependency_cache,
+                ),
+                False,
             )
         except SkippedException:
             return False
-        return all(results)
 
     def __and__(self, other: Optional[Union["Rule", T_RuleChecker]]) -> "Rule":
         if other is None:
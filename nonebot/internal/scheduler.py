@@ -0,0 +1,515 @@
+import asyncio
+from collections import deque
+from functools import partial
+from time import perf_counter
+from typing_extensions import TypeAlias
+from contextlib import asynccontextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Set,
+    Dict,
+    List,
+    Deque,
+    Tuple,
+    Literal,
+    Callable,
+    Optional,
+    Awaitable,
+    NamedTuple,
+    AsyncGenerator,
+)
+
+from nonebot.log import logger
+
+if TYPE_CHECKING:
+    from nonebot.adapters import Bot, Event
+
+OverloadPolicy: TypeAlias = Literal["drop_oldest", "drop_meta_event", "reject"]
+"""事件队列已满时的处理方式
+
+- `drop_oldest`: 丢弃队列中最早的事件
+- `drop_meta_event`: 优先丢弃元事件，队列中没有元事件时丢弃最早的事件；
+  新事件为元事件时直接拒绝
+- `reject`: 拒绝新事件
+"""
+
+
+class SchedulerStats(NamedTuple):
+    """事件调度器运行状态"""
+
+    queued: int
+    """等待处理的事件数量"""
+    running: int
+    """正在处理的事件数量"""
+    dispatched: int
+    """已开始处理的事件总数"""
+    dropped: int
+    """因队列已满被丢弃的事件总数"""
+    rejected: int
+    """因队列已满被拒绝的事件总数"""
+    peak_queued: int
+    """等待处理的事件数量峰值"""
+    wait_time_total: float
+    """事件排队等待总时长 (秒)"""
+    wait_time_max: float
+    """事件排队等待最长时长 (秒)"""
+
+    @property
+    def wait_time_avg(self) -> float:
+        """事件平均排队等待时长 (秒)"""
+        return self.wait_time_total / self.dispatched if self.dispatched else 0.0
+
+
+class _QueuedEvent(NamedTuple):
+    bot: "Bot"
+    event: "Event"
+    key: Tuple[str, str]
+    enqueued: float
+    waiter: Optional["asyncio.Future[bool]"] = None
+
+    def resolve(self, handled: bool) -> None:
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(handled)
+
+
+class _NoLimit:
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+
+_NO_LIMIT = _NoLimit()
+
+
+def _is_meta_event(event: "Event") -> bool:
+    try:
+        return event.get_type() == "meta_event"
+    except Exception:
+        return False
+
+
+class EventScheduler:
+    """事件调度器。
+
+    位于协议适配器与事件处理流程之间，限制同时处理的事件数量，
+    超出限制的事件进入有界队列等待，队列已满时按照过载策略丢弃或拒绝事件。
+
+    未设置任何并发限制时，事件将立即开始处理。
+    设置了 `max_concurrency` 或 `bot_concurrency` 时，
+    {ref}`nonebot.message.handle_event` 处理的事件均经由调度器处理。
+
+    参数:
+        handler: 事件处理函数
+        max_concurrency: 同时处理的事件数量上限
+        bot_concurrency: 单个机器人同时处理的事件数量上限
+        plugin_concurrency: 单个插件同时运行的事件响应器数量上限
+        queue_size: 等待队列长度上限
+        overload_policy: 队列已满时的处理方式
+    """
+
+    def __init__(
+        self,
+        handler: Callable[["Bot", "Event"], Awaitable[Any]],
+        *,
+        max_concurrency: Optional[int] = None,
+        bot_concurrency: Optional[int] = None,
+        plugin_concurrency: Optional[int] = None,
+        queue_size: int = 1024,
+        overload_policy: OverloadPolicy = "drop_oldest",
+    ) -> None:
+        self.handler = handler
+
+        self._queue: Deque[_QueuedEvent] = deque()
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._bot_running: Dict[Tuple[str, str], int] = {}
+        self._plugin_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        self._dispatched = 0
+        self._dropped = 0
+        self._rejected = 0
+        self._peak_queued = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+        self.configure(
+            max_concurrency=max_concurrency,
+            bot_concurrency=bot_concurrency,
+            plugin_concurrency=plugin_concurrency,
+            queue_size=queue_size,
+            overload_policy=overload_policy,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"EventScheduler(max_concurrency={self.max_concurrency}, "
+            f"bot_concurrency={self.bot_concurrency}, "
+            f"plugin_concurrency={self.plugin_concurrency}, "
+            f"queue_size={self.queue_size}, "
+            f"overload_policy={self.overload_policy!r})"
+        )
+
+    def configure(
+        self,
+        *,
+        max_concurrency: Optional[int] = None,
+        bot_concurrency: Optional[int] = None,
+        plugin_concurrency: Optional[int] = None,
+        queue_size: int = 1024,
+        overload_policy: OverloadPolicy = "drop_oldest",
+    ) -> None:
+        """修改调度器配置，参数含义参考 {ref}`nonebot.message.EventScheduler`。"""
+        for name, value in (
+            ("max_concurrency", max_concurrency),
+            ("bot_concurrency", bot_concurrency),
+            ("plugin_concurrency", plugin_concurrency),
+        ):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be a positive integer or None")
+        if queue_size < 0:
+            raise ValueError("queue_size must not be negative")
+
+        self.max_concurrency = max_concurrency
+        self.bot_concurrency = bot_concurrency
+        self.plugin_concurrency = plugin_concurrency
+        self.queue_size = queue_size
+        self.overload_policy: OverloadPolicy = overload_policy
+        # running matchers release the semaphore they acquired
+        self._plugin_semaphores.clear()
+
+        if self._queue:
+            self._drain()
+
+    @property
+    def limited(self) -> bool:
+        """是否设置了事件并发限制"""
+        return self.max_concurrency is not None or self.bot_concurrency is not None
+
+    @property
+    def running(self) -> int:
+        """正在处理的事件数量"""
+        return len(self._tasks)
+
+    @property
+    def queued(self) -> int:
+        """等待处理的事件数量"""
+        return len(self._queue)
+
+    def stats(self) -> SchedulerStats:
+        """获取调度器运行状态"""
+        return SchedulerStats(
+            queued=len(self._queue),
+            running=len(self._tasks),
+            dispatched=self._dispatched,
+            dropped=self._dropped,
+            rejected=self._rejected,
+            peak_queued=self._peak_queued,
+            wait_time_total=self._wait_time_total,
+            wait_time_max=self._wait_time_max,
+        )
+
+    def submit(self, bot: "Bot", event: "Event") -> bool:
+        """提交一个事件。
+
+        参数:
+            bot: Bot 对象
+            event: Event 对象
+
+        返回:
+            事件是否被接受
+        """
+        return self._submit(
+            _QueuedEvent(bot, event, (bot.type, bot.self_id), perf_counter())
+        )
+
+    async def process(self, bot: "Bot", event: "Event") -> bool:
+        """提交一个事件并等待处理完成。
+
+        参数:
+            bot: Bot 对象
+            event: Event 对象
+
+        返回:
+            事件是否被处理，被拒绝或排队时被丢弃时返回 `False`
+        """
+        waiter: "asyncio.Future[bool]" = asyncio.get_running_loop().create_future()
+        item = _QueuedEvent(bot, event, (bot.type, bot.self_id), perf_counter(), waiter)
+        if not self._submit(item):
+            return False
+        return await waiter
+
+    def _submit(self, item: _QueuedEvent) -> bool:
+        # queued events are all blocked by the limits when this one can start
+        if self._can_start(item.key):
+            self._start(item)
+            return True
+
+        if len(self._queue) >= self.queue_size and not self._shed(item):
+            return False
+
+        self._queue.append(item)
+        self._peak_queued = max(self._peak_queued, len(self._queue))
+        return True
+
+    def plugin_limit(self, plugin_name: Optional[str]) -> Any:
+        """获取插件的并发限制，返回一个异步上下文管理器。
+
+        参数:
+            plugin_name: 插件名称
+        """
+        if self.plugin_concurrency is None or plugin_name is None:
+            return _NO_LIMIT
+        if (semaphore := self._plugin_semaphores.get(plugin_name)) is None:
+            semaphore = asyncio.Semaphore(self.plugin_concurrency)
+            self._plugin_semaphores[plugin_name] = semaphore
+        return semaphore
+
+    async def shutdown(self) -> None:
+        """丢弃等待中的事件并等待正在处理的事件完成"""
+        self._dropped += len(self._queue)
+        for item in self._queue:
+            item.resolve(False)
+        self._queue.clear()
+        if self._tasks:
+            logger.opt(colors=True).debug(
+                "<y>Waiting for running event handlers...</y>"
+            )
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _can_start(self, key: Tuple[str, str]) -> bool:
+        return (
+            self.max_concurrency is None or len(self._tasks) < self.max_concurrency
+        ) and (
+            self.bot_concurrency is None
+            or self._bot_running.get(key, 0) < self.bot_concurrency
+        )
+
+    def _shed(self, item: _QueuedEvent) -> bool:
+        """队列已满时腾出空间，返回新事件是否可以入队"""
+        if self.overload_policy == "reject" or not self._queue:
+            self._rejected += 1
+            logger.warning(f"Event queue is full, event rejected: {item.event}")
+            return False
+
+        if self.overload_policy == "drop_meta_event":
+            for index, queued in enumerate(self._queue):
+                if _is_meta_event(queued.event):
+                    del self._queue[index]
+                    queued.resolve(False)
+                    self._dropped += 1
+                    logger.warning(
+                        f"Event queue is full, event dropped: {queued.event}"
+                    )
+                    return True
+            if _is_meta_event(item.event):
+                self._rejected += 1
+                logger.warning(f"Event queue is full, event rejected: {item.event}")
+                return False
+
+        dropped = self._queue.popleft()
+        dropped.resolve(False)
+        self._dropped += 1
+        logger.warning(f"Event queue is full, event dropped: {dropped.event}")
+        return True
+
+    def _start(self, item: _QueuedEvent) -> None:
+        wait_time = perf_counter() - item.enqueued
+        self._dispatched += 1
+        self._wait_time_total += wait_time
+        self._wait_time_max = max(self._wait_time_max, wait_time)
+
+        self._bot_running[item.key] = self._bot_running.get(item.key, 0) + 1
+        task = asyncio.create_task(self._run(item))
+        task.add_done_callback(partial(self._finish, item.key))
+        self._tasks.add(task)
+
+    async def _run(self, item: _QueuedEvent) -> None:
+        try:
+            await self.handler(item.bot, item.event)
+        except Exception as e:
+            logger.opt(colors=True, exception=e).error(
+                "<r><bg #f8bbd0>Error when handling event.</bg #f8bbd0></r>"
+            )
+        finally:
+            item.resolve(True)
+
+    def _finish(self, key: Tuple[str, str], task: "asyncio.Task[None]") -> None:
+        self._tasks.discard(task)
+        if (count := self._bot_running[key] - 1) > 0:
+            self._bot_running[key] = count
+        else:
+            del self._bot_running[key]
+        if self._queue:
+            self._drain()
+
+    def _drain(self) -> None:
+        while self._queue and (
+            self.max_concurrency is None or len(self._tasks) < self.max_concurrency
+        ):
+            if self.bot_concurrency is None:
+                self._start(self._queue.popleft())
+                continue
+
+            for index, item in enumerate(self._queue):
+                if self._can_start(item.key):
+                    del self._queue[index]
+                    self._start(item)
+                    break
+            else:
+                return
+
+
+class EventBatcher:
+    """事件微批处理器。
+
+    同一机器人的事件在缓冲区中累积，达到批次大小上限或等待时长上限后
+    一并交由批处理函数处理，以便共享批次级别的分发准备工作。
+
+    参数:
+        handler: 批处理函数
+        max_batch_size: 批次大小上限
+        max_delay: 事件在缓冲区中的最长等待时长 (秒)
+    """
+
+    def __init__(
+        self,
+        handler: Callable[["Bot", List["Event"]], Awaitable[Any]],
+        *,
+        max_batch_size: int = 32,
+        max_delay: float = 0.005,
+    ) -> None:
+        self.handler = handler
+        self._buffers: Dict[Tuple[str, str], Tuple["Bot", List["Event"]]] = {}
+        self._timers: Dict[Tuple[str, str], asyncio.TimerHandle] = {}
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self.configure(max_batch_size=max_batch_size, max_delay=max_delay)
+
+    def __repr__(self) -> str:
+        return (
+            f"EventBatcher(max_batch_size={self.max_batch_size}, "
+            f"max_delay={self.max_delay})"
+        )
+
+    def configure(self, *, max_batch_size: int = 32, max_delay: float = 0.005) -> None:
+        """修改批处理配置，参数含义参考 {ref}`nonebot.message.EventBatcher`。"""
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer")
+        if max_delay < 0:
+            raise ValueError("max_delay must not be negative")
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+
+    @property
+    def buffered(self) -> int:
+        """缓冲区中等待处理的事件数量"""
+        return sum(len(events) for _, events in self._buffers.values())
+
+    def submit(self, bot: "Bot", event: "Event") -> None:
+        """提交一个事件至缓冲区。
+
+        参数:
+            bot: Bot 对象
+            event: Event 对象
+        """
+        key = (bot.type, bot.self_id)
+        if (buffer := self._buffers.get(key)) is None:
+            buffer = self._buffers[key] = (bot, [])
+            self._timers[key] = asyncio.get_running_loop().call_later(
+                self.max_delay, self._flush, key
+            )
+
+        buffer[1].append(event)
+        if len(buffer[1]) >= self.max_batch_size:
+            self._flush(key)
+
+    def flush(self) -> None:
+        """立即处理缓冲区中的所有事件"""
+        for key in list(self._buffers):
+            self._flush(key)
+
+    async def shutdown(self) -> None:
+        """处理缓冲区中的所有事件并等待处理完成"""
+        self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush(self, key: Tuple[str, str]) -> None:
+        if (timer := self._timers.pop(key, None)) is not None:
+            timer.cancel()
+        if (buffer := self._buffers.pop(key, None)) is None:
+            return
+
+        task = asyncio.create_task(self._run(*buffer))
+        task.add_done_callback(self._tasks.discard)
+        self._tasks.add(task)
+
+    async def _run(self, bot: "Bot", events: List["Event"]) -> None:
+        try:
+            await self.handler(bot, events)
+        except Exception as e:
+            logger.opt(colors=True, exception=e).error(
+                "<r><bg #f8bbd0>Error when handling event batch.</bg #f8bbd0></r>"
+            )
+
+
+class _Lane:
+    __slots__ = ("lock", "depth")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.depth = 0
+
+
+class SessionLanes:
+    """按照会话划分的顺序执行通道。
+
+    同一会话的事件按照到达顺序依次执行，不同会话之间并行执行。
+    每个通道的深度 (正在执行与等待执行的事件数量) 有上限，
+    通道空闲后将被立即回收。
+
+    参数:
+        max_depth: 单个通道的深度上限
+    """
+
+    def __init__(self, max_depth: int = 16) -> None:
+        if max_depth < 1:
+            raise ValueError("max_depth must be a positive integer")
+        self.max_depth = max_depth
+        self._lanes: Dict[str, _Lane] = {}
+
+    def __repr__(self) -> str:
+        return f"SessionLanes(max_depth={self.max_depth}, lanes={len(self._lanes)})"
+
+    def __len__(self) -> int:
+        return len(self._lanes)
+
+    def depth(self, session_id: str) -> int:
+        """获取会话通道的深度"""
+        lane = self._lanes.get(session_id)
+        return lane.depth if lane else 0
+
+    @asynccontextmanager
+    async def enter(self, session_id: str) -> AsyncGenerator[None, None]:
+        """进入会话通道，等待同一会话中先到达的事件执行完毕。
+
+        参数:
+            session_id: 会话 ID
+
+        异常:
+            asyncio.QueueFull: 通道深度已达上限
+        """
+        if (lane := self._lanes.get(session_id)) is None:
+            lane = self._lanes[session_id] = _Lane()
+        elif lane.depth >= self.max_depth:
+            raise asyncio.QueueFull(f"Session lane {session_id!r} is full")
+
+        lane.depth += 1
+        try:
+            async with lane.lock:
+                yield
+        finally:
+            lane.depth -= 1
+            if not lane.depth:
+                del self._lanes[session_id]
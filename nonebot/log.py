@@ -14,7 +14,7 @@ FrontMatter:
 
 import sys
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict, Tuple, Union, Optional
 
 import loguru
 
@@ -71,6 +71,98 @@ def default_filter(record: "Record"):
     return record["level"].no >= levelno
 
 
+_threshold_cache: Tuple[Any, Any, int] = (None, None, 0)
+
+
+def _loguru_state() -> Optional[Tuple[Dict[int, Any], Dict[str, Any]]]:
+    """获取 loguru 当前的日志处理器与 `extra`，loguru 内部结构不符合预期时返回 `None`"""
+    core = getattr(logger, "_core", None)
+    handlers = getattr(core, "handlers", None)
+    extra = getattr(core, "extra", None)
+    if isinstance(handlers, dict) and isinstance(extra, dict):
+        return handlers, extra
+    return None
+
+
+def _effective_level() -> int:
+    global _threshold_cache
+
+    if (state := _loguru_state()) is None:
+        # loguru internals changed, assume every level may be emitted
+        return 0
+    handlers, extra = state
+    log_level = extra.get("nonebot_log_level", "INFO")
+    cached_handlers, cached_level, threshold = _threshold_cache
+    # loguru replaces the handlers dict when handlers are added or removed
+    if handlers is cached_handlers and log_level == cached_level:
+        return threshold
+
+    levelno = logger.level(log_level).no if isinstance(log_level, str) else log_level
+    # the default handler filters by `config.log_level`, others by their own level
+    # and handlers of unknown shape may emit every level
+    threshold = (
+        min(
+            (
+                max(getattr(handler, "_levelno", 0), levelno)
+                if handler_id == logger_id
+                else getattr(handler, "_levelno", 0)
+            )
+            for handler_id, handler in handlers.items()
+        )
+        if handlers
+        else sys.maxsize
+    )
+    _threshold_cache = (handlers, log_level, threshold)
+    return threshold
+
+
+def log_enabled(level: Union[int, str]) -> bool:
+    """判断指定等级的日志是否可能被输出。
+
+    默认日志处理器按照 `config.log_level` 判断，其他日志处理器按照其添加时的等级判断。
+    用于在构造开销较大的日志消息前提前跳过。
+
+    参数:
+        level: 日志等级或等级名称
+
+    用法:
+        ```python
+        if log_enabled("DEBUG"):
+            logger.debug(f"State: {state!r}")
+        ```
+    """
+    levelno = logger.level(level).no if isinstance(level, str) else level
+    return levelno >= _effective_level()
+
+
+class LogSampler:
+    """日志采样器，每 `rate` 次调用中仅有一次返回 `True`。
+
+    参数:
+        rate: 采样间隔，为 `1` 时总是返回 `True`
+    """
+
+    __slots__ = ("rate", "_count")
+
+    def __init__(self, rate: int = 1) -> None:
+        if rate < 1:
+            raise ValueError("rate must be a positive integer")
+        self.rate = rate
+        self._count = 0
+
+    def __repr__(self) -> str:
+        return f"LogSampler(rate={self.rate})"
+
+    def __call__(self) -> bool:
+        count = self._count
+        self._count = (count + 1) % self.rate
+        return count == 0
+
+
+event_log_sampler = LogSampler()
+"""事件接收与分发日志的采样器，根据 `config.log_event_sampling` 配置改变采样间隔"""
+
+
 default_format: str = (
     "<g>{time:MM-DD HH:mm:ss}</g> "
     "[<lvl>{level}</lvl>] "
@@ -90,4 +182,27 @@ logger_id = logger.add(
 )
 """默认日志处理器 id"""
 
+
+def use_log_queue() -> None:
+    """将默认日志处理器替换为非阻塞日志处理器，
+    日志消息放入队列后由 loguru 后台线程写入 stdout (`enqueue=True`)。
+
+    默认日志处理器已被移除时不做任何操作。
+    """
+    global logger_id
+
+    try:
+        logger.remove(logger_id)
+    except ValueError:
+        return
+    logger_id = logger.add(
+        sys.stdout,
+        level=0,
+        diagnose=False,
+        filter=default_filter,
+        format=default_format,
+        enqueue=True,
+    )
+
+
 __autodoc__ = {"logger_id": False}
@@ -7,11 +7,15 @@ FrontMatter:
 
 from nonebot.internal.matcher import Matcher as Matcher
 from nonebot.internal.matcher import matchers as matchers
+from nonebot.internal.matcher import ExpiryStats as ExpiryStats
 from nonebot.internal.matcher import current_bot as current_bot
+from nonebot.internal.matcher import ExpiryService as ExpiryService
 from nonebot.internal.matcher import MatcherSource as MatcherSource
 from nonebot.internal.matcher import current_event as current_event
 from nonebot.internal.matcher import MatcherManager as MatcherManager
+from nonebot.internal.matcher import WaitingSession as WaitingSession
 from nonebot.internal.matcher import MatcherProvider as MatcherProvider
+from nonebot.internal.matcher import SessionRegistry as SessionRegistry
 from nonebot.internal.matcher import current_handler as current_handler
 from nonebot.internal.matcher import current_matcher as current_matcher
 from nonebot.internal.matcher import DEFAULT_PROVIDER_CLASS as DEFAULT_PROVIDER_CLASS
@@ -22,4 +26,8 @@ __autodoc__ = {
     "MatcherManager": True,
     "MatcherProvider": True,
     "DEFAULT_PROVIDER_CLASS": True,
+    "WaitingSession": True,
+    "SessionRegistry": True,
+    "ExpiryService": True,
+    "ExpiryStats": True,
 }
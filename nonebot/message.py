@@ -10,14 +10,40 @@ FrontMatter:
 import asyncio
 import contextlib
 from datetime import datetime
+from time import perf_counter
 from contextlib import AsyncExitStack
-from typing import TYPE_CHECKING, Any, Set, Dict, Type, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Set,
+    Dict,
+    List,
+    Type,
+    Tuple,
+    TypeVar,
+    Iterable,
+    Iterator,
+    Optional,
+    Protocol,
+    Coroutine,
+)
 
-from nonebot.log import logger
 from nonebot.rule import TrieRule
 from nonebot.dependencies import Dependent
-from nonebot.matcher import Matcher, matchers
-from nonebot.utils import escape_tag, run_coro_with_catch
+from nonebot.internal.matcher import MatcherIndex
+from nonebot.internal.metrics import current_matcher
+from nonebot.internal.metrics import Metrics as Metrics
+from nonebot.internal.metrics import metrics as metrics
+from nonebot.internal.metrics import Histogram as Histogram
+from nonebot.internal.metrics import MetricKey as MetricKey
+from nonebot.matcher import Matcher, WaitingSession, matchers
+from nonebot.log import logger, log_enabled, event_log_sampler
+from nonebot.internal.scheduler import EventBatcher as EventBatcher
+from nonebot.internal.scheduler import SessionLanes as SessionLanes
+from nonebot.internal.scheduler import EventScheduler as EventScheduler
+from nonebot.internal.scheduler import OverloadPolicy as OverloadPolicy
+from nonebot.internal.scheduler import SchedulerStats as SchedulerStats
+from nonebot.utils import LayeredState, escape_tag, run_coro_with_catch
 from nonebot.exception import (
     NoLogException,
     StopPropagation,
@@ -46,11 +72,30 @@ from nonebot.internal.params import (
 if TYPE_CHECKING:
     from nonebot.adapters import Bot, Event
 
+R = TypeVar("R")
+
+
+class EventForwarder(Protocol):
+    """事件转发器，如 {ref}`nonebot.worker.WorkerPool`。
+
+    设置后 {ref}`nonebot.message.handle_event` 与
+    {ref}`nonebot.message.handle_events` 将事件转发至转发器处理。
+    """
+
+    async def handle_event(self, bot: "Bot", event: "Event") -> None: ...
+
+    async def handle_events(self, bot: "Bot", events: Iterable["Event"]) -> None: ...
+
+
 _event_preprocessors: Set[Dependent[Any]] = set()
 _event_postprocessors: Set[Dependent[Any]] = set()
 _run_preprocessors: Set[Dependent[Any]] = set()
 _run_postprocessors: Set[Dependent[Any]] = set()
 
+_matcher_indexes: Dict[int, MatcherIndex] = {}
+_dispatch_plan: Optional[Tuple[Any, Tuple[Tuple[int, MatcherIndex], ...]]] = None
+_event_forwarder: Optional[EventForwarder] = None
+
 EVENT_PCS_PARAMS = (
     DependParam,
     BotParam,
@@ -154,12 +199,16 @@ async def _apply_event_preprocessors(
         await asyncio.gather(
             *(
                 run_coro_with_catch(
-                    proc(
-                        bot=bot,
-                        event=event,
-                        state=state,
-                        stack=stack,
-                        dependency_cache=dependency_cache,
+                    _timed(
+                        "event_preprocessor",
+                        proc,
+                        proc(
+                            bot=bot,
+                            event=event,
+                            state=state,
+                            stack=stack,
+                            dependency_cache=dependency_cache,
+                        ),
                     ),
                     (SkippedException,),
                 )
@@ -209,12 +258,16 @@ async def _apply_event_postprocessors(
         await asyncio.gather(
             *(
                 run_coro_with_catch(
-                    proc(
-                        bot=bot,
-                        event=event,
-                        state=state,
-                        stack=stack,
-                        dependency_cache=dependency_cache,
+                    _timed(
+                        "event_postprocessor",
+                        proc,
+                        proc(
+                            bot=bot,
+                            event=event,
+                            state=state,
+                            stack=stack,
+                            dependency_cache=dependency_cache,
+                        ),
                     ),
                     (SkippedException,),
                 )
@@ -257,13 +310,18 @@ async def _apply_run_preprocessors(
             await asyncio.gather(
                 *(
                     run_coro_with_catch(
-                        proc(
-                            matcher=matcher,
-                            bot=bot,
-                            event=event,
-                            state=state,
-                            stack=stack,
-                            dependency_cache=dependency_cache,
+                        _timed(
+                            "run_preprocessor",
+                            proc,
+                            proc(
+                                matcher=matcher,
+                                bot=bot,
+                                event=event,
+                                state=state,
+                                stack=stack,
+                                dependency_cache=dependency_cache,
+                            ),
+                            matcher,
                         ),
                         (SkippedException,),
                     )
@@ -309,14 +367,19 @@ async def _apply_run_postprocessors(
             await asyncio.gather(
                 *(
                     run_coro_with_catch(
-                        proc(
-                            matcher=matcher,
-                            exception=exception,
-                            bot=bot,
-                            event=event,
-                            state=matcher.state,
-                            stack=stack,
-                            dependency_cache=dependency_cache,
+                        _timed(
+                            "run_postprocessor",
+                            proc,
+                            proc(
+                                matcher=matcher,
+                                exception=exception,
+                                bot=bot,
+                                event=event,
+                                state=matcher.state,
+                                stack=stack,
+                                dependency_cache=dependency_cache,
+                            ),
+                            matcher,
                         ),
                         (SkippedException,),
                     )
@@ -329,6 +392,51 @@ async def _apply_run_postprocessors(
             )
 
 
+def _timed(
+    stage: str,
+    proc: Dependent[Any],
+    coro: Coroutine[Any, Any, R],
+    matcher: Optional[Matcher] = None,
+) -> Coroutine[Any, Any, R]:
+    """开启耗时统计时记录处理函数的耗时"""
+    if not metrics.enabled:
+        return coro
+    return metrics.timed(stage, proc.call, coro, matcher and type(matcher))
+
+
+def _get_matcher_index(
+    priority: int, priority_matchers: Tuple[Type[Matcher], ...]
+) -> MatcherIndex:
+    """获取指定优先级的事件响应器分发索引。
+
+    当该优先级的事件响应器发生变化时重新构建索引。
+
+    参数:
+        priority: 优先级
+        priority_matchers: 该优先级的事件响应器快照
+    """
+    index = _matcher_indexes.get(priority)
+    if index is None or index.matchers is not priority_matchers:
+        index = _matcher_indexes[priority] = MatcherIndex(priority_matchers)
+    return index
+
+
+def _get_dispatch_plan() -> Tuple[Tuple[int, MatcherIndex], ...]:
+    """获取当前事件响应器快照对应的各优先级分发索引"""
+    global _dispatch_plan
+
+    snapshot = matchers.snapshot()
+    if _dispatch_plan is None or _dispatch_plan[0] is not snapshot:
+        _dispatch_plan = (
+            snapshot,
+            tuple(
+                (priority, _get_matcher_index(priority, priority_matchers))
+                for priority, priority_matchers in snapshot
+            ),
+        )
+    return _dispatch_plan[1]
+
+
 async def _check_matcher(
     Matcher: Type[Matcher],
     bot: "Bot",
@@ -353,13 +461,17 @@ async def _check_matcher(
         bool: 是否符合运行条件
     """
     if Matcher.expire_time and datetime.now() > Matcher.expire_time:
-        with contextlib.suppress(Exception):
-            Matcher.destroy()
+        matchers.expiry.expire_matcher(Matcher)
         return False
 
+    if metrics.enabled:
+        # tag checker timings with the matcher being checked
+        current_matcher.set(Matcher)
+
     try:
         if not await Matcher.check_perm(bot, event, stack, dependency_cache):
-            logger.trace(f"Permission conditions not met for {Matcher}")
+            if log_enabled("TRACE"):
+                logger.trace(f"Permission conditions not met for {Matcher}")
             return False
     except Exception as e:
         logger.opt(colors=True, exception=e).error(
@@ -369,7 +481,8 @@ async def _check_matcher(
 
     try:
         if not await Matcher.check_rule(bot, event, state, stack, dependency_cache):
-            logger.trace(f"Rule conditions not met for {Matcher}")
+            if log_enabled("TRACE"):
+                logger.trace(f"Rule conditions not met for {Matcher}")
             return False
     except Exception as e:
         logger.opt(colors=True, exception=e).error(
@@ -387,6 +500,7 @@ async def _run_matcher(
     state: T_State,
     stack: Optional[AsyncExitStack] = None,
     dependency_cache: Optional[T_DependencyCache] = None,
+    matcher: Optional[Matcher] = None,
 ) -> None:
     """运行事件响应器。
 
@@ -399,17 +513,20 @@ async def _run_matcher(
         state: 会话状态
         stack: 异步上下文栈
         dependency_cache: 依赖缓存
+        matcher: 继续等待中会话的事件响应器实例，默认创建新的实例
 
     异常:
         StopPropagation: 阻止事件继续传播
     """
-    logger.info(f"Event will be handled by {Matcher}")
+    if log_enabled("INFO"):
+        logger.info(f"Event will be handled by {Matcher}")
 
-    if Matcher.temp:
-        with contextlib.suppress(Exception):
-            Matcher.destroy()
+    if matcher is None:
+        if Matcher.temp:
+            with contextlib.suppress(Exception):
+                Matcher.destroy()
 
-    matcher = Matcher()
+        matcher = Matcher()
 
     if not await _apply_run_preprocessors(
         bot=bot,
@@ -421,17 +538,26 @@ async def _run_matcher(
     ):
         return
 
+    # run preprocessors may modify the message
+    if _run_preprocessors:
+        event.clear_cache()
+
     exception = None
 
     try:
-        logger.debug(f"Running {matcher}")
-        await matcher.run(bot, event, state, stack, dependency_cache)
+        if log_enabled("DEBUG"):
+            logger.debug(f"Running {matcher}")
+        async with _event_scheduler.plugin_limit(Matcher.plugin_name):
+            await matcher.run(bot, event, state, stack, dependency_cache)
     except Exception as e:
         logger.opt(colors=True, exception=e).error(
             f"<r><bg #f8bbd0>Running {matcher} failed.</bg #f8bbd0></r>"
         )
         exception = e
 
+    # handlers may modify the message for matchers in lower priorities
+    event.clear_cache()
+
     await _apply_run_postprocessors(
         bot=bot,
         event=event,
@@ -483,6 +609,72 @@ async def check_and_run_matcher(
     )
 
 
+async def check_and_run_waiting(
+    waiting: WaitingSession,
+    bot: "Bot",
+    event: "Event",
+    state: T_State,
+    stack: Optional[AsyncExitStack] = None,
+    dependency_cache: Optional[T_DependencyCache] = None,
+) -> None:
+    """检查并继续运行等待用户回复的会话。
+
+    会话满足类型与权限时将从 {ref}`nonebot.matcher.SessionRegistry` 中移除后继续运行。
+
+    参数:
+        waiting: 等待中的会话
+        bot: Bot 对象
+        event: Event 对象
+        state: 会话状态
+        stack: 异步上下文栈
+        dependency_cache: 依赖缓存
+    """
+    if metrics.enabled:
+        current_matcher.set(waiting.view)
+
+    try:
+        if not await waiting.view.check_perm(bot, event, stack, dependency_cache):
+            if log_enabled("TRACE"):
+                logger.trace(f"Permission conditions not met for {waiting}")
+            return
+    except Exception as e:
+        logger.opt(colors=True, exception=e).error(
+            f"<r><bg #f8bbd0>Permission check failed for {waiting}.</bg #f8bbd0></r>"
+        )
+        return
+
+    # the session may have been resumed by another event meanwhile
+    if not matchers.sessions.discard(waiting):
+        return
+
+    await _run_matcher(
+        Matcher=waiting.view,
+        bot=bot,
+        event=event,
+        state=state,
+        stack=stack,
+        dependency_cache=dependency_cache,
+        matcher=waiting.resume(),
+    )
+
+
+def _iter_stages(
+    plan: Tuple[Tuple[int, MatcherIndex], ...], waiting: List[WaitingSession]
+) -> Iterator[Tuple[int, Optional[MatcherIndex], List[WaitingSession]]]:
+    """按优先级生成分发阶段，等待中的会话与优先级 `0` 的事件响应器同时检查"""
+    for priority, index in plan:
+        if waiting and priority >= 0:
+            if priority == 0:
+                yield priority, index, waiting
+                waiting = []
+                continue
+            yield 0, None, waiting
+            waiting = []
+        yield priority, index, []
+    if waiting:
+        yield 0, None, waiting
+
+
 async def handle_event(bot: "Bot", event: "Event") -> None:
     """处理一个事件。调用该函数以实现分发事件。
 
@@ -495,33 +687,98 @@ async def handle_event(bot: "Bot", event: "Event") -> None:
         import asyncio
         asyncio.create_task(handle_event(bot, event))
         ```
+
+    设置了事件并发限制 (`event_concurrency`/`event_bot_concurrency`) 时，
+    事件将经由事件调度器排队处理，参考 {ref}`nonebot.message.EventScheduler`。
+    设置了事件转发器时，事件将被转发至转发器处理。
     """
-    show_log = True
-    log_msg = f"<m>{escape_tag(bot.type)} {escape_tag(bot.self_id)}</m> | "
-    try:
-        log_msg += event.get_log_string()
-    except NoLogException:
-        show_log = False
+    if _event_scheduler.limited:
+        await _event_scheduler.process(bot, event)
+        return
+    await _process_event(bot, event)
+
+
+async def _process_event(bot: "Bot", event: "Event") -> None:
+    if _event_forwarder is not None:
+        await _event_forwarder.handle_event(bot, event)
+        return
+    await _handle_event(bot, event, _get_dispatch_plan())
+
+
+async def handle_events(bot: "Bot", events: Iterable["Event"]) -> None:
+    """批量处理同一 Bot 的多个事件。
+
+    每个事件与 {ref}`nonebot.message.handle_event` 一样经由事件调度器的并发限制，
+    在开始处理时获取最新的事件响应器快照，拥有独立的会话状态与传播流程，并发处理。
+    设置了事件转发器且未设置事件并发限制时，整批事件将被转发至转发器处理。
+
+    参数:
+        bot: Bot 对象
+        events: Event 对象序列
+
+    用法:
+        ```python
+        import asyncio
+        asyncio.create_task(handle_events(bot, [event1, event2]))
+        ```
+    """
+    if _event_forwarder is not None and not _event_scheduler.limited:
+        await _event_forwarder.handle_events(bot, events)
+        return
+    results = await asyncio.gather(
+        *(handle_event(bot, event) for event in events),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.opt(colors=True, exception=result).error(
+                "<r><bg #f8bbd0>Error when handling event.</bg #f8bbd0></r>"
+            )
+
+
+async def _handle_event(
+    bot: "Bot", event: "Event", plan: Tuple[Tuple[int, MatcherIndex], ...]
+) -> None:
+    # build log messages only when they will be emitted
+    show_log = log_enabled("SUCCESS") and event_log_sampler()
     if show_log:
-        logger.opt(colors=True).success(log_msg)
+        try:
+            logger.opt(colors=True).success(
+                f"<m>{escape_tag(bot.type)} {escape_tag(bot.self_id)}</m> | "
+                + event.get_log_string()
+            )
+        except NoLogException:
+            show_log = False
+    show_log = show_log and log_enabled("DEBUG")
 
     state: Dict[Any, Any] = {}
     dependency_cache: T_DependencyCache = {}
 
     # create event scope context
     async with AsyncExitStack() as stack:
+        stack.enter_context(event._cache_scope())
+
         if not await _apply_event_preprocessors(
             bot=bot,
             event=event,
             state=state,
             stack=stack,
             dependency_cache=dependency_cache,
+            show_log=show_log,
         ):
             return
 
+        # event preprocessors may modify the message
+        event.clear_cache()
+
         # Trie Match
         try:
-            TrieRule.get_value(bot, event, state)
+            if metrics.enabled:
+                start = perf_counter()
+                TrieRule.get_value(bot, event, state)
+                metrics.observe("trie", "TrieRule.get_value", perf_counter() - start)
+            else:
+                TrieRule.get_value(bot, event, state)
         except Exception as e:
             logger.opt(colors=True, exception=e).warning(
                 "Error while parsing command for event"
@@ -529,19 +786,39 @@ async def handle_event(bot: "Bot", event: "Event") -> None:
 
         break_flag = False
         # iterate through all priority until stop propagation
-        for priority in sorted(matchers.keys()):
+        for priority, index, waiting in _iter_stages(
+            plan, matchers.sessions.select(event)
+        ):
             if break_flag:
                 break
 
             if show_log:
                 logger.debug(f"Checking for matchers in priority {priority}...")
 
+            # matchers share the event state and keep their own writes
             pending_tasks = [
-                check_and_run_matcher(
-                    matcher, bot, event, state.copy(), stack, dependency_cache
+                check_and_run_waiting(
+                    session,
+                    bot,
+                    event,
+                    LayeredState(state),
+                    stack,
+                    dependency_cache,
                 )
-                for matcher in matchers[priority]
+                for session in waiting
             ]
+            if index is not None:
+                pending_tasks.extend(
+                    check_and_run_matcher(
+                        matcher,
+                        bot,
+                        event,
+                        LayeredState(state),
+                        stack,
+                        dependency_cache,
+                    )
+                    for matcher in index.select(bot, event, state)
+                )
             results = await asyncio.gather(*pending_tasks, return_exceptions=True)
             for result in results:
                 if not isinstance(result, Exception):
@@ -557,4 +834,72 @@ async def handle_event(bot: "Bot", event: "Event") -> None:
         if show_log:
             logger.debug("Checking for matchers completed")
 
-        await _apply_event_postprocessors(bot, event, state, stack, dependency_cache)
+        await _apply_event_postprocessors(
+            bot, event, state, stack, dependency_cache, show_log
+        )
+
+
+def set_event_forwarder(forwarder: Optional[EventForwarder]) -> None:
+    """设置事件转发器，所有经由 {ref}`nonebot.message.handle_event` 与
+    {ref}`nonebot.message.handle_events` 处理的事件 (包括事件调度器与微批处理器
+    提交的事件) 都将被转发至转发器处理。
+
+    参数:
+        forwarder: 事件转发器，为 `None` 时取消转发，在当前进程中处理事件
+    """
+    global _event_forwarder
+
+    _event_forwarder = forwarder
+
+
+_event_scheduler = EventScheduler(_process_event)
+
+
+def get_event_scheduler() -> EventScheduler:
+    """获取全局事件调度器"""
+    return _event_scheduler
+
+
+def dispatch_event(bot: "Bot", event: "Event") -> bool:
+    """提交一个事件至事件调度器，由调度器按照并发限制处理，不等待处理完成。
+
+    参数:
+        bot: Bot 对象
+        event: Event 对象
+
+    返回:
+        事件是否被接受，队列已满且过载策略为拒绝时返回 `False`
+
+    用法:
+        ```python
+        dispatch_event(bot, event)
+        ```
+    """
+    return _event_scheduler.submit(bot, event)
+
+
+_event_batcher = EventBatcher(handle_events)
+
+
+def get_event_batcher() -> EventBatcher:
+    """获取全局事件微批处理器"""
+    return _event_batcher
+
+
+def batch_event(bot: "Bot", event: "Event") -> None:
+    """提交一个事件至事件微批处理器，同一 Bot 的事件将被合并后调用
+    {ref}`nonebot.message.handle_events` 处理。
+
+    适用于一次 Webhook 请求或 WebSocket 帧中收到大量事件的协议适配器。
+
+    参数:
+        bot: Bot 对象
+        event: Event 对象
+
+    用法:
+        ```python
+        for event in events:
+            batch_event(bot, event)
+        ```
+    """
+    _event_batcher.submit(bot, event)
@@ -60,6 +60,7 @@ def EventType() -> str:
 
 
 async def _event_message(event: Event) -> Message:
+    # handlers may modify the message, the shared cached message is not used
     return event.get_message()
 
 
@@ -69,7 +70,7 @@ def EventMessage() -> Any:
 
 
 async def _event_plain_text(event: Event) -> str:
-    return event.get_plaintext()
+    return event.get_cached_plaintext()
 
 
 def EventPlainText() -> str:
@@ -14,8 +14,10 @@ from nonebot.adapters import Bot, Event
 from nonebot.internal.permission import USER as USER
 from nonebot.internal.permission import User as User
 from nonebot.internal.permission import Permission as Permission
+from nonebot.internal.checker import checker_cost as checker_cost
 
 
+@checker_cost(0)
 class Message:
     """检查是否为消息事件"""
 
@@ -28,6 +30,7 @@ class Message:
         return type == "message"
 
 
+@checker_cost(0)
 class Notice:
     """检查是否为通知事件"""
 
@@ -40,6 +43,7 @@ class Notice:
         return type == "notice"
 
 
+@checker_cost(0)
 class Request:
     """检查是否为请求事件"""
 
@@ -52,6 +56,7 @@ class Request:
         return type == "request"
 
 
+@checker_cost(0)
 class MetaEvent:
     """检查是否为元事件"""
 
@@ -86,6 +91,7 @@ METAEVENT: Permission = Permission(MetaEvent())
 """
 
 
+@checker_cost(0)
 class SuperUser:
     """检查当前事件是否是消息事件且属于超级管理员"""
 
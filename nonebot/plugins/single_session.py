@@ -1,41 +1,48 @@
-from typing import Dict, AsyncGenerator
+import asyncio
+from typing import AsyncGenerator
+
+from pydantic import BaseModel
 
 from nonebot.adapters import Event
 from nonebot.params import Depends
-from nonebot.plugin import PluginMetadata
-from nonebot.message import IgnoredException, event_preprocessor
+from nonebot.plugin import PluginMetadata, get_plugin_config
+from nonebot.message import SessionLanes, IgnoredException, event_preprocessor
+
+
+class Config(BaseModel):
+    session_lane_depth: int = 16
+    """同一会话中正在处理与等待处理的事件数量上限，超出的事件将被忽略"""
+
 
 __plugin_meta__ = PluginMetadata(
     name="唯一会话",
-    description="限制同一会话内同时只能运行一个响应器",
+    description="同一会话内的事件按顺序依次处理",
     usage="加载插件后自动生效",
     type="application",
     homepage="https://github.com/nonebot/nonebot2/blob/master/nonebot/plugins/single_session.py",
-    config=None,
+    config=Config,
     supported_adapters=None,
 )
 
-_running_matcher: Dict[str, int] = {}
+plugin_config = get_plugin_config(Config)
 
+_session_lanes = SessionLanes(plugin_config.session_lane_depth)
 
-async def matcher_mutex(event: Event) -> AsyncGenerator[bool, None]:
-    result = False
+
+async def session_lane(event: Event) -> AsyncGenerator[None, None]:
     try:
         session_id = event.get_session_id()
     except Exception:
-        yield result
-    else:
-        current_event_id = id(event)
-        if event_id := _running_matcher.get(session_id):
-            result = event_id != current_event_id
-        else:
-            _running_matcher[session_id] = current_event_id
-        yield result
-        if not result:
-            del _running_matcher[session_id]
+        yield
+        return
+
+    try:
+        async with _session_lanes.enter(session_id):
+            yield
+    except asyncio.QueueFull as e:
+        raise IgnoredException("Too many events waiting in session") from e
 
 
 @event_preprocessor
-async def preprocess(mutex: bool = Depends(matcher_mutex)):
-    if mutex:
-        raise IgnoredException("Another matcher running")
+async def preprocess(_: None = Depends(session_lane)):
+    pass
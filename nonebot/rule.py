@@ -11,8 +11,10 @@ FrontMatter:
 
 import re
 import shlex
+import weakref
 from argparse import Action
 from gettext import gettext
+from collections import deque
 from argparse import ArgumentError
 from contextvars import ContextVar
 from itertools import chain, product
@@ -21,27 +23,35 @@ from argparse import ArgumentParser as ArgParser
 from typing import (
     IO,
     TYPE_CHECKING,
+    Any,
+    Set,
+    Dict,
     List,
     Type,
     Tuple,
     Union,
+    Pattern,
     TypeVar,
+    Callable,
+    ClassVar,
+    Iterator,
     Optional,
     Sequence,
+    FrozenSet,
     TypedDict,
     NamedTuple,
+    MutableMapping,
     cast,
     overload,
 )
 
-from pygtrie import CharTrie
-
 from nonebot import get_driver
 from nonebot.log import logger
 from nonebot.typing import T_State
 from nonebot.exception import ParserExit
 from nonebot.internal.rule import Rule as Rule
 from nonebot.adapters import Bot, Event, Message, MessageSegment
+from nonebot.internal.checker import checker_cost as checker_cost
 from nonebot.params import Command, EventToMe, CommandArg, CommandWhitespace
 from nonebot.consts import (
     CMD_KEY,
@@ -59,8 +69,20 @@ from nonebot.consts import (
     CMD_WHITESPACE_KEY,
 )
 
+try:  # pragma: py-gte-311
+    from re import _parser as sre_parse  # type: ignore
+except ImportError:  # pragma: py-lt-311
+    import sre_parse
+
 T = TypeVar("T")
 
+_REPEAT_OPCODES = tuple(
+    getattr(sre_parse, name)
+    for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_parse, name)
+)
+_ATOMIC_GROUP = getattr(sre_parse, "ATOMIC_GROUP", None)
+
 
 class CMD_RESULT(TypedDict):
     command: Optional[Tuple[str, ...]]
@@ -78,8 +100,213 @@ class TRIE_VALUE(NamedTuple):
 parser_message: ContextVar[str] = ContextVar("parser_message")
 
 
+class PREFIX_MATCH(NamedTuple):
+    key: str
+    value: TRIE_VALUE
+
+    def __bool__(self) -> bool:
+        return self.key is not None
+
+
+_NO_PREFIX_MATCH = PREFIX_MATCH(None, None)  # type: ignore
+
+
+class PrefixTable(MutableMapping[str, TRIE_VALUE]):
+    """命令前缀表。
+
+    按照前缀长度分组的字典查找实现最长前缀匹配，查找开销与不同前缀长度的数量相关，
+    与前缀数量无关。长度表在插件加载完成后首次查找时编译，修改前缀后重新编译。
+
+    兼容此前使用的 `pygtrie.CharTrie` 的常用接口：`longest_prefix` 未匹配时
+    返回 `key` 与 `value` 均为 `None` 的假值结果，`items` 可按前缀筛选。
+    """
+
+    def __init__(self) -> None:
+        self._prefixes: Dict[str, TRIE_VALUE] = {}
+        self._lengths: Optional[Tuple[int, ...]] = None
+
+    def __repr__(self) -> str:
+        return f"PrefixTable({self._prefixes!r})"
+
+    def __getitem__(self, key: str) -> TRIE_VALUE:
+        return self._prefixes[key]
+
+    def __setitem__(self, key: str, value: TRIE_VALUE) -> None:
+        self._prefixes[key] = value
+        self._lengths = None
+
+    def __delitem__(self, key: str) -> None:
+        del self._prefixes[key]
+        self._lengths = None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._prefixes)
+
+    def __len__(self) -> int:
+        return len(self._prefixes)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._prefixes
+
+    def items(self, prefix: Optional[str] = None) -> List[Tuple[str, TRIE_VALUE]]:
+        """获取所有前缀，指定 `prefix` 时仅返回以其开头的前缀"""
+        if prefix is None:
+            return list(self._prefixes.items())
+        return [item for item in self._prefixes.items() if item[0].startswith(prefix)]
+
+    def longest_prefix(self, text: str) -> PREFIX_MATCH:
+        """查找文本的最长前缀，未匹配时返回假值"""
+        if (lengths := self._lengths) is None:
+            lengths = self._lengths = tuple(
+                sorted({len(key) for key in self._prefixes}, reverse=True)
+            )
+        prefixes = self._prefixes
+        size = len(text)
+        for length in lengths:
+            if length <= size and (value := prefixes.get(key := text[:length])):
+                return PREFIX_MATCH(key, value)
+        return _NO_PREFIX_MATCH
+
+
+_CommandStage = Callable[[], Tuple[Dict[str, Any], Optional["_CommandStage"]]]
+
+
+class _LazyCommandResult(Dict[str, Any]):
+    """首次读取时才构造的 `CMD_RESULT`。
+
+    每个阶段返回本阶段的字段与下一阶段，读取字段时仅执行到该字段出现为止。
+    """
+
+    __slots__ = ("_parse",)
+
+    def __init__(self, result: Dict[str, Any], parse: _CommandStage) -> None:
+        super().__init__(result)
+        self._parse: Optional[_CommandStage] = parse
+
+    def _resolve(self, key: Optional[str] = None) -> None:
+        while (parse := self._parse) is not None and (
+            key is None or not super().__contains__(key)
+        ):
+            self._parse = None
+            values, self._parse = parse()
+            for name, value in values.items():
+                super().setdefault(name, value)
+
+    def __missing__(self, key: str) -> Any:
+        self._resolve(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        self._resolve(key)
+        return super().__contains__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._resolve(key)
+        return super().get(key, default)
+
+    def __iter__(self) -> Iterator[str]:
+        self._resolve()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self._resolve()
+        return super().__len__()
+
+    def __eq__(self, other: object) -> bool:
+        self._resolve()
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        self._resolve()
+        return super().__ne__(other)
+
+    def __reversed__(self) -> Iterator[str]:
+        self._resolve()
+        return super().__reversed__()
+
+    def __delitem__(self, key: str) -> None:
+        self._resolve()
+        super().__delitem__(key)
+
+    def pop(self, key: str, *args: Any) -> Any:
+        self._resolve()
+        return super().pop(key, *args)
+
+    def popitem(self) -> Tuple[str, Any]:
+        self._resolve()
+        return super().popitem()
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        self._resolve()
+        return super().setdefault(key, default)
+
+    def __or__(self, other: Any) -> Any:
+        self._resolve()
+        return dict(super().items()) | other
+
+    def __ror__(self, other: Any) -> Any:
+        self._resolve()
+        return other | dict(super().items())
+
+    def __repr__(self) -> str:
+        self._resolve()
+        return super().__repr__()
+
+    def keys(self):
+        self._resolve()
+        return super().keys()
+
+    def values(self):
+        self._resolve()
+        return super().values()
+
+    def items(self):
+        self._resolve()
+        return super().items()
+
+    def copy(self) -> Dict[str, Any]:
+        self._resolve()
+        return dict(super().items())
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
+
+
+def _parse_command_arg(
+    msg: Message, segment_text: str, raw_command: str
+) -> Dict[str, Any]:
+    """构造命令参数与命令与参数之间的空白。
+
+    参数:
+        msg: 除命令所在消息段外的剩余消息，将被修改
+        segment_text: 命令所在消息段的文本
+        raw_command: 匹配到的命令前缀
+    """
+    # check whitespace
+    arg_str = segment_text[len(raw_command) :]
+    arg_str_stripped = arg_str.lstrip()
+    # check next segment until arg detected or no text remain
+    while not arg_str_stripped and msg and msg[0].is_text():
+        arg_str += str(msg.pop(0))
+        arg_str_stripped = arg_str.lstrip()
+
+    whitespace = None
+    has_arg = arg_str_stripped or msg
+    if has_arg and (stripped_len := len(arg_str) - len(arg_str_stripped)) > 0:
+        whitespace = arg_str[:stripped_len]
+
+    # construct command arg
+    if arg_str_stripped:
+        new_message = msg.__class__(arg_str_stripped)
+        for new_segment in reversed(new_message):
+            msg.insert(0, new_segment)
+    return {CMD_ARG_KEY: msg, CMD_WHITESPACE_KEY: whitespace}
+
+
 class TrieRule:
-    prefix: CharTrie = CharTrie()
+    prefix: PrefixTable = PrefixTable()
 
     @classmethod
     def add_prefix(cls, prefix: str, value: TRIE_VALUE) -> None:
@@ -90,55 +317,189 @@ class TrieRule:
 
     @classmethod
     def get_value(cls, bot: Bot, event: Event, state: T_State) -> CMD_RESULT:
-        prefix = CMD_RESULT(
-            command=None,
-            raw_command=None,
-            command_arg=None,
-            command_start=None,
-            command_whitespace=None,
-        )
-        state[PREFIX_KEY] = prefix
-        if event.get_type() != "message":
+        """写入 `state[PREFIX_KEY]`，命令前缀在首次读取时才匹配。
+
+        命令参数 `command_arg` 与空白 `command_whitespace` 在首次读取时才构造。
+        """
+        if event.get_type() != "message" or not cls.prefix:
+            prefix = state[PREFIX_KEY] = CMD_RESULT(
+                command=None,
+                raw_command=None,
+                command_arg=None,
+                command_start=None,
+                command_whitespace=None,
+            )
             return prefix
 
-        message = event.get_message()
-        message_seg: MessageSegment = message[0]
-        if message_seg.is_text():
+        message = event.get_cached_message()
+        prefix = state[PREFIX_KEY] = cast(
+            CMD_RESULT,
+            _LazyCommandResult({}, lambda: cls._match_prefix(message)),
+        )
+        return prefix
+
+    @classmethod
+    def _match_prefix(
+        cls, message: Message
+    ) -> Tuple[Dict[str, Any], Optional[_CommandStage]]:
+        if message and (message_seg := message[0]).is_text():
             segment_text = str(message_seg).lstrip()
             if pf := cls.prefix.longest_prefix(segment_text):
-                value: TRIE_VALUE = pf.value
-                prefix[RAW_CMD_KEY] = pf.key
-                prefix[CMD_START_KEY] = value.command_start
-                prefix[CMD_KEY] = value.command
-
-                msg = message.copy()
-                msg.pop(0)
-
-                # check whitespace
-                arg_str = segment_text[len(pf.key) :]
-                arg_str_stripped = arg_str.lstrip()
-                # check next segment until arg detected or no text remain
-                while not arg_str_stripped and msg and msg[0].is_text():
-                    arg_str += str(msg.pop(0))
-                    arg_str_stripped = arg_str.lstrip()
-
-                has_arg = arg_str_stripped or msg
-                if (
-                    has_arg
-                    and (stripped_len := len(arg_str) - len(arg_str_stripped)) > 0
-                ):
-                    prefix[CMD_WHITESPACE_KEY] = arg_str[:stripped_len]
-
-                # construct command arg
-                if arg_str_stripped:
-                    new_message = msg.__class__(arg_str_stripped)
-                    for new_segment in reversed(new_message):
-                        msg.insert(0, new_segment)
-                prefix[CMD_ARG_KEY] = msg
+                value = pf.value
+                raw_command = pf.key
+                # segments are copied only when the command arg is built
+                rest = message[1:]
+                return {
+                    CMD_KEY: value.command,
+                    RAW_CMD_KEY: raw_command,
+                    CMD_START_KEY: value.command_start,
+                }, lambda: (
+                    _parse_command_arg(
+                        rest.__class__(seg.copy() for seg in rest),
+                        segment_text,
+                        raw_command,
+                    ),
+                    None,
+                )
+        return {
+            CMD_KEY: None,
+            RAW_CMD_KEY: None,
+            CMD_ARG_KEY: None,
+            CMD_START_KEY: None,
+            CMD_WHITESPACE_KEY: None,
+        }, None
+
+
+class LITERAL_RESULT(NamedTuple):
+    found: FrozenSet[str]
+    """消息纯文本中出现的所有字面量"""
+    prefixes: FrozenSet[str]
+    """消息纯文本开头的字面量"""
+    suffixes: Dict[str, int]
+    """消息纯文本结尾的字面量及其起始位置"""
+
+
+class LiteralRule:
+    """所有字面量规则共享的多模式匹配自动机 (Aho–Corasick)。
+
+    前缀、后缀与关键词规则在创建时注册字面量，
+    每段消息纯文本仅需扫描一次即可得到所有规则的匹配结果。
+    字面量按照注册的规则实例计数，规则实例 (随事件响应器销毁) 被回收后移除。
+    """
 
-        return prefix
+    literals: ClassVar[Dict[str, int]] = {}
+    cache_size: ClassVar[int] = 128
+
+    _goto: ClassVar[List[Dict[str, int]]] = [{}]
+    _fail: ClassVar[List[int]] = [0]
+    _output: ClassVar[List[Tuple[str, ...]]] = [()]
+    _dirty: ClassVar[bool] = False
+    _cache: ClassVar[Dict[str, LITERAL_RESULT]] = {}
+
+    @classmethod
+    def register(cls, owner: object, *literals: str) -> None:
+        """注册规则实例使用的字面量，规则实例被回收时自动移除。
+
+        参数:
+            owner: 使用字面量的规则实例
+            literals: 字面量
+        """
+        if literals := tuple(literal for literal in literals if literal):
+            cls.add_literal(*literals)
+            weakref.finalize(owner, cls.remove_literal, *literals)
+
+    @classmethod
+    def add_literal(cls, *literals: str) -> None:
+        """增加字面量的引用计数"""
+        for literal in literals:
+            if not literal:
+                continue
+            if (count := cls.literals.get(literal, 0)) == 0:
+                cls._dirty = True
+            cls.literals[literal] = count + 1
+
+    @classmethod
+    def remove_literal(cls, *literals: str) -> None:
+        """减少字面量的引用计数，计数归零的字面量将从自动机中移除"""
+        for literal in literals:
+            if (count := cls.literals.get(literal, 0)) > 1:
+                cls.literals[literal] = count - 1
+            elif count:
+                del cls.literals[literal]
+                cls._dirty = True
 
+    @classmethod
+    def _build(cls) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Tuple[str, ...]] = [()]
+        for literal in cls.literals:
+            node = 0
+            for char in literal:
+                if (next_node := goto[node].get(char)) is None:
+                    next_node = goto[node][char] = len(goto)
+                    goto.append({})
+                    output.append(())
+                node = next_node
+            output[node] = (literal,)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in goto[node].items():
+                queue.append(next_node)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[next_node] = goto[state].get(char, 0)
+                output[next_node] += output[fail[next_node]]
+
+        cls._goto, cls._fail, cls._output = goto, fail, output
+        cls._cache = {}
+        cls._dirty = False
 
+    @classmethod
+    def scan(cls, text: str) -> LITERAL_RESULT:
+        """扫描消息纯文本，获取所有已注册字面量的匹配结果。
+
+        空字符串总是被视为匹配。
+
+        参数:
+            text: 消息纯文本
+        """
+        if cls._dirty:
+            cls._build()
+        if (result := cls._cache.get(text)) is not None:
+            return result
+
+        goto, fail, output = cls._goto, cls._fail, cls._output
+        length = len(text)
+        # `$` in regex also matches before the trailing newline
+        newline_end = length - 1 if text.endswith("\n") else length
+        found: Set[str] = {""}
+        prefixes: Set[str] = {""}
+        suffixes: Dict[str, int] = {"": newline_end}
+        node = 0
+        for index, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for literal in output[node]:
+                found.add(literal)
+                start = index - len(literal)
+                if start == 0:
+                    prefixes.add(literal)
+                if index == length or index == newline_end:
+                    suffixes[literal] = min(suffixes.get(literal, length), start)
+
+        result = LITERAL_RESULT(frozenset(found), frozenset(prefixes), suffixes)
+        if len(cls._cache) >= cls.cache_size:
+            del cls._cache[next(iter(cls._cache))]
+        cls._cache[text] = result
+        return result
+
+
+@checker_cost(0)
 class StartswithRule:
     """检查消息纯文本是否以指定字符串开头。
 
@@ -147,11 +508,19 @@ class StartswithRule:
         ignorecase: 是否忽略大小写
     """
 
-    __slots__ = ("msg", "ignorecase")
+    __slots__ = ("msg", "ignorecase", "pattern", "__weakref__")
 
     def __init__(self, msg: Tuple[str, ...], ignorecase: bool = False):
         self.msg = msg
         self.ignorecase = ignorecase
+        self.pattern: Optional[Pattern[str]] = None
+        if ignorecase:
+            self.pattern = re.compile(
+                f"^(?:{'|'.join(re.escape(prefix) for prefix in msg)})",
+                re.IGNORECASE,
+            )
+        else:
+            LiteralRule.register(self, *msg)
 
     def __repr__(self) -> str:
         return f"Startswith(msg={self.msg}, ignorecase={self.ignorecase})"
@@ -168,15 +537,16 @@ class StartswithRule:
 
     async def __call__(self, event: Event, state: T_State) -> bool:
         try:
-            text = event.get_plaintext()
+            text = event.get_cached_plaintext()
         except Exception:
             return False
-        if match := re.match(
-            f"^(?:{'|'.join(re.escape(prefix) for prefix in self.msg)})",
-            text,
-            re.IGNORECASE if self.ignorecase else 0,
-        ):
-            state[STARTSWITH_KEY] = match.group()
+        if self.pattern is not None:
+            matched = (match := self.pattern.match(text)) and match.group()
+        else:
+            prefixes = LiteralRule.scan(text).prefixes
+            matched = next((prefix for prefix in self.msg if prefix in prefixes), None)
+        if matched is not None:
+            state[STARTSWITH_KEY] = matched
             return True
         return False
 
@@ -194,6 +564,7 @@ def startswith(msg: Union[str, Tuple[str, ...]], ignorecase: bool = False) -> Ru
     return Rule(StartswithRule(msg, ignorecase))
 
 
+@checker_cost(0)
 class EndswithRule:
     """检查消息纯文本是否以指定字符串结尾。
 
@@ -202,11 +573,19 @@ class EndswithRule:
         ignorecase: 是否忽略大小写
     """
 
-    __slots__ = ("msg", "ignorecase")
+    __slots__ = ("msg", "ignorecase", "pattern", "__weakref__")
 
     def __init__(self, msg: Tuple[str, ...], ignorecase: bool = False):
         self.msg = msg
         self.ignorecase = ignorecase
+        self.pattern: Optional[Pattern[str]] = None
+        if ignorecase:
+            self.pattern = re.compile(
+                f"(?:{'|'.join(re.escape(suffix) for suffix in msg)})$",
+                re.IGNORECASE,
+            )
+        else:
+            LiteralRule.register(self, *msg)
 
     def __repr__(self) -> str:
         return f"Endswith(msg={self.msg}, ignorecase={self.ignorecase})"
@@ -223,15 +602,21 @@ class EndswithRule:
 
     async def __call__(self, event: Event, state: T_State) -> bool:
         try:
-            text = event.get_plaintext()
+            text = event.get_cached_plaintext()
         except Exception:
             return False
-        if match := re.search(
-            f"(?:{'|'.join(re.escape(suffix) for suffix in self.msg)})$",
-            text,
-            re.IGNORECASE if self.ignorecase else 0,
-        ):
-            state[ENDSWITH_KEY] = match.group()
+        if self.pattern is not None:
+            matched = (match := self.pattern.search(text)) and match.group()
+        else:
+            # leftmost match wins, then the first suffix in order
+            suffixes = LiteralRule.scan(text).suffixes
+            matched = min(
+                (suffix for suffix in self.msg if suffix in suffixes),
+                key=suffixes.__getitem__,
+                default=None,
+            )
+        if matched is not None:
+            state[ENDSWITH_KEY] = matched
             return True
         return False
 
@@ -249,6 +634,7 @@ def endswith(msg: Union[str, Tuple[str, ...]], ignorecase: bool = False) -> Rule
     return Rule(EndswithRule(msg, ignorecase))
 
 
+@checker_cost(0)
 class FullmatchRule:
     """检查消息纯文本是否与指定字符串全匹配。
 
@@ -257,11 +643,12 @@ class FullmatchRule:
         ignorecase: 是否忽略大小写
     """
 
-    __slots__ = ("msg", "ignorecase")
+    __slots__ = ("msg", "ignorecase", "literals")
 
     def __init__(self, msg: Tuple[str, ...], ignorecase: bool = False):
         self.msg = tuple(map(str.casefold, msg) if ignorecase else msg)
         self.ignorecase = ignorecase
+        self.literals = frozenset(self.msg)
 
     def __repr__(self) -> str:
         return f"Fullmatch(msg={self.msg}, ignorecase={self.ignorecase})"
@@ -278,13 +665,13 @@ class FullmatchRule:
 
     async def __call__(self, event: Event, state: T_State) -> bool:
         try:
-            text = event.get_plaintext()
+            text = event.get_cached_plaintext()
         except Exception:
             return False
         if not text:
             return False
         text = text.casefold() if self.ignorecase else text
-        if text in self.msg:
+        if text in self.literals:
             state[FULLMATCH_KEY] = text
             return True
         return False
@@ -303,6 +690,7 @@ def fullmatch(msg: Union[str, Tuple[str, ...]], ignorecase: bool = False) -> Rul
     return Rule(FullmatchRule(msg, ignorecase))
 
 
+@checker_cost(0)
 class KeywordsRule:
     """检查消息纯文本是否包含指定关键字。
 
@@ -310,10 +698,11 @@ class KeywordsRule:
         keywords: 指定关键字元组
     """
 
-    __slots__ = ("keywords",)
+    __slots__ = ("keywords", "__weakref__")
 
     def __init__(self, *keywords: str):
         self.keywords = keywords
+        LiteralRule.register(self, *keywords)
 
     def __repr__(self) -> str:
         return f"Keywords(keywords={self.keywords})"
@@ -328,12 +717,13 @@ class KeywordsRule:
 
     async def __call__(self, event: Event, state: T_State) -> bool:
         try:
-            text = event.get_plaintext()
+            text = event.get_cached_plaintext()
         except Exception:
             return False
         if not text:
             return False
-        if key := next((k for k in self.keywords if k in text), None):
+        found = LiteralRule.scan(text).found
+        if key := next((k for k in self.keywords if k in found), None):
             state[KEYWORD_KEY] = key
             return True
         return False
@@ -349,6 +739,7 @@ def keyword(*keywords: str) -> Rule:
     return Rule(KeywordsRule(*keywords))
 
 
+@checker_cost(0)
 class CommandRule:
     """检查消息是否为指定命令。
 
@@ -523,6 +914,7 @@ class ArgumentParser(ArgParser):
         raise ParserExit(status=status, message=parser_message.get(None))
 
 
+@checker_cost(0)
 class ShellCommandRule:
     """检查消息是否为指定 shell 命令。
 
@@ -648,6 +1040,45 @@ def shell_command(
     return Rule(ShellCommandRule(commands, parser))
 
 
+def _required_literals(pattern: Sequence[Tuple[Any, Any]]) -> List[str]:
+    """提取正则表达式任意匹配结果中必定出现的字面量片段"""
+    literals: List[str] = []
+    run: List[str] = []
+    for op, av in pattern:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            literals.append("".join(run))
+            run.clear()
+        if op is sre_parse.SUBPATTERN:
+            _, add_flags, _, sub = av
+            if not add_flags & re.IGNORECASE:
+                literals.extend(_required_literals(sub))
+        elif op in _REPEAT_OPCODES and av[0] >= 1:
+            literals.extend(_required_literals(av[2]))
+        elif op is _ATOMIC_GROUP:
+            literals.extend(_required_literals(av))
+    if run:
+        literals.append("".join(run))
+    return literals
+
+
+def _required_literal(pattern: Pattern[str]) -> Optional[str]:
+    """选出正则表达式中最长的必需字面量，用作匹配前的预筛选。
+
+    忽略大小写时字面量无法直接比较，返回 `None`。
+    """
+    if pattern.flags & re.IGNORECASE:
+        return None
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:  # pragma: no cover
+        return None
+    return max(_required_literals(parsed), key=len, default=None)
+
+
+@checker_cost(0)
 class RegexRule:
     """检查消息字符串是否符合指定正则表达式。
 
@@ -656,11 +1087,15 @@ class RegexRule:
         flags: 正则表达式标记
     """
 
-    __slots__ = ("regex", "flags")
+    __slots__ = ("regex", "flags", "pattern", "literal", "__weakref__")
 
     def __init__(self, regex: str, flags: int = 0):
         self.regex = regex
         self.flags = flags
+        self.pattern = re.compile(regex, flags)
+        self.literal = _required_literal(self.pattern)
+        if self.literal:
+            LiteralRule.register(self, self.literal)
 
     def __repr__(self) -> str:
         return f"Regex(regex={self.regex!r}, flags={self.flags})"
@@ -677,10 +1112,12 @@ class RegexRule:
 
     async def __call__(self, event: Event, state: T_State) -> bool:
         try:
-            msg = event.get_message()
+            msg = event.get_cached_message_str()
         except Exception:
             return False
-        if matched := re.search(self.regex, str(msg), self.flags):
+        if self.literal and self.literal not in msg:
+            return False
+        if matched := self.pattern.search(msg):
             state[REGEX_MATCHED] = matched
             return True
         else:
@@ -711,6 +1148,7 @@ def regex(regex: str, flags: Union[int, re.RegexFlag] = 0) -> Rule:
     return Rule(RegexRule(regex, flags))
 
 
+@checker_cost(0)
 class ToMeRule:
     """检查事件是否与机器人有关。"""
 
@@ -735,6 +1173,7 @@ def to_me() -> Rule:
     return Rule(ToMeRule())
 
 
+@checker_cost(0)
 class IsTypeRule:
     """检查事件类型是否为指定类型。"""
 
@@ -770,6 +1209,7 @@ __autodoc__ = {
     "Rule": True,
     "Rule.__call__": True,
     "TrieRule": False,
+    "LiteralRule": False,
     "ArgumentParser.exit": False,
     "ArgumentParser.parse_args": False,
 }
@@ -20,7 +20,7 @@ from typing import TYPE_CHECKING, TypeVar
 from typing_extensions import ParamSpec, TypeAlias, get_args, override, get_origin
 
 if TYPE_CHECKING:
-    from asyncio import Task
+    from asyncio import Future
 
     from nonebot.adapters import Bot
     from nonebot.permission import Permission
@@ -106,7 +106,11 @@ else:  # pragma: py-gte-39
 
 # state
 T_State: TypeAlias = t.Dict[t.Any, t.Any]
-"""事件处理状态 State 类型"""
+"""事件处理状态 State 类型
+
+规则与权限检查时传入的是 {ref}`nonebot.utils.LayeredState`，
+它是 `dict` 的子类，写入仅对当前事件响应器可见。
+"""
 
 _DependentCallable: TypeAlias = t.Union[
     t.Callable[..., T], t.Callable[..., t.Awaitable[T]]
@@ -244,5 +248,5 @@ T_PermissionUpdater: TypeAlias = _DependentCallable["Permission"]
 - MatcherParam: Matcher 对象
 - DefaultParam: 带有默认值的参数
 """
-T_DependencyCache: TypeAlias = t.Dict[_DependentCallable[t.Any], "Task[t.Any]"]
+T_DependencyCache: TypeAlias = t.Dict[_DependentCallable[t.Any], "Future[t.Any]"]
 """依赖缓存, 用于存储依赖函数的返回值"""
@@ -13,23 +13,32 @@ import importlib
 import dataclasses
 from pathlib import Path
 from collections import deque
-from contextvars import copy_context
+from time import perf_counter
 from functools import wraps, partial
 from contextlib import asynccontextmanager
-from typing_extensions import ParamSpec, get_args, override, get_origin
+from contextvars import ContextVar, copy_context
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing_extensions import ParamSpec, TypeAlias, get_args, override, get_origin
 from typing import (
     Any,
     Dict,
+    List,
     Type,
     Tuple,
     Union,
     Generic,
+    Literal,
     Mapping,
     TypeVar,
     Callable,
+    Iterator,
+    KeysView,
     Optional,
     Sequence,
     Coroutine,
+    ItemsView,
+    NamedTuple,
+    ValuesView,
     AsyncGenerator,
     ContextManager,
     overload,
@@ -50,6 +59,16 @@ R = TypeVar("R")
 T = TypeVar("T")
 K = TypeVar("K")
 V = TypeVar("V")
+C = TypeVar("C")
+
+SyncPolicy: TypeAlias = Literal["default", "inline", "thread", "process"]
+"""同步函数的执行方式。
+
+- `default`: 在事件循环的默认线程池中执行
+- `inline`: 在事件循环中直接执行，仅适用于耗时极短且无阻塞的函数
+- `thread`: 在独立的有界线程池中执行
+- `process`: 在进程池中执行，适用于 CPU 密集型函数，函数及参数需要可被 pickle
+"""
 
 
 def escape_tag(s: str) -> str:
@@ -180,24 +199,214 @@ def is_async_gen_callable(call: Callable[..., Any]) -> bool:
     return inspect.isasyncgenfunction(func_)
 
 
+class ExecutorStats(NamedTuple):
+    """同步函数执行器的运行状态"""
+
+    pending: int
+    """已提交且未完成的调用数"""
+    max_workers: Optional[int]
+    """最大工作线程/进程数，`None` 表示未知"""
+
+    @property
+    def queue_depth(self) -> int:
+        """等待空闲工作线程/进程的调用数"""
+        if self.max_workers is None:
+            return 0
+        return max(self.pending - self.max_workers, 0)
+
+
+class _SyncExecutor:
+    __slots__ = ("factory", "max_workers", "executor", "pending")
+
+    def __init__(self, factory: Optional[Callable[[Optional[int]], Executor]]) -> None:
+        self.factory = factory
+        self.max_workers: Optional[int] = None
+        self.executor: Optional[Executor] = None
+        self.pending = 0
+
+    def stats(self) -> ExecutorStats:
+        executor = self.executor
+        max_workers = getattr(executor, "_max_workers", None) or self.max_workers
+        return ExecutorStats(self.pending, max_workers)
+
+    async def run(self, func: Callable[[], R]) -> R:
+        if self.executor is None and self.factory is not None:
+            self.executor = self.factory(self.max_workers)
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        try:
+            return await loop.run_in_executor(self.executor, func)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+
+_SYNC_POLICY_ATTR = "__sync_policy__"
+
+_executor_wait: ContextVar[Optional[List[float]]] = ContextVar(
+    "_executor_wait", default=None
+)
+"""设置后，线程池中的同步函数等待空闲线程的时长 (秒) 将累加至其中"""
+
+
+def _record_wait(wait: List[float], submitted: float, func: Callable[[], R]) -> R:
+    wait[0] += perf_counter() - submitted
+    return func()
+
+
+_sync_executors: Dict[SyncPolicy, _SyncExecutor] = {
+    "default": _SyncExecutor(None),
+    "thread": _SyncExecutor(ThreadPoolExecutor),
+    "process": _SyncExecutor(ProcessPoolExecutor),
+}
+_sync_policy_overrides: Dict[str, SyncPolicy] = {}
+_sync_policy_version: int = 0
+
+
+def sync_policy(policy: SyncPolicy) -> Callable[[C], C]:
+    """声明同步函数的执行方式，参考 {ref}`nonebot.utils.SyncPolicy`。
+
+    也可以通过配置项 `sync_policies` 为指定函数设置执行方式，配置项优先于装饰器。
+
+    参数:
+        policy: 执行方式
+
+    用法:
+        ```python
+        @sync_policy("inline")
+        def is_group(event: Event) -> bool:
+            return event.get_session_id().startswith("group")
+        ```
+    """
+
+    def decorator(call: C) -> C:
+        global _sync_policy_version
+
+        setattr(call, _SYNC_POLICY_ATTR, policy)
+        _sync_policy_version += 1
+        return call
+
+    return decorator
+
+
+def _callable_name(call: Callable[..., Any]) -> str:
+    if not (inspect.isroutine(call) or inspect.isclass(call)):
+        call = type(call)
+    return f"{call.__module__}:{call.__qualname__}"
+
+
+def get_sync_policy(call: Callable[..., Any]) -> SyncPolicy:
+    """获取同步函数的执行方式"""
+    if _sync_policy_overrides and (
+        policy := _sync_policy_overrides.get(_callable_name(call))
+    ):
+        return policy
+    return getattr(call, _SYNC_POLICY_ATTR, "default")
+
+
+class CachedSyncPolicy:
+    """缓存的同步函数执行方式，仅在执行方式配置变化后重新获取。
+
+    参数:
+        call: 同步函数
+    """
+
+    __slots__ = ("call", "_policy", "_version")
+
+    def __init__(self, call: Callable[..., Any]) -> None:
+        self.call = call
+        self._policy: SyncPolicy = "default"
+        self._version = -1
+
+    def __repr__(self) -> str:
+        return f"CachedSyncPolicy(call={self.call!r}, policy={self.get()!r})"
+
+    def get(self) -> SyncPolicy:
+        """获取执行方式"""
+        if self._version != _sync_policy_version:
+            self._policy = get_sync_policy(self.call)
+            self._version = _sync_policy_version
+        return self._policy
+
+
+def configure_sync_executors(
+    policies: Optional[Mapping[str, SyncPolicy]] = None,
+    thread_workers: Optional[int] = None,
+    process_workers: Optional[int] = None,
+) -> None:
+    """配置同步函数的执行方式与执行器。
+
+    已创建的执行器将被关闭，并在下次使用时按照新的配置重新创建。
+
+    参数:
+        policies: 函数名 (`module:qualname`) 到执行方式的映射
+        thread_workers: 独立线程池的最大线程数
+        process_workers: 进程池的最大进程数
+    """
+    global _sync_policy_version
+
+    _sync_policy_overrides.clear()
+    _sync_policy_overrides.update(policies or {})
+    _sync_policy_version += 1
+    for policy, workers in (("thread", thread_workers), ("process", process_workers)):
+        executor = _sync_executors[policy]
+        executor.shutdown()
+        executor.max_workers = workers
+
+
+def shutdown_sync_executors() -> None:
+    """关闭独立线程池与进程池"""
+    for executor in _sync_executors.values():
+        executor.shutdown()
+
+
+def get_executor_stats() -> Dict[SyncPolicy, ExecutorStats]:
+    """获取各执行器的运行状态，可用于监控执行器队列深度"""
+    return {policy: executor.stats() for policy, executor in _sync_executors.items()}
+
+
 def run_sync(call: Callable[P, R]) -> Callable[P, Coroutine[None, None, R]]:
     """一个用于包装 sync function 为 async function 的装饰器
 
+    执行方式参考 {ref}`nonebot.utils.sync_policy`。
+
     参数:
         call: 被装饰的同步函数
     """
 
     @wraps(call)
     async def _wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-        loop = asyncio.get_running_loop()
-        pfunc = partial(call, *args, **kwargs)
-        context = copy_context()
-        result = await loop.run_in_executor(None, partial(context.run, pfunc))
-        return result
+        return await run_sync_with_policy(get_sync_policy(call), call, *args, **kwargs)
 
     return _wrapper
 
 
+async def run_sync_with_policy(
+    policy: SyncPolicy, call: Callable[P, R], *args: P.args, **kwargs: P.kwargs
+) -> R:
+    """以指定的执行方式运行同步函数
+
+    参数:
+        policy: 执行方式
+        call: 同步函数
+    """
+    if policy == "inline":
+        return call(*args, **kwargs)
+    pfunc = partial(call, *args, **kwargs)
+    # context can not be transferred to other processes
+    if policy == "process":
+        return await _sync_executors[policy].run(pfunc)
+    context = copy_context()
+    func = partial(context.run, pfunc)
+    if (wait := _executor_wait.get()) is not None:
+        func = partial(_record_wait, wait, perf_counter(), func)
+    return await _sync_executors[policy].run(func)
+
+
 @asynccontextmanager
 async def run_sync_ctx_manager(
     cm: ContextManager[T],
@@ -293,6 +502,140 @@ class classproperty(Generic[T]):
         return self.func(type(instance) if owner is None else owner)
 
 
+class LayeredState(Dict[Any, Any]):
+    """写时复制的会话状态。
+
+    自身仅保存本层写入的值，读取时依次查找本层与上层状态，
+    使多个事件响应器可以共享同一事件状态而无需预先复制，
+    且写入不会影响上层状态与其他事件响应器。
+    删除上层存在的键时将合并所有层为本层，以保持与 `dict` 副本一致的行为。
+
+    作为 `dict` 的子类，迭代、比较、`dict(state)` 与 `json.dumps`
+    等操作均能得到合并后的状态。
+
+    参数:
+        parent: 上层状态
+        data: 本层初始状态
+    """
+
+    __slots__ = ("_parent",)
+
+    def __init__(
+        self, parent: Dict[Any, Any], data: Optional[Dict[Any, Any]] = None
+    ) -> None:
+        super().__init__(data or {})
+        self._parent = parent
+
+    def _merged(self) -> Dict[Any, Any]:
+        merged = dict(self._parent)
+        merged.update(dict.items(self))
+        return merged
+
+    def _detach(self) -> None:
+        merged = self._merged()
+        dict.clear(self)
+        dict.update(self, merged)
+        self._parent = {}
+
+    def merge_into(self, target: Dict[Any, Any]) -> None:
+        """按照层级顺序将状态合并入 `target`"""
+        target.update(self._parent)
+        target.update(dict.items(self))
+
+    def __missing__(self, key: Any) -> Any:
+        return self._parent[key]
+
+    @override
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or key in self._parent
+
+    @override
+    def get(self, key: Any, default: Any = None) -> Any:
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        return self._parent.get(key, default)
+
+    @override
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._merged())
+
+    @override
+    def __reversed__(self) -> Iterator[Any]:
+        return reversed(list(self._merged()))
+
+    @override
+    def __len__(self) -> int:
+        parent = self._parent
+        return len(parent) + sum(key not in parent for key in dict.keys(self))
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        return self._merged() == other
+
+    @override
+    def __ne__(self, other: object) -> bool:
+        return self._merged() != other
+
+    @override
+    def __repr__(self) -> str:
+        return repr(self._merged())
+
+    @override
+    def keys(self) -> KeysView[Any]:
+        return self._merged().keys()
+
+    @override
+    def values(self) -> ValuesView[Any]:
+        return self._merged().values()
+
+    @override
+    def items(self) -> ItemsView[Any, Any]:
+        return self._merged().items()
+
+    @override
+    def copy(self) -> Dict[Any, Any]:
+        return self._merged()
+
+    def __or__(self, other: Any) -> Dict[Any, Any]:
+        merged = self._merged()
+        merged.update(other)
+        return merged
+
+    def __ror__(self, other: Any) -> Dict[Any, Any]:
+        merged = dict(other)
+        merged.update(self._merged())
+        return merged
+
+    @override
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    @override
+    def __delitem__(self, key: Any) -> None:
+        if not dict.__contains__(self, key) and key in self._parent:
+            self._detach()
+        super().__delitem__(key)
+
+    @override
+    def pop(self, key: Any, *args: Any) -> Any:
+        if not dict.__contains__(self, key) and key in self._parent:
+            self._detach()
+        return super().pop(key, *args)
+
+    @override
+    def popitem(self) -> Tuple[Any, Any]:
+        self._detach()
+        return super().popitem()
+
+    @override
+    def clear(self) -> None:
+        super().clear()
+        self._parent = {}
+
+
 class DataclassEncoder(json.JSONEncoder):
     """可以序列化 {ref}`nonebot.adapters.Message`(List[Dataclass]) 的 `JSONEncoder`"""
 
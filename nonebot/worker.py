@@ -0,0 +1,430 @@
+"""本模块实现了多进程事件分发。
+
+驱动器进程保持协议适配器连接，将事件按照会话 ID 分片转发至多个工作进程处理，
+同一会话的事件 (包括等待用户回复的临时事件响应器) 始终由同一个工作进程处理。
+工作进程中的 API 调用将被转发回驱动器进程执行。
+
+事件、Bot 类与 API 调用参数及结果需要能够被 `pickle` 序列化。
+
+工作进程以 `spawn` 方式启动，会重新导入入口文件。入口文件中注册协议适配器与
+{ref}`nonebot.run` 的代码需要放在 `if __name__ == "__main__":` 中，
+避免工作进程建立协议适配器连接。
+
+FrontMatter:
+    sidebar_position: 17
+    description: nonebot.worker 模块
+"""
+
+import zlib
+import pickle
+import asyncio
+import itertools
+import threading
+import multiprocessing
+from typing_extensions import override
+from multiprocessing.connection import Connection
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Set,
+    Dict,
+    List,
+    Type,
+    Tuple,
+    Callable,
+    Iterable,
+    Optional,
+    Awaitable,
+)
+
+import nonebot
+from nonebot.log import logger
+from nonebot.adapters import Adapter
+from nonebot.utils import resolve_dot_notation
+from nonebot.message import (
+    handle_event,
+    handle_events,
+    get_event_scheduler,
+    set_event_forwarder,
+)
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+
+    from nonebot.drivers import Driver
+    from nonebot.adapters import Bot, Event
+
+_BotKey = Tuple[str, str]
+
+
+def _start_reader(
+    conn: Connection, callback: Callable[[Optional[Tuple[Any, ...]]], None]
+) -> threading.Thread:
+    """在独立线程中读取连接消息，并在事件循环中调用回调函数，连接关闭时传入 `None`"""
+    loop = asyncio.get_running_loop()
+
+    def read() -> None:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            loop.call_soon_threadsafe(callback, message)
+        try:
+            loop.call_soon_threadsafe(callback, None)
+        except RuntimeError:
+            # event loop is already closed
+            pass
+
+    thread = threading.Thread(target=read, daemon=True)
+    thread.start()
+    return thread
+
+
+def _resolve(future: "asyncio.Future[Any]", ok: bool, value: Any) -> None:
+    if future.done():
+        return
+    if ok:
+        future.set_result(value)
+    else:
+        future.set_exception(value)
+
+
+def _bot_state(bot: "Bot") -> Dict[str, Any]:
+    """提取 Bot 对象中可序列化的属性，用于在工作进程中重建 Bot 对象"""
+    state: Dict[str, Any] = {}
+    for key, value in vars(bot).items():
+        if key == "adapter":
+            continue
+        try:
+            pickle.dumps(value)
+        except Exception:
+            continue
+        state[key] = value
+    return state
+
+
+class _Worker:
+    __slots__ = ("process", "conn", "reader", "ready", "pending", "bots")
+
+    def __init__(
+        self,
+        process: "BaseProcess",
+        conn: Connection,
+        ready: "asyncio.Future[None]",
+    ) -> None:
+        self.process = process
+        self.conn = conn
+        self.reader: Optional[threading.Thread] = None
+        self.ready = ready
+        self.pending: Dict[int, "asyncio.Future[None]"] = {}
+        self.bots: Dict[_BotKey, Type["Bot"]] = {}
+
+
+class WorkerPool:
+    """多进程事件分发工作池。
+
+    初始化完成后意外退出的工作进程将被重新启动，
+    正在其中处理的事件以异常结束，Bot 对象在下次转发事件时重新注册。
+
+    参数:
+        workers: 工作进程数量
+        initializer: 工作进程初始化函数，格式为 `module:function`，
+            通常在其中调用 {ref}`nonebot.init` 并加载插件。
+            默认仅调用 {ref}`nonebot.init`
+    """
+
+    def __init__(self, workers: int, initializer: Optional[str] = None) -> None:
+        if workers < 1:
+            raise ValueError("workers must be a positive integer")
+        self.size = workers
+        self.initializer = initializer
+        self._workers: List[_Worker] = []
+        self._bots: Dict[_BotKey, "Bot"] = {}
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._ids = itertools.count()
+        self._running = False
+
+    def __repr__(self) -> str:
+        return f"WorkerPool(workers={self.size}, initializer={self.initializer!r})"
+
+    def install(self, driver: "Driver") -> None:
+        """将工作池设置为事件转发器，并跟随驱动器启动与关闭。
+
+        经由 {ref}`nonebot.message.handle_event`、{ref}`nonebot.message.handle_events`
+        以及全局事件调度器与微批处理器处理的事件都将被转发至工作池。
+
+        参数:
+            driver: 驱动器对象
+        """
+        driver.on_startup(self.start)
+        driver.on_shutdown(self.stop)
+        set_event_forwarder(self)
+
+    async def start(self) -> None:
+        """启动所有工作进程并等待初始化完成"""
+        self._running = True
+        self._workers = [self._spawn(index) for index in range(self.size)]
+        await asyncio.gather(*(worker.ready for worker in self._workers))
+        logger.info(f"Started {self.size} dispatch workers")
+
+    def _spawn(self, index: int) -> _Worker:
+        context = multiprocessing.get_context("spawn")
+        conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=_worker_main,
+            args=(child_conn, self.initializer),
+            name=f"nonebot-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+
+        worker = _Worker(process, conn, asyncio.get_running_loop().create_future())
+        worker.reader = _start_reader(
+            conn, lambda message, worker=worker: self._on_message(worker, message)
+        )
+        return worker
+
+    async def stop(self) -> None:
+        """等待已转发的事件处理完成后关闭所有工作进程"""
+        self._running = False
+        loop = asyncio.get_running_loop()
+        for worker in self._workers:
+            if worker.pending:
+                await asyncio.gather(*worker.pending.values(), return_exceptions=True)
+            try:
+                worker.conn.send(("stop",))
+            except OSError:
+                pass
+        for worker in self._workers:
+            await loop.run_in_executor(None, worker.process.join)
+            worker.conn.close()
+        self._workers.clear()
+        self._bots.clear()
+
+    def shard(self, bot: "Bot", event: "Event") -> int:
+        """获取事件所属的工作进程序号。
+
+        事件按照会话 ID 分片，没有会话 ID 的事件按照机器人 ID 分片。
+
+        参数:
+            bot: Bot 对象
+            event: Event 对象
+        """
+        try:
+            key = event.get_session_id()
+        except Exception:
+            key = bot.self_id
+        return zlib.crc32(key.encode()) % self.size
+
+    async def handle_event(self, bot: "Bot", event: "Event") -> None:
+        """将事件转发至工作进程处理，并等待处理完成。
+
+        参数:
+            bot: Bot 对象
+            event: Event 对象
+        """
+        if not self._workers:
+            raise RuntimeError("WorkerPool is not started")
+        await self._send(self._workers[self.shard(bot, event)], bot, "event", event)
+
+    async def handle_events(self, bot: "Bot", events: Iterable["Event"]) -> None:
+        """将一批事件转发至工作进程处理，并等待处理完成。
+
+        事件按照分片分组，每个工作进程一次接收其负责的全部事件。
+
+        参数:
+            bot: Bot 对象
+            events: Event 对象序列
+        """
+        if not self._workers:
+            raise RuntimeError("WorkerPool is not started")
+
+        shards: Dict[int, List["Event"]] = {}
+        for event in events:
+            shards.setdefault(self.shard(bot, event), []).append(event)
+        await asyncio.gather(
+            *(
+                self._send(self._workers[index], bot, "events", batch)
+                for index, batch in shards.items()
+            )
+        )
+
+    async def _send(self, worker: _Worker, bot: "Bot", kind: str, payload: Any) -> None:
+        key = (bot.type, bot.self_id)
+        self._bots[key] = bot
+
+        bot_info = None
+        if worker.bots.get(key) is not type(bot):
+            bot_info = (type(bot), _bot_state(bot))
+
+        # a respawned worker receives events after its initialization
+        if not worker.ready.done():
+            await worker.ready
+
+        event_id = next(self._ids)
+        future = worker.pending[event_id] = asyncio.get_running_loop().create_future()
+        try:
+            worker.conn.send((kind, event_id, key, bot_info, payload))
+            worker.bots[key] = type(bot)
+            await future
+        finally:
+            worker.pending.pop(event_id, None)
+
+    def _on_message(self, worker: _Worker, message: Optional[Tuple[Any, ...]]) -> None:
+        if message is None:
+            error = RuntimeError(f"Worker {worker.process.name} exited")
+            initialized = worker.ready.done() and not worker.ready.exception()
+            _resolve(worker.ready, False, error)
+            for future in worker.pending.values():
+                _resolve(future, False, error)
+            # workers failing during initialization are not restarted endlessly
+            if self._running and initialized and worker in self._workers:
+                index = self._workers.index(worker)
+                logger.warning(
+                    f"Worker {worker.process.name} exited unexpectedly, restarting"
+                )
+                worker.conn.close()
+                self._workers[index] = self._spawn(index)
+        elif message[0] == "ready":
+            _resolve(worker.ready, True, None)
+        elif message[0] == "done":
+            if (future := worker.pending.get(message[1])) is not None:
+                _resolve(future, True, None)
+        elif message[0] == "call":
+            task = asyncio.create_task(self._call_api(worker, *message[1:]))
+            task.add_done_callback(self._tasks.discard)
+            self._tasks.add(task)
+
+    async def _call_api(
+        self, worker: _Worker, call_id: int, key: _BotKey, api: str, data: Any
+    ) -> None:
+        try:
+            bot = self._bots[key]
+            # api hooks have already run in the worker process
+            result = await bot.adapter._call_api(bot, api, **data)
+        except Exception as e:
+            ok, value = False, e
+        else:
+            ok, value = True, result
+
+        try:
+            worker.conn.send(("result", call_id, ok, value))
+        except Exception as e:
+            # the result or the exception can not be pickled
+            worker.conn.send(("result", call_id, False, RuntimeError(repr(e))))
+
+
+class _ProxyAdapter(Adapter):
+    """工作进程中的代理协议适配器，将 API 调用转发至驱动器进程"""
+
+    _runtime: "_WorkerRuntime"
+
+    @classmethod
+    @override
+    def get_name(cls) -> str:
+        raise NotImplementedError
+
+    @override
+    async def _call_api(self, bot: "Bot", api: str, **data: Any) -> Any:
+        return await self._runtime.call_api((self.get_name(), bot.self_id), api, data)
+
+
+class _WorkerRuntime:
+    def __init__(self, conn: Connection) -> None:
+        self.conn = conn
+        self.driver = nonebot.get_driver()
+        self.adapters: Dict[str, _ProxyAdapter] = {}
+        self.bots: Dict[_BotKey, "Bot"] = {}
+        self.calls: Dict[int, "asyncio.Future[Any]"] = {}
+        self.tasks: Set["asyncio.Task[None]"] = set()
+        self.closed = asyncio.Event()
+        self._ids = itertools.count()
+
+    def get_adapter(self, name: str) -> _ProxyAdapter:
+        if (adapter := self.adapters.get(name)) is None:
+            cls = type(
+                f"ProxyAdapter[{name}]",
+                (_ProxyAdapter,),
+                {"get_name": classmethod(lambda cls: name), "_runtime": self},
+            )
+            adapter = self.adapters[name] = cls(self.driver)
+        return adapter
+
+    def register_bot(
+        self, key: _BotKey, bot_info: Tuple[Type["Bot"], Dict[str, Any]]
+    ) -> None:
+        cls, state = bot_info
+        bot = object.__new__(cls)
+        vars(bot).update(state)
+        bot.adapter = adapter = self.get_adapter(key[0])
+        adapter.bots[key[1]] = bot
+        self.bots[key] = bot
+        # make `nonebot.get_bot` work in handlers
+        self.driver._bots[key[1]] = bot
+
+    async def call_api(self, key: _BotKey, api: str, data: Dict[str, Any]) -> Any:
+        call_id = next(self._ids)
+        future = self.calls[call_id] = asyncio.get_running_loop().create_future()
+        try:
+            self.conn.send(("call", call_id, key, api, data))
+            return await future
+        finally:
+            self.calls.pop(call_id, None)
+
+    async def handle(self, event_id: int, handler: Awaitable[None]) -> None:
+        try:
+            await handler
+        except Exception as e:
+            logger.opt(colors=True, exception=e).error(
+                "<r><bg #f8bbd0>Error when handling event.</bg #f8bbd0></r>"
+            )
+        finally:
+            self.conn.send(("done", event_id))
+
+    def on_message(self, message: Optional[Tuple[Any, ...]]) -> None:
+        if message is None or message[0] == "stop":
+            self.closed.set()
+        elif message[0] in ("event", "events"):
+            kind, event_id, key, bot_info, payload = message
+            if bot_info is not None:
+                self.register_bot(key, bot_info)
+            handler = handle_event if kind == "event" else handle_events
+            task = asyncio.create_task(
+                self.handle(event_id, handler(self.bots[key], payload))
+            )
+            task.add_done_callback(self.tasks.discard)
+            self.tasks.add(task)
+        elif message[0] == "result":
+            _, call_id, ok, value = message
+            if (future := self.calls.get(call_id)) is not None:
+                _resolve(future, ok, value)
+
+    async def serve(self) -> None:
+        await self.driver._lifespan.startup()
+        _start_reader(self.conn, self.on_message)
+        self.conn.send(("ready",))
+        try:
+            await self.closed.wait()
+            if self.tasks:
+                await asyncio.gather(*self.tasks, return_exceptions=True)
+        finally:
+            await self.driver._lifespan.shutdown()
+            self.conn.close()
+
+
+def _worker_main(conn: Connection, initializer: Optional[str]) -> None:
+    if initializer is None:
+        nonebot.init()
+    else:
+        resolve_dot_notation(initializer, "init")()
+    asyncio.run(_serve(conn))
+
+
+async def _serve(conn: Connection) -> None:
+    # events are admitted by the main process scheduler, only keep plugin limits
+    scheduler = get_event_scheduler()
+    scheduler.configure(plugin_concurrency=scheduler.plugin_concurrency)
+    # asyncio primitives must be created in the running event loop
+    await _WorkerRuntime(conn).serve()
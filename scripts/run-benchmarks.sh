@@ -0,0 +1,10 @@
+#! /usr/bin/env bash
+
+# cd to the root of the tests
+cd "$(dirname "$0")/../tests"
+
+# Run the dispatch benchmarks
+python bench_dispatch.py "$@"
+
+# Run the message memory benchmarks
+python bench_message.py
@@ -0,0 +1,367 @@
+"""事件分发基准测试。
+
+使用 `utils.py` 中的 FakeAdapter 与 FakeMessage 生成合成事件流，测量不同事件响应器数量、
+规则组合、依赖深度与会话负载下的事件吞吐量、分发延迟分位数与单个在途事件的内存占用。
+
+用法:
+    python bench_dispatch.py --output before.json
+    python bench_dispatch.py --output after.json --compare before.json
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import itertools
+import subprocess
+import tracemalloc
+from pathlib import Path
+from contextlib import contextmanager
+from dataclasses import field, asdict, dataclass
+from typing import Any, Dict, List, Callable, Iterator, Optional, Sequence
+
+import nonebot
+from nonebot.params import Depends
+from nonebot.rule import Rule, TrieRule
+from nonebot.message import handle_event
+from nonebot.adapters import Bot, Event, Message
+from nonebot.internal.matcher import DEFAULT_PROVIDER_CLASS
+from nonebot.matcher import Matcher, SessionRegistry, matchers
+from utils import FakeAdapter, FakeMessage, FakeMessageSegment
+from nonebot.plugin import on_regex, on_command, on_keyword, on_message
+
+RULE_MIXES = ("command", "regex", "keyword", "depends")
+
+
+@dataclass
+class Scenario:
+    name: str
+    matchers: int = 100
+    rules: Sequence[str] = RULE_MIXES
+    depth: int = 1
+    conversation: bool = False
+    unmatched: bool = False
+    images: int = 0
+    events: int = 1000
+    in_flight: int = 100
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return {
+            "matchers": self.matchers,
+            "rules": list(self.rules),
+            "depth": self.depth,
+            "conversation": self.conversation,
+            "unmatched": self.unmatched,
+            "images": self.images,
+        }
+
+
+@dataclass
+class Result:
+    name: str
+    params: Dict[str, Any]
+    events: int
+    events_per_sec: float
+    p50_us: float
+    p99_us: float
+    memory_per_event_kb: float
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+def default_scenarios(scale: float = 1.0) -> List[Scenario]:
+    """默认测试场景，`scale` 用于按比例缩小事件数量"""
+    events = max(int(1000 * scale), 10)
+    in_flight = max(int(100 * scale), 2)
+    scenarios = [
+        Scenario(
+            f"matchers-{count}", matchers=count, events=events, in_flight=in_flight
+        )
+        for count in (10, 100, 1000, 5000)
+    ]
+    scenarios.extend(
+        Scenario(
+            f"rule-{rule}",
+            matchers=100,
+            rules=(rule,),
+            events=events,
+            in_flight=in_flight,
+        )
+        for rule in RULE_MIXES
+    )
+    scenarios.extend(
+        Scenario(f"depth-{depth}", matchers=10, depth=depth, events=events)
+        for depth in (0, 4, 16)
+    )
+    scenarios.append(
+        Scenario("conversation", matchers=100, conversation=True, events=events)
+    )
+    # non-command messages still go through the command prefix lookup
+    scenarios.append(
+        Scenario(
+            "non-command",
+            matchers=100,
+            rules=("command",),
+            unmatched=True,
+            images=10,
+            events=events,
+            in_flight=in_flight,
+        )
+    )
+    return scenarios
+
+
+class BenchAdapter(FakeAdapter):
+    async def _call_api(self, bot, api: str, **data: Any) -> Any:
+        return None
+
+
+class BenchBot(Bot):
+    async def send(self, event: Event, message: Any, **kwargs: Any) -> Any:
+        return await self.call_api("send", message=str(message), **kwargs)
+
+
+class BenchMessageEvent(Event):
+    text: str
+    session_id: str
+    images: int = 0
+
+    def get_type(self) -> str:
+        return "message"
+
+    def get_event_name(self) -> str:
+        return "message"
+
+    def get_event_description(self) -> str:
+        return self.text
+
+    def get_user_id(self) -> str:
+        return self.session_id
+
+    def get_session_id(self) -> str:
+        return self.session_id
+
+    def get_message(self) -> Message:
+        return FakeMessage(self.text) + [
+            FakeMessageSegment.image(f"https://example.com/{index}.png")
+            for index in range(self.images)
+        ]
+
+    def is_tome(self) -> bool:
+        return True
+
+
+@contextmanager
+def isolated_matchers() -> Iterator[None]:
+    provider, sessions, prefix = matchers.provider, matchers.sessions, TrieRule.prefix
+    matchers.provider = DEFAULT_PROVIDER_CLASS({})
+    matchers.sessions = SessionRegistry()
+    TrieRule.prefix = type(prefix)()
+    try:
+        yield
+    finally:
+        matchers.provider, matchers.sessions = provider, sessions
+        TrieRule.prefix = prefix
+
+
+def _dependency_chain(depth: int) -> Callable[..., Any]:
+    async def leaf() -> int:
+        return 0
+
+    call: Callable[..., Any] = leaf
+    for _ in range(depth):
+
+        async def node(value: int = Depends(call)) -> int:
+            return value + 1
+
+        call = node
+    return call
+
+
+def _setup_matchers(scenario: Scenario, gate: Optional[asyncio.Event]) -> None:
+    dependency = _dependency_chain(scenario.depth)
+
+    async def handler(value: int = Depends(dependency)) -> None:
+        if gate is not None:
+            await gate.wait()
+
+    rules = itertools.cycle(scenario.rules)
+    for index in range(scenario.matchers):
+        rule = next(rules)
+        if rule == "command":
+            on_command(f"cmd{index}", handlers=[handler])
+        elif rule == "regex":
+            on_regex(rf"^re{index}\b", handlers=[handler])
+        elif rule == "keyword":
+            on_keyword({f"kw{index}"}, handlers=[handler])
+        else:
+
+            async def checker(
+                event: BenchMessageEvent, value: int = Depends(dependency), index=index
+            ) -> bool:
+                return event.text == f"dep{index}"
+
+            on_message(Rule(checker), handlers=[handler])
+
+    if scenario.conversation:
+        ask = on_command("ask")
+
+        @ask.got("answer")
+        async def _(matcher: Matcher) -> None:
+            await matcher.finish()
+
+
+def _make_events(scenario: Scenario) -> List[BenchMessageEvent]:
+    prefixes = {"command": "/cmd", "regex": "re", "keyword": "kw", "depends": "dep"}
+    rules = list(itertools.islice(itertools.cycle(scenario.rules), scenario.matchers))
+    events: List[BenchMessageEvent] = []
+    for index in range(scenario.events):
+        if scenario.conversation:
+            session = f"session{index // 2 % 50}"
+            text = "/ask" if index % 2 == 0 else "answer"
+            events.append(BenchMessageEvent(text=text, session_id=session))
+            continue
+        # a quarter of the events match no matcher at all
+        target = (index * 7919) % (scenario.matchers * 4 // 3 + 1)
+        if target < scenario.matchers and not scenario.unmatched:
+            text = f"{prefixes[rules[target]]}{target} payload"
+        else:
+            text = f"unmatched {index}"
+        events.append(
+            BenchMessageEvent(
+                text=text, session_id=f"session{index % 50}", images=scenario.images
+            )
+        )
+    return events
+
+
+def _quantile(values: Sequence[float], q: float) -> float:
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+async def run_scenario(scenario: Scenario) -> Result:
+    """运行单个测试场景"""
+    bot = BenchBot(BenchAdapter(nonebot.get_driver()), "bench")
+
+    with isolated_matchers():
+        _setup_matchers(scenario, None)
+        events = _make_events(scenario)
+
+        # warm up caches and compiled plans
+        for event in events[:10]:
+            await handle_event(bot, event)
+
+        latencies: List[float] = []
+        start = time.perf_counter()
+        for event in events:
+            event_start = time.perf_counter()
+            await handle_event(bot, event)
+            latencies.append(time.perf_counter() - event_start)
+        elapsed = time.perf_counter() - start
+
+    memory = 0.0
+    if not scenario.conversation:
+        with isolated_matchers():
+            gate = asyncio.Event()
+            _setup_matchers(scenario, gate)
+            # make every in-flight event reach a handler
+            inflight = [
+                event
+                for event in _make_events(scenario)
+                if not event.text.startswith("unmatched")
+            ][: scenario.in_flight]
+
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            tasks = [asyncio.create_task(handle_event(bot, e)) for e in inflight]
+            await asyncio.sleep(0.01)
+            after = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            gate.set()
+            await asyncio.gather(*tasks)
+            memory = (after - before) / max(len(inflight), 1) / 1024
+
+    latencies.sort()
+    return Result(
+        name=scenario.name,
+        params=scenario.params,
+        events=len(events),
+        events_per_sec=len(events) / elapsed,
+        p50_us=_quantile(latencies, 0.5) * 1e6,
+        p99_us=_quantile(latencies, 0.99) * 1e6,
+        memory_per_event_kb=memory,
+    )
+
+
+async def run_suite(scenarios: Sequence[Scenario]) -> List[Result]:
+    """依次运行测试场景"""
+    return [await run_scenario(scenario) for scenario in scenarios]
+
+
+def _revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def dump_results(results: Sequence[Result]) -> Dict[str, Any]:
+    return {
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "results": [asdict(result) for result in results],
+    }
+
+
+def format_results(
+    results: Sequence[Result], baseline: Optional[Dict[str, Any]] = None
+) -> str:
+    previous = {item["name"]: item for item in (baseline or {}).get("results", ())}
+    lines = [
+        f"{'scenario':<20}{'events/s':>12}{'p50 us':>10}{'p99 us':>10}"
+        f"{'KiB/event':>11}{'vs base':>10}"
+    ]
+    for result in results:
+        change = ""
+        if (base := previous.get(result.name)) and base["events_per_sec"]:
+            change = f"{result.events_per_sec / base['events_per_sec']:.2f}x"
+        lines.append(
+            f"{result.name:<20}{result.events_per_sec:>12.0f}{result.p50_us:>10.1f}"
+            f"{result.p99_us:>10.1f}{result.memory_per_event_kb:>11.2f}{change:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="write results as json")
+    parser.add_argument("--compare", type=Path, help="baseline json to compare")
+    parser.add_argument("--scale", type=float, default=1.0, help="event count scale")
+    parser.add_argument("-k", dest="keyword", help="only run matching scenarios")
+    args = parser.parse_args(argv)
+
+    nonebot.init(driver="~none", log_level="WARNING")
+    scenarios = [
+        scenario
+        for scenario in default_scenarios(args.scale)
+        if not args.keyword or args.keyword in scenario.name
+    ]
+    results = asyncio.run(run_suite(scenarios))
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    sys.stdout.write(format_results(results, baseline) + "\n")
+    if args.output:
+        args.output.write_text(json.dumps(dump_results(results), indent=2))
+
+
+if __name__ == "__main__":
+    main()
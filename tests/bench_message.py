@@ -0,0 +1,111 @@
+"""消息段内存基准测试。
+
+分别使用 `utils.py` 中的 FakeMessageSegment 与 FakeCompactMessageSegment
+构造大量纯文本、图片与转发节点消息段，测量每个消息段的平均内存占用。
+
+用法:
+    python bench_message.py --count 100000 --output memory.json
+"""
+
+import sys
+import json
+import argparse
+import tracemalloc
+from pathlib import Path
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Type, Callable, Optional, Sequence
+
+from nonebot.adapters import MessageSegment
+from utils import FakeMessageSegment, FakeCompactMessageSegment
+
+SEGMENT_CLASSES: Dict[str, Type[MessageSegment]] = {
+    "dataclass": FakeMessageSegment,
+    "compact": FakeCompactMessageSegment,
+}
+
+
+@dataclass
+class MemoryResult:
+    name: str
+    segment_class: str
+    count: int
+    bytes_per_segment: float
+
+
+def _text(cls: Type[MessageSegment], index: int) -> MessageSegment:
+    return cls("text", {"text": f"message {index}"})
+
+
+def _image(cls: Type[MessageSegment], index: int) -> MessageSegment:
+    return cls("image", {"url": f"https://example.com/{index}.png"})
+
+
+def _node(cls: Type[MessageSegment], index: int) -> MessageSegment:
+    return cls(
+        "node",
+        {"content": [_text(cls, index), _text(cls, index + 1)], "id": index},
+    )
+
+
+SEGMENT_KINDS: Dict[str, Callable[[Type[MessageSegment], int], MessageSegment]] = {
+    "text": _text,
+    "image": _image,
+    "node": _node,
+}
+
+
+def measure(
+    cls: Type[MessageSegment],
+    factory: Callable[[Type[MessageSegment], int], MessageSegment],
+    count: int,
+) -> float:
+    """测量单个消息段 (包括其内容) 的平均内存占用，单位为字节"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    segments: List[Any] = [factory(cls, index) for index in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del segments
+    return (after - before) / count
+
+
+def run_suite(count: int, kinds: Optional[Sequence[str]] = None) -> List[MemoryResult]:
+    """依次测量各消息段类型的内存占用"""
+    return [
+        MemoryResult(
+            name=kind,
+            segment_class=class_name,
+            count=count,
+            bytes_per_segment=measure(cls, SEGMENT_KINDS[kind], count),
+        )
+        for kind in kinds or SEGMENT_KINDS
+        for class_name, cls in SEGMENT_CLASSES.items()
+    ]
+
+
+def format_results(results: Sequence[MemoryResult]) -> str:
+    lines = [f"{'segment':<10}{'class':<12}{'bytes/segment':>15}"]
+    lines.extend(
+        f"{result.name:<10}{result.segment_class:<12}"
+        f"{result.bytes_per_segment:>15.1f}"
+        for result in results
+    )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000, help="segment count")
+    parser.add_argument("--output", type=Path, help="write results as json")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.count)
+    sys.stdout.write(format_results(results) + "\n")
+    if args.output:
+        args.output.write_text(
+            json.dumps([asdict(result) for result in results], indent=2)
+        )
+
+
+if __name__ == "__main__":
+    main()
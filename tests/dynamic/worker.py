@@ -0,0 +1,18 @@
+import os
+
+import nonebot
+from nonebot import on_message
+from nonebot.adapters import Bot, Event
+
+
+def init() -> None:
+    nonebot.init()
+
+
+worker = on_message()
+
+
+@worker.handle()
+async def _(bot: Bot, event: Event):
+    result = await bot.call_api("echo", text=event.get_plaintext())
+    await bot.send(event, f"{result}:{os.getpid()}")
@@ -1,3 +1,4 @@
+import threading
 from dataclasses import dataclass
 from typing_extensions import Annotated
 
@@ -105,3 +106,18 @@ async def validate_field(x: int = Depends(lambda: "1", validate=Field(gt=0))):
 
 async def validate_field_fail(x: int = Depends(lambda: "0", validate=Field(gt=0))):
     return x
+
+
+def thread_id() -> int:
+    return threading.get_ident()
+
+
+def gen_thread_id():
+    yield threading.get_ident()
+
+
+async def inline_depend(
+    x: int = Depends(thread_id, inline=True),
+    y: int = Depends(gen_thread_id, inline=True),
+):
+    return x, y
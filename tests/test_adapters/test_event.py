@@ -0,0 +1,42 @@
+from utils import FakeMessage, make_fake_event
+
+
+def test_event_cache():
+    message = FakeMessage("text")
+    event = make_fake_event(_message=message)()
+    other = make_fake_event(_message=FakeMessage("other"))()
+
+    calls = 0
+
+    def compute() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert event.get_cached_value("key", compute) == 1
+    assert event.get_cached_value("key", compute) == 2, "should not cache outside scope"
+
+    with event._cache_scope():
+        assert event.get_cached_value("key", compute) == 3
+        assert event.get_cached_value("key", compute) == 3
+        assert (
+            other.get_cached_value("key", compute) == 4
+        ), "should not cache other event"
+
+        assert event.get_cached_message() is message
+        assert event.get_cached_plaintext() == "text"
+        assert event.get_cached_message_str() == "text"
+
+        message.append("!")
+        assert event.get_cached_plaintext() == "text"
+        event.clear_cache()
+        assert event.get_cached_plaintext() == "text!"
+        assert event.get_cached_value("key", compute) == 5
+
+        with other._cache_scope():
+            assert other.get_cached_value("key", compute) == 6
+            assert event.get_cached_value("key", compute) == 7
+
+        assert event.get_cached_value("key", compute) == 5
+
+    assert event.get_cached_value("key", compute) == 8
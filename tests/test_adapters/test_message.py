@@ -1,9 +1,19 @@
+import pickle
+from copy import deepcopy
+from typing import Any, Dict
+from dataclasses import field, dataclass
+
 import pytest
 from pydantic import ValidationError
 
 from nonebot.compat import type_validate_python
-from utils import FakeMessage, FakeMessageSegment
-from nonebot.adapters import Message, MessageSegment
+from nonebot.adapters import Message, MessageBuilder, MessageSegment
+from utils import (
+    FakeMessage,
+    FakeCompactMessage,
+    FakeMessageSegment,
+    FakeCompactMessageSegment,
+)
 
 
 def test_segment_data():
@@ -91,6 +101,43 @@ def test_segment_copy():
     assert origin == copy
 
 
+def test_segment_copy_extra_fields():
+    @dataclass
+    class ExtraSegment(FakeMessageSegment):
+        extra: Dict[str, Any] = field(default_factory=dict)
+
+    origin = ExtraSegment("text", {"text": "text"}, {"key": ["value"]})
+    copy = origin.copy()
+    copy.extra["key"].append("other")
+    assert origin.extra == {"key": ["value"]}
+
+    origin.freeze()
+    with pytest.raises(TypeError, match="Frozen"):
+        origin.extra["key"] = "changed"
+    assert origin.copy().extra == {"key": ["value"]}
+
+
+def test_segment_freeze():
+    origin = FakeMessageSegment("node", {"content": [{"text": "a"}], "id": 1})
+    assert not origin.frozen
+    assert origin.freeze() is origin
+    assert origin.frozen
+    assert origin.data == {"content": [{"text": "a"}], "id": 1}
+
+    with pytest.raises(TypeError, match="Frozen"):
+        origin.data["id"] = 2
+    with pytest.raises(TypeError, match="Frozen"):
+        origin.data["content"].append({"text": "b"})
+    with pytest.raises(TypeError, match="Frozen"):
+        origin.data["content"][0]["text"] = "b"
+
+    copy = origin.copy()
+    assert not copy.frozen
+    assert copy == origin
+    copy.data["content"][0]["text"] = "b"
+    assert origin.data["content"][0]["text"] == "a"
+
+
 def test_message_add():
     assert (
         FakeMessage([FakeMessageSegment.text("text")]) + FakeMessageSegment.text("text")
@@ -283,3 +330,234 @@ def test_message_exclude():
             FakeMessageSegment.text("test4"),
         ]
     )
+
+
+def test_message_copy():
+    image = FakeMessageSegment("image", {"file": {"url": "a"}})
+    message = FakeMessage([FakeMessageSegment.text("text"), image])
+
+    copy = message.copy()
+    assert copy == message
+    assert all(a is not b for a, b in zip(copy, message))
+    copy[1].data["file"]["url"] = "b"
+    assert image.data["file"]["url"] == "a"
+
+    assert deepcopy(message) == message
+    assert deepcopy(message)[1] is not image
+
+    message.extra = {"reply": ["id"]}
+    message.freeze()
+    copy = message.copy()
+    assert not copy.frozen
+    assert copy.extra == {"reply": ["id"]}
+    assert copy.extra is not message.extra
+
+
+def test_message_freeze():
+    message = FakeMessage(
+        [FakeMessageSegment.text("text"), FakeMessageSegment.image("a")]
+    )
+    assert message.freeze() is message
+    assert message.frozen
+    assert all(seg.frozen for seg in message)
+
+    with pytest.raises(TypeError, match="Frozen"):
+        message.append("text")
+    with pytest.raises(TypeError, match="Frozen"):
+        message += "text"
+    with pytest.raises(TypeError, match="Frozen"):
+        message[0] = FakeMessageSegment.text("text")
+    with pytest.raises(TypeError, match="Frozen"):
+        message.pop()
+    with pytest.raises(TypeError, match="Frozen"):
+        message[0].data["text"] = "changed"
+    assert message == FakeMessage("text") + FakeMessageSegment.image("a")
+
+    # frozen segments are shared between copies
+    copy = message.copy()
+    assert not copy.frozen
+    assert all(a is b for a, b in zip(copy, message))
+    copy.append("more")
+    copy[0] = copy[0].copy()
+    copy[0].data["text"] = "changed"
+    assert str(message) == "text[fake:image]"
+    assert (
+        message + "more" == FakeMessage("text") + FakeMessageSegment.image("a") + "more"
+    )
+    assert message[1:] == FakeMessage(FakeMessageSegment.image("a"))
+    assert deepcopy(message) is message
+    assert pickle.loads(pickle.dumps(message)) == message
+    assert pickle.loads(pickle.dumps(message)).frozen
+
+
+def test_compact_segment():
+    text = FakeCompactMessageSegment.text("text")
+    image = FakeCompactMessageSegment.image("url")
+    assert not hasattr(text, "__dict__")
+    assert text.type is FakeCompactMessageSegment("".join(["te", "xt"])).type
+    assert text.is_text()
+    assert not image.is_text()
+
+    # text is stored directly until data is accessed
+    assert isinstance(text._data, str)
+    assert str(text) == text.plain_text == "text"
+    assert image.plain_text is None
+    assert text == FakeCompactMessageSegment("text", {"text": "text"})
+    assert text != FakeCompactMessageSegment.text("other")
+    assert text != image
+    assert repr(text) == "FakeCompactMessageSegment(type='text', data={'text': 'text'})"
+    assert text.get("data") == {"text": "text"}
+    assert dict(text.items()) == {"type": "text", "data": {"text": "text"}}
+    assert list(text.keys()) == ["type", "data"]
+    assert isinstance(text._data, str)
+
+    text.data["text"] = "changed"
+    assert str(text) == "changed"
+    assert text.data == {"text": "changed"}
+
+    copy = image.copy()
+    copy.data["url"] = "other"
+    assert image.data == {"url": "url"}
+
+    frozen = FakeCompactMessageSegment.text("text").freeze()
+    assert frozen.frozen
+    assert frozen.copy() == frozen
+    assert not frozen.copy().frozen
+    with pytest.raises(TypeError, match="Frozen"):
+        frozen.data["text"] = "changed"
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+def test_compact_segment_validate():
+    assert type_validate_python(
+        FakeCompactMessageSegment, {"type": "text", "data": {"text": "text"}}
+    ) == FakeCompactMessageSegment.text("text")
+    assert type_validate_python(
+        FakeCompactMessage, [{"type": "image", "data": {"url": "url"}}]
+    ) == FakeCompactMessage(FakeCompactMessageSegment.image("url"))
+    with pytest.raises(ValidationError):
+        type_validate_python(FakeCompactMessageSegment, {"data": {}})
+
+    message = FakeCompactMessage("text") + FakeCompactMessageSegment.image("url")
+    assert message.extract_plain_text() == "text"
+    assert message.copy() == message
+
+
+def test_message_type_index():
+    message = FakeMessage(
+        [
+            FakeMessageSegment.text("a"),
+            FakeMessageSegment.image("1"),
+            FakeMessageSegment.text("b"),
+            FakeMessageSegment.image("2"),
+        ]
+    )
+    assert message["image"] == FakeMessage(
+        [FakeMessageSegment.image("1"), FakeMessageSegment.image("2")]
+    )
+    assert message._type_index == {"text": [0, 2], "image": [1, 3]}
+    assert message["image", -1] == FakeMessageSegment.image("2")
+    assert message.count("image") == 2
+    assert message.get("image", 1) == FakeMessage(FakeMessageSegment.image("1"))
+    assert message.include("image", "text") == message
+    assert not message.only("text")
+
+    # mutations invalidate the index
+    message.append(FakeMessageSegment.image("3"))
+    assert message._type_index is None
+    assert message.count("image") == 3
+    del message[0]
+    assert message.index("text") == 1
+    message[:] = [FakeMessageSegment.text("c")]
+    assert message.only("text")
+    assert "image" not in message
+    with pytest.raises(IndexError):
+        message["image", 0]
+    message.clear()
+    assert message.only("image")
+    assert message.count("text") == 0
+
+
+def test_message_plain_text_cache():
+    message = FakeMessage("a") + FakeMessageSegment.image("1") + "b"
+    assert message.extract_plain_text() == "ab"
+    assert message._plain_text is None
+
+    message.freeze()
+    assert message.extract_plain_text() == "ab"
+    assert message._plain_text == "ab"
+    assert message.copy()._plain_text is None
+
+
+def test_message_builder():
+    builder = MessageBuilder(FakeMessage)
+    builder += "a"
+    builder += "b"
+    builder.append(FakeMessageSegment.image("1"))
+    builder.extend([FakeMessageSegment.text("c"), FakeMessageSegment.text("d")])
+    builder.extend(["e", FakeMessageSegment.image("2")])
+    message = builder.build()
+    assert isinstance(message, FakeMessage)
+    assert message == FakeMessage(
+        [
+            FakeMessageSegment.text("ab"),
+            FakeMessageSegment.image("1"),
+            FakeMessageSegment.text("cde"),
+            FakeMessageSegment.image("2"),
+        ]
+    )
+    # builder can be reused after building
+    builder += "f"
+    assert builder.build() == message + FakeMessageSegment.text("f")
+
+    image = FakeMessageSegment.image("3")
+    builder = MessageBuilder(FakeMessage, merge_text=False)
+    for text in ("a", "b"):
+        builder += text
+    builder += FakeMessage(image)
+    assert len(builder) == 3
+    message = builder.build()
+    assert message == FakeMessage("a") + "b" + image
+    # segments are not copied
+    assert message[2] is image
+
+    # segments with extra data are not merged
+    builder = MessageBuilder(FakeMessage)
+    builder += FakeMessageSegment.text("a")
+    builder += FakeMessageSegment("text", {"text": "b", "style": "bold"})
+    assert len(builder.build()) == 2
+
+    class SplitMessage(FakeMessage):
+        @staticmethod
+        def _construct(msg):
+            if isinstance(msg, str):
+                yield from map(FakeMessageSegment.text, msg.split("|"))
+            else:
+                yield from FakeMessage._construct(msg)
+
+    # merged text is built by the message class and kept apart
+    # when it is not constructed back into one text segment
+    builder = MessageBuilder(SplitMessage)
+    builder += FakeMessageSegment.text("a")
+    builder += FakeMessageSegment.text("b")
+    builder += FakeMessageSegment.image("1")
+    builder += FakeMessageSegment.text("c|")
+    builder += FakeMessageSegment.text("d")
+    assert builder.build() == SplitMessage(
+        [
+            FakeMessageSegment.text("ab"),
+            FakeMessageSegment.image("1"),
+            FakeMessageSegment.text("c|"),
+            FakeMessageSegment.text("d"),
+        ]
+    )
+
+    with pytest.raises(TypeError):
+        builder += 1
+
+
+def test_compact_message_builder():
+    builder = MessageBuilder(FakeCompactMessage)
+    for text in ("a", "b"):
+        builder += FakeCompactMessageSegment.text(text)
+    assert builder.build() == FakeCompactMessage("ab")
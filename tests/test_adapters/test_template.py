@@ -74,3 +74,51 @@ def test_malformed_template():
         "{a[__builtins__][__import__]}{b.__init__}", private_getattr=True
     )
     message = malformed_template.format(a=globals(), b="b")
+
+
+def test_template_plan_cache():
+    from nonebot.internal.adapter.template import _compile_template
+
+    _compile_template.cache_clear()
+    first = FakeMessage.template("hello {name}, {}!").format("bye", name="[a]")
+    second = FakeMessage.template("hello {name}, {}!").format("bye", name="[a]")
+    assert first == second
+    assert first.extract_plain_text() == escape_text("hello [a], bye!")
+    assert _compile_template.cache_info().hits == 1
+
+    # literal segments from the cached plan are not shared between messages
+    assert all(a is not b for a, b in zip(first, second))
+    first[0].data["text"] = "changed"
+    assert FakeMessage.template("hello {name}, {}!").format("bye", name="[a]") == second
+
+    # auto numbering continues across text segments of a message template
+    template = FakeMessage.template("{}" + FakeMessageSegment.image("url") + "{}{}")
+    assert str(template.format(1, 2, 3)) == "1[fake:image]23"
+    with pytest.raises(ValueError, match="automatic field numbering"):
+        FakeMessage.template("{}{0}").format(1)
+
+    # non-str values in str templates are added one by one
+    assert MessageTemplate("{}-{}").format(1, 2) == "1-2"
+    message = MessageTemplate("a{}b").format(FakeMessageSegment.image("url"))
+    assert isinstance(message, FakeMessage)
+    assert str(message) == "a[fake:image]b"
+
+
+def test_template_overrides():
+    appended = []
+
+    class RecordMessage(FakeMessage):
+        def append(self, obj):
+            appended.append(str(obj))
+            return super().append(obj)
+
+    message = RecordMessage.template("a{}b").format(FakeMessageSegment.image("url"))
+    assert str(message) == "a[fake:image]b"
+    assert appended[-3:] == ["a", "[fake:image]", "b"]
+
+    class UpperTemplate(MessageTemplate):
+        def parse(self, format_string):
+            for literal_text, *rest in super().parse(format_string):
+                yield (literal_text.upper(), *rest)
+
+    assert UpperTemplate("hello {}").format("world") == "HELLO world"
@@ -0,0 +1,98 @@
+import time
+import asyncio
+from contextlib import AsyncExitStack
+
+import pytest
+
+from nonebot.log import logger
+from nonebot.dependencies import Dependent
+from nonebot.params import Depends, DependParam
+
+ROUNDS = 2000
+
+
+def _sync_dependency() -> int:
+    return 1
+
+
+async def _async_dependency() -> int:
+    return 1
+
+
+async def _nested_dependency(value: int = Depends(_async_dependency)) -> int:
+    return value + 1
+
+
+async def _handler(
+    a: int = Depends(_sync_dependency, inline=True),
+    b: int = Depends(_async_dependency),
+    c: int = Depends(_nested_dependency),
+) -> int:
+    return a + b + c
+
+
+@pytest.mark.asyncio
+async def test_depend_overhead():
+    dependent = Dependent[int].parse(call=_handler, allow_types=[DependParam])
+
+    created = 0
+    loop = asyncio.get_running_loop()
+    factory = loop.get_task_factory()
+
+    def counting_factory(loop, coro, **kwargs):
+        nonlocal created
+        created += 1
+        if factory is not None:
+            return factory(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    loop.set_task_factory(counting_factory)
+    try:
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            async with AsyncExitStack() as stack:
+                assert await dependent(stack=stack, dependency_cache={}) == 4
+        elapsed = time.perf_counter() - start
+    finally:
+        loop.set_task_factory(factory)
+
+    logger.info(
+        f"Dependency overhead: {elapsed / ROUNDS * 1e6:.2f} us per handler call"
+    )
+    # only the three sibling sub dependencies are gathered,
+    # dependency calls themselves never create tasks
+    assert created == 3 * ROUNDS
+
+
+@pytest.mark.asyncio
+async def test_dispatch_benchmark():
+    from bench_dispatch import run_suite, format_results, default_scenarios
+
+    scenarios = [
+        scenario
+        for scenario in default_scenarios(scale=0.02)
+        if scenario.matchers <= 100
+    ]
+    results = await run_suite(scenarios)
+
+    assert [result.name for result in results] == [s.name for s in scenarios]
+    for result in results:
+        assert result.events == 20
+        assert result.events_per_sec > 0
+        assert result.p99_us >= result.p50_us > 0
+    assert "vs base" in format_results(results, {"results": []})
+
+
+def test_message_memory_benchmark():
+    from bench_message import run_suite, format_results
+
+    results = {
+        (result.name, result.segment_class): result.bytes_per_segment
+        for result in run_suite(1000)
+    }
+
+    assert len(results) == 6
+    # slotted segments without instance dict always use less memory
+    for kind in ("text", "image", "node"):
+        assert results[(kind, "compact")] < results[(kind, "dataclass")]
+    assert "bytes/segment" in format_results(run_suite(10, ["text"]))
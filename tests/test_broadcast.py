@@ -1,18 +1,20 @@
 import sys
 from typing import Optional
+from datetime import datetime, timedelta
 
 import pytest
 from nonebug import App
 
 from nonebot import on_message
 import nonebot.message as message
-from utils import make_fake_event
-from nonebot.params import Depends
+from nonebot.rule import keyword
 from nonebot.typing import T_State
-from nonebot.matcher import Matcher
-from nonebot.adapters import Bot, Event
+from nonebot.matcher import Matcher, matchers
 from nonebot.exception import IgnoredException
+from nonebot.adapters import Bot, Event, Message
+from nonebot.params import Arg, Depends, EventPlainText
 from nonebot.log import logger, default_filter, default_format
+from utils import FakeMessage, FakeMessageEvent, make_fake_event
 from nonebot.message import (
     run_preprocessor,
     run_postprocessor,
@@ -132,6 +134,63 @@ async def test_event_preprocessor_exception(
         assert "RuntimeError: test" in capsys.readouterr().out
 
 
+@pytest.mark.asyncio
+async def test_event_preprocessor_modify_message(
+    app: App, monkeypatch: pytest.MonkeyPatch
+):
+    with monkeypatch.context() as m:
+        m.setattr(message, "_event_preprocessors", set())
+
+        @event_preprocessor
+        async def test_preprocessor(event: Event):
+            assert event.get_cached_plaintext() == "text"
+            event.get_message().append("modified")
+
+        with app.provider.context({}):
+            matcher = on_message(keyword("modified"))
+
+            @matcher.handle()
+            async def _():
+                await matcher.finish("handled")
+
+            async with app.test_matcher(matcher) as ctx:
+                bot = ctx.create_bot()
+                event = make_fake_event(_message=FakeMessage("text"))()
+                ctx.receive_event(bot, event)
+                ctx.should_call_send(event, "handled", None)
+
+
+@pytest.mark.asyncio
+async def test_modified_message_cache(app: App, monkeypatch: pytest.MonkeyPatch):
+    seen = []
+
+    async def modify(event: FakeMessageEvent):
+        event.text = "changed"
+
+    async def record(text: str = EventPlainText()):
+        seen.append(text)
+
+    with monkeypatch.context() as m:
+        m.setattr(message, "_run_preprocessors", set())
+
+        @run_preprocessor
+        async def _(event: FakeMessageEvent):
+            if event.text == "run":
+                event.text = "preprocessed"
+
+        with app.provider.context({}):
+            on_message(keyword("text"), handlers=[modify], block=False)
+            on_message(keyword("changed"), priority=2, handlers=[record])
+            on_message(keyword("run"), priority=3, handlers=[record])
+
+            async with app.test_api() as ctx:
+                bot = ctx.create_bot()
+                await message.handle_event(bot, FakeMessageEvent(text="text"))
+                await message.handle_event(bot, FakeMessageEvent(text="run"))
+
+    assert seen == ["changed", "preprocessed"]
+
+
 @pytest.mark.asyncio
 async def test_event_postprocessor(app: App, monkeypatch: pytest.MonkeyPatch):
     with monkeypatch.context() as m:
@@ -386,3 +445,149 @@ async def test_run_postprocessor_exception(
             logger.remove(handler_id)
 
         assert "RuntimeError: test" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+async def test_handle_events(app: App):
+    handled = []
+
+    async def handler(event: Event, state: T_State):
+        assert "shared" not in state
+        state["shared"] = True
+        handled.append(event.get_plaintext())
+
+    with app.provider.context({}):
+        on_message(keyword("batch"), handlers=[handler])
+
+        async with app.test_api() as ctx:
+            bot = ctx.create_bot()
+            await message.handle_events(
+                bot,
+                [
+                    make_fake_event(_message=FakeMessage("batch 1"))(),
+                    make_fake_event(_message=FakeMessage("other"))(),
+                    make_fake_event(_message=FakeMessage("batch 2"))(),
+                ],
+            )
+
+    assert sorted(handled) == ["batch 1", "batch 2"]
+
+
+@pytest.mark.asyncio
+async def test_handle_events_scheduler(app: App):
+    handled = []
+
+    async def late(event: Event):
+        handled.append(("late", event.get_plaintext()))
+
+    async def first(event: Event):
+        handled.append(("first", event.get_plaintext()))
+        on_message(keyword("batch"), handlers=[late], temp=True)
+
+    scheduler = message.get_event_scheduler()
+    scheduler.configure(max_concurrency=1)
+    try:
+        with app.provider.context({}):
+            on_message(keyword("first"), handlers=[first])
+
+            async with app.test_api() as ctx:
+                bot = ctx.create_bot()
+                await message.handle_events(
+                    bot,
+                    [
+                        make_fake_event(_message=FakeMessage("first"))(),
+                        make_fake_event(_message=FakeMessage("batch"))(),
+                    ],
+                )
+    finally:
+        scheduler.configure()
+
+    # events are admitted one by one and see matchers added earlier in the batch
+    assert handled == [("first", "first"), ("late", "batch")]
+    assert scheduler.stats().running == 0
+
+
+@pytest.mark.asyncio
+async def test_waiting_sessions(app: App):
+    answers = []
+    fallback = []
+
+    async def record(event: Event):
+        fallback.append((event.get_session_id(), event.get_plaintext()))
+
+    async def answer(event: Event, answer: Message = Arg()):
+        answers.append((event.get_session_id(), str(answer)))
+
+    with app.provider.context({}):
+        ask = on_message(keyword("ask"))
+        ask.got("answer")(answer)
+        on_message(priority=2, handlers=[record])
+
+        async with app.test_api() as ctx:
+            bot = ctx.create_bot()
+            await message.handle_event(
+                bot, FakeMessageEvent(text="ask", session_id="a")
+            )
+            await message.handle_event(
+                bot, FakeMessageEvent(text="ask", session_id="b")
+            )
+            assert len(matchers.sessions) == 2
+            assert not matchers.get(0)
+
+            await message.handle_event(bot, FakeMessageEvent(text="hi", session_id="c"))
+            await message.handle_event(bot, FakeMessageEvent(text="42", session_id="a"))
+            assert answers == [("a", "42")]
+            assert len(matchers.sessions) == 1
+
+            (waiting,) = matchers.sessions
+            assert waiting.sessions == ("b",)
+            waiting.expire_time = datetime.now() - timedelta(seconds=1)
+            await message.handle_event(bot, FakeMessageEvent(text="7", session_id="b"))
+            assert not matchers.sessions
+
+    assert answers == [("a", "42")]
+    assert fallback == [("c", "hi"), ("b", "7")]
+
+
+@pytest.mark.asyncio
+async def test_metrics(app: App, monkeypatch: pytest.MonkeyPatch):
+    async def checker() -> bool:
+        return True
+
+    async def handler():
+        pass
+
+    with monkeypatch.context() as m:
+        m.setattr(message, "_event_preprocessors", set())
+
+        @event_preprocessor
+        async def preprocessor():
+            pass
+
+        message.metrics.reset()
+        message.metrics.enable()
+        try:
+            with app.provider.context({}):
+                matcher = on_message(checker, handlers=[handler])
+
+                async with app.test_matcher(matcher) as ctx:
+                    bot = ctx.create_bot()
+                    ctx.receive_event(
+                        bot, make_fake_event(_message=FakeMessage("text"))()
+                    )
+        finally:
+            message.metrics.enable(False)
+
+    samples = message.metrics.snapshot()
+    rendered = message.metrics.render()
+    message.metrics.reset()
+
+    stages = {(key.stage, key.target): key for key in samples}
+    assert ("event_preprocessor", "preprocessor") in stages
+    assert ("trie", "TrieRule.get_value") in stages
+    assert ("rule", "checker") in stages
+    assert ("handler", "handler") in stages
+    assert stages["rule", "checker"].module == __name__
+    assert stages["handler", "handler"].lineno is not None
+    assert all(histogram.count == 1 for histogram in samples.values())
+    assert 'stage="handler",target="handler"' in rendered
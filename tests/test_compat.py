@@ -1,3 +1,5 @@
+import gc
+import weakref
 from typing import Any, Optional
 from dataclasses import dataclass
 
@@ -5,13 +7,16 @@ import pytest
 from pydantic import BaseModel
 
 from nonebot.compat import (
+    PYDANTIC_V2,
     DEFAULT_CONFIG,
     Required,
     FieldInfo,
+    ModelField,
     PydanticUndefined,
     model_dump,
     custom_validation,
     type_validate_json,
+    model_field_validate,
     type_validate_python,
 )
 
@@ -90,3 +95,23 @@ async def test_validate_json():
         '  "test6": null'
         "}",
     ) == TestModel(test1=1, test2="2", test3=True, test4={}, test5=[], test6=None)
+
+
+@pytest.mark.skipif(not PYDANTIC_V2, reason="TypeAdapter is pydantic v2 only")
+def test_model_field_type_adapter():
+    from nonebot.compat import _type_adapters
+
+    field = ModelField.construct("test", int)
+    assert model_field_validate(field, "1", DEFAULT_CONFIG) == 1
+    adapter = field._type_adapter(DEFAULT_CONFIG)
+    # configs with the same content share the adapter
+    assert field._type_adapter(dict(DEFAULT_CONFIG)) is adapter  # type: ignore
+    assert field._type_adapter(None) is not adapter
+    assert "_type_adapters" not in vars(field)
+
+    # the cache does not keep fields alive
+    assert field in _type_adapters
+    ref = weakref.ref(field)
+    del field, adapter
+    gc.collect()
+    assert ref() is None
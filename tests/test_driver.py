@@ -8,6 +8,7 @@ from nonebug import App
 from utils import FakeAdapter
 from nonebot.adapters import Bot
 from nonebot.params import Depends
+from nonebot.message import Metrics
 from nonebot.dependencies import Dependent
 from nonebot.exception import WebSocketClosed
 from nonebot.drivers import (
@@ -101,6 +102,30 @@ async def test_http_server(app: App, driver: Driver):
     await asyncio.sleep(1)
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "driver",
+    [pytest.param("nonebot.drivers.fastapi:Driver", id="fastapi")],
+    indirect=True,
+)
+async def test_metrics_server(app: App, driver: Driver):
+    assert isinstance(driver, ASGIMixin)
+
+    metrics = Metrics()
+    metrics.observe("handler", "test", 0.002)
+    metrics.setup_http_server(driver, "/metrics_test")
+
+    async with app.test_server(driver.asgi) as ctx:
+        client = ctx.get_client()
+        response = await client.get("/metrics_test")
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/plain")
+        assert (
+            'nonebot_latency_seconds_bucket{stage="handler",target="test",'
+            'le="0.0025"} 1' in response.text
+        )
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "driver",
@@ -0,0 +1,79 @@
+import io
+
+import pytest
+
+import nonebot.log
+from nonebot.log import LogSampler, logger, log_enabled, use_log_queue
+
+
+def test_log_enabled():
+    logger.configure(extra={"nonebot_log_level": "INFO"})
+    try:
+        assert log_enabled("INFO")
+        assert log_enabled(30)
+        assert not log_enabled("DEBUG")
+
+        handler_id = logger.add(io.StringIO(), level="TRACE")
+        try:
+            assert log_enabled("TRACE")
+        finally:
+            logger.remove(handler_id)
+        assert not log_enabled("TRACE")
+
+        logger.configure(extra={"nonebot_log_level": "WARNING"})
+        assert not log_enabled("INFO")
+    finally:
+        logger.configure(extra={"nonebot_log_level": "INFO"})
+
+
+def test_log_enabled_fallback(monkeypatch: pytest.MonkeyPatch):
+    logger.configure(extra={"nonebot_log_level": "INFO"})
+    assert not log_enabled("TRACE")
+
+    # every level is assumed enabled when loguru internals are unavailable
+    monkeypatch.setattr(nonebot.log, "_loguru_state", lambda: None)
+    assert log_enabled("TRACE")
+
+    class UnknownHandler: ...
+
+    monkeypatch.setattr(
+        nonebot.log,
+        "_loguru_state",
+        lambda: ({-1: UnknownHandler()}, {"nonebot_log_level": "INFO"}),
+    )
+    assert log_enabled("TRACE")
+
+
+def test_log_sampler():
+    sampler = LogSampler(3)
+    assert [sampler() for _ in range(7)] == [
+        True,
+        False,
+        False,
+        True,
+        False,
+        False,
+        True,
+    ]
+    assert all(LogSampler()() for _ in range(3))
+
+    with pytest.raises(ValueError, match="rate"):
+        LogSampler(0)
+
+
+def test_log_queue(capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch):
+    # replace a temporary handler instead of the real default handler
+    monkeypatch.setattr(nonebot.log, "logger_id", logger.add(io.StringIO()))
+    use_log_queue()
+    try:
+        for index in range(100):
+            logger.info(f"queued {index}")
+        logger.debug("filtered")
+    finally:
+        # removing the handler waits for the queue to be drained
+        logger.remove(nonebot.log.logger_id)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.rsplit(" | ", 1)[-1] for line in lines] == [
+        f"queued {index}" for index in range(100)
+    ]
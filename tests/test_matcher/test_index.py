@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+import pytest
+from nonebug import App
+
+from nonebot.matcher import Matcher
+from nonebot.consts import PREFIX_KEY
+from utils import FakeMessage, make_fake_event
+from nonebot.internal.matcher import MatcherIndex
+from nonebot.rule import (
+    CMD_RESULT,
+    Rule,
+    CommandRule,
+    regex,
+    keyword,
+    fullmatch,
+    startswith,
+)
+
+
+def _state(cmd=None) -> dict:
+    return {
+        PREFIX_KEY: CMD_RESULT(
+            command=cmd,
+            raw_command=None,
+            command_arg=None,
+            command_start=None,
+            command_whitespace=None,
+        )
+    }
+
+
+@pytest.mark.asyncio
+async def test_matcher_index(app: App):
+    async def truthy() -> bool:
+        return True
+
+    with app.provider.context({}):
+        any_matcher = Matcher.new()
+        notice_matcher = Matcher.new("notice")
+        cmd_matcher = Matcher.new("message", Rule(CommandRule([("index",)])))
+        full_matcher = Matcher.new("message", fullmatch("Hello", ignorecase=True))
+        start_matcher = Matcher.new("message", startswith(("foo", "")))
+        kw_matcher = Matcher.new("message", keyword("bar", "baz") & Rule(truthy))
+        regex_matcher = Matcher.new("message", regex(r"\d+apple"))
+        expire_matcher = Matcher.new(
+            "message", keyword("never"), expire_time=timedelta(minutes=1)
+        )
+        all_matchers = [
+            any_matcher,
+            notice_matcher,
+            cmd_matcher,
+            full_matcher,
+            start_matcher,
+            kw_matcher,
+            regex_matcher,
+            expire_matcher,
+        ]
+        index = MatcherIndex(all_matchers)
+
+        async with app.test_api() as ctx:
+            bot = ctx.create_bot()
+
+            event = make_fake_event(_message=FakeMessage("HELLO"))()
+            assert index.select(bot, event, _state()) == (
+                any_matcher,
+                full_matcher,
+                start_matcher,
+                expire_matcher,
+            )
+
+            event = make_fake_event(_message=FakeMessage("3 apple"))()
+            assert index.select(bot, event, _state()) == (
+                any_matcher,
+                start_matcher,
+                regex_matcher,
+                expire_matcher,
+            )
+
+            event = make_fake_event(_message=FakeMessage("/index baz"))()
+            assert index.select(bot, event, _state(("index",))) == (
+                any_matcher,
+                cmd_matcher,
+                start_matcher,
+                kw_matcher,
+                expire_matcher,
+            )
+
+            event = make_fake_event(_type="notice")()
+            assert index.select(bot, event, _state()) == (
+                any_matcher,
+                notice_matcher,
+            )
+
+
+@pytest.mark.asyncio
+async def test_matcher_index_custom_check(app: App):
+    class CustomMatcher(Matcher):
+        @classmethod
+        async def check_rule(cls, *args, **kwargs) -> bool:
+            return True
+
+    with app.provider.context({}):
+        custom_matcher = CustomMatcher.new("message", keyword("custom"))
+        index = MatcherIndex([custom_matcher])
+
+        async with app.test_api() as ctx:
+            bot = ctx.create_bot()
+            event = make_fake_event(_message=FakeMessage("other"))()
+            assert index.select(bot, event, _state()) == (custom_matcher,)
@@ -1,15 +1,19 @@
 import sys
+import asyncio
 from pathlib import Path
+from typing import List, Type, Tuple
+from datetime import datetime, timedelta
 
 import pytest
 from nonebug import App
 
 from nonebot.rule import Rule
 from nonebot import get_plugin
-from nonebot.matcher import Matcher, matchers
+from nonebot.exception import StopPropagation
 from utils import FakeMessage, make_fake_event
 from nonebot.permission import User, Permission
 from nonebot.message import _check_matcher, check_and_run_matcher
+from nonebot.matcher import Matcher, WaitingSession, SessionRegistry, matchers
 
 
 @pytest.mark.asyncio
@@ -303,10 +307,14 @@ async def test_run(app: App):
         async with app.test_api() as ctx:
             bot = ctx.create_bot()
             await test_reject().run(bot, event, {})
-            assert len(matchers[0]) == 1
-            assert len(matchers[0][0].handlers) == 1
+            assert not matchers.get(0)
+            assert len(matchers.sessions) == 1
+            (waiting,) = matchers.sessions.select(event)
+            assert waiting.matcher is test_reject
+            assert len(waiting.handlers) == 1
+            assert waiting.expire_time
 
-        del matchers[0]
+        matchers.sessions.clear()
 
         async def pause():
             await Matcher.pause()
@@ -316,8 +324,196 @@ async def test_run(app: App):
         async with app.test_api() as ctx:
             bot = ctx.create_bot()
             await test_pause().run(bot, event, {})
-            assert len(matchers[0]) == 1
-            assert len(matchers[0][0].handlers) == 0
+            (waiting,) = matchers.sessions.select(event)
+            assert waiting.matcher is test_pause
+            assert len(waiting.handlers) == 0
+
+            matcher = waiting.resume()
+            assert type(matcher) is waiting.view
+            assert issubclass(waiting.view, test_pause)
+            assert waiting.view not in matchers.get(0, [])
+            assert matcher.priority == 0
+            assert matcher.temp
+            assert matcher.block
+            assert matcher.permission is waiting.permission
+
+
+def test_session_registry():
+    registry = SessionRegistry()
+    user = WaitingSession(Matcher, "message", Permission(User(("a", "b"))), [], {})
+    custom = WaitingSession(Matcher, "", Permission(), [], {})
+    registry.add(user)
+    registry.add(custom)
+    assert len(registry) == 2
+    assert list(registry) == [user, custom]
+
+    assert registry.select(make_fake_event(_session_id="b")()) == [user, custom]
+    assert registry.select(make_fake_event(_session_id="c")()) == [custom]
+
+    assert registry.discard(user)
+    assert not registry.discard(user)
+    assert registry.select(make_fake_event(_session_id="a")()) == [custom]
+
+    registry.clear()
+    assert not registry
+
+
+@pytest.mark.asyncio
+async def test_session_registry_scope(app: App):
+    event = make_fake_event(_session_id="a")()
+
+    with app.provider.context({}):
+        outer = Matcher.new(priority=1)
+        waiting = WaitingSession(outer, "", Permission(User(("a",))), [], {})
+        matchers.sessions.add(waiting)
+        assert matchers.sessions.select(event) == [waiting]
+
+        with app.provider.context():
+            assert not matchers.sessions
+            assert matchers.sessions.select(event) == []
+
+            inner = WaitingSession(outer, "", Permission(User(("a",))), [], {})
+            matchers.sessions.add(inner)
+            assert list(matchers.sessions) == [inner]
+
+        assert list(matchers.sessions) == [waiting]
+
+    assert waiting not in matchers.sessions
+
+
+@pytest.mark.asyncio
+async def test_waiting_check_perm(app: App):
+    with app.provider.context({}):
+
+        async def ask():
+            await Matcher.pause()
+
+        async def answer():
+            await Matcher.finish("done")
+
+        test_matcher = Matcher.new(handlers=[ask, answer])
+
+        async with app.test_matcher(test_matcher) as ctx:
+            bot = ctx.create_bot()
+            event = make_fake_event(_message=FakeMessage("ask"))()
+            ctx.receive_event(bot, event)
+            ctx.should_pass_permission(test_matcher)
+            ctx.should_pass_rule(test_matcher)
+            ctx.should_paused(test_matcher)
+
+            # the session permission is checked through the matcher's check_perm
+            event = make_fake_event(_message=FakeMessage("answer"))()
+            ctx.receive_event(bot, event)
+            ctx.should_pass_permission(test_matcher)
+            ctx.should_call_send(event, "done", True)
+            ctx.should_finished(test_matcher)
+
+
+@pytest.mark.asyncio
+async def test_waiting_check_perm_override(app: App):
+    from nonebot.message import check_and_run_waiting
+
+    checked: List[Tuple[Type[Matcher], str]] = []
+
+    class LegacyMatcher(Matcher):
+        @classmethod
+        async def check_perm(cls, bot, event, stack=None, dependency_cache=None):
+            checked.append((cls, cls.type))
+            return await super().check_perm(bot, event, stack, dependency_cache)
+
+    with app.provider.context({}):
+
+        async def ask():
+            await LegacyMatcher.pause()
+
+        test_matcher = LegacyMatcher.new("message", handlers=[ask])
+
+        async with app.test_api() as ctx:
+            bot = ctx.create_bot()
+            event = make_fake_event(_message=FakeMessage("ask"))()
+            await test_matcher().run(bot, event, {})
+            (waiting,) = matchers.sessions.select(event)
+            with pytest.raises(StopPropagation):
+                await check_and_run_waiting(waiting, bot, event, {})
+
+        assert checked == [(waiting.view, "message")]
+        assert not matchers.sessions
+
+
+@pytest.mark.asyncio
+async def test_waiting_processors(app: App, monkeypatch: pytest.MonkeyPatch):
+    from nonebot import message
+    from nonebot.message import run_preprocessor, run_postprocessor
+
+    seen: List[Tuple[str, int, bool]] = []
+
+    with monkeypatch.context() as m, app.provider.context({}):
+        m.setattr(message, "_run_preprocessors", set())
+        m.setattr(message, "_run_postprocessors", set())
+
+        @run_preprocessor
+        async def preprocessor(matcher: Matcher):
+            seen.append(("pre", matcher.priority, matcher.temp))
+
+        @run_postprocessor
+        async def postprocessor(matcher: Matcher):
+            seen.append(("post", matcher.priority, matcher.temp))
+
+        async def ask():
+            await Matcher.pause()
+
+        test_matcher = Matcher.new(handlers=[ask], priority=5)
+
+        async with app.test_api() as ctx:
+            bot = ctx.create_bot()
+            event = make_fake_event(_message=FakeMessage("ask"))()
+            await message.check_and_run_matcher(test_matcher, bot, event, {})
+            (waiting,) = matchers.sessions.select(event)
+            with pytest.raises(StopPropagation):
+                await message.check_and_run_waiting(waiting, bot, event, {})
+
+    # the resumed session is seen as a temporary matcher with priority 0
+    assert seen == [
+        ("pre", 5, False),
+        ("post", 5, False),
+        ("pre", 0, True),
+        ("post", 0, True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_expiry_service(app: App):
+    with app.provider.context({}):
+        await matchers.expiry.start()
+        try:
+            before = matchers.expiry.stats()
+            expiring = Matcher.new(expire_time=timedelta(milliseconds=20))
+            waiting = WaitingSession(
+                Matcher,
+                "",
+                Permission(User(("test",))),
+                [],
+                {},
+                expire_time=datetime.now() + timedelta(milliseconds=20),
+            )
+            matchers.sessions.add(waiting)
+            matchers.expiry.schedule(waiting)
+
+            stats = matchers.expiry.stats()
+            assert stats.live_sessions == 1
+            assert stats.live_matchers == 1
+            assert stats.scheduled == 2
+
+            await asyncio.sleep(0.1)
+            assert expiring not in matchers[expiring.priority]
+            assert not matchers.sessions
+
+            stats = matchers.expiry.stats()
+            assert stats.live_sessions == stats.live_matchers == stats.scheduled == 0
+            assert stats.expired_sessions == before.expired_sessions + 1
+            assert stats.expired_matchers == before.expired_matchers + 1
+        finally:
+            await matchers.expiry.stop()
 
 
 @pytest.mark.asyncio
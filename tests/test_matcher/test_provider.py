@@ -12,3 +12,31 @@ async def test_manager(app: App):
         assert default_provider == matchers.provider
     finally:
         matchers.provider = app.provider
+
+
+@pytest.mark.asyncio
+async def test_manager_snapshot(app: App):
+    from nonebot.matcher import Matcher
+
+    with app.provider.context({}):
+        matcher_1 = Matcher.new(priority=2)
+        matcher_2 = Matcher.new(priority=1)
+
+        snapshot = matchers.snapshot()
+        assert snapshot == ((1, (matcher_2,)), (2, (matcher_1,)))
+        assert matchers.snapshot() is snapshot
+
+        matcher_3 = Matcher.new(priority=2)
+        new_snapshot = matchers.snapshot()
+        assert new_snapshot == ((1, (matcher_2,)), (2, (matcher_1, matcher_3)))
+        # unchanged priorities are reused
+        assert new_snapshot[0][1] is snapshot[0][1]
+
+        matcher_3.destroy()
+        assert matchers.snapshot() == ((1, (matcher_2,)), (2, (matcher_1,)))
+
+        # changes made directly to the provider are detected
+        matchers[3].append(matcher_3)
+        assert matchers.snapshot()[-1] == (3, (matcher_3,))
+
+    assert matcher_1 not in dict(matchers.snapshot()).get(2, ())
@@ -1,4 +1,6 @@
 import re
+import asyncio
+import threading
 
 import pytest
 from nonebug import App
@@ -8,6 +10,7 @@ from nonebot.dependencies import Dependent
 from nonebot.exception import TypeMisMatch
 from utils import FakeMessage, make_fake_event
 from nonebot.params import (
+    Depends,
     ArgParam,
     BotParam,
     EventParam,
@@ -36,6 +39,47 @@ from nonebot.consts import (
 UNKNOWN_PARAM = "Unknown parameter"
 
 
+@pytest.mark.asyncio
+async def test_depend_cancelled_consumer():
+    calls = 0
+    started = asyncio.Event()
+
+    async def slow() -> int:
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def consumer(value: int = Depends(slow)) -> int:
+        return value
+
+    dependent = Dependent[int].parse(call=consumer, allow_types=[DependParam])
+
+    # cancelling the consumer running the dependency does not cancel the others
+    cache = {}
+    first = asyncio.create_task(dependent(dependency_cache=cache))
+    await started.wait()
+    second = asyncio.create_task(dependent(dependency_cache=cache))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == 2
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    # cancelling a waiting consumer does not cancel the running dependency
+    cache = {}
+    started.clear()
+    first = asyncio.create_task(dependent(dependency_cache=cache))
+    await started.wait()
+    second = asyncio.create_task(dependent(dependency_cache=cache))
+    await asyncio.sleep(0)
+    second.cancel()
+    assert await first == 3
+    with pytest.raises(asyncio.CancelledError):
+        await second
+
+
 @pytest.mark.asyncio
 async def test_depend(app: App):
     from plugins.param.param_depend import (
@@ -585,3 +629,54 @@ async def test_priority():
             assert isinstance(param.field_info, DefaultParam)
         else:
             raise ValueError(f"unknown param {param.name}")
+
+
+@pytest.mark.asyncio
+async def test_call_plan(app: App):
+    from plugins.param.priority import complex_priority
+
+    dependent = Dependent.parse(
+        call=complex_priority,
+        allow_types=[
+            DependParam,
+            BotParam,
+            EventParam,
+            StateParam,
+            MatcherParam,
+            ArgParam,
+            ExceptionParam,
+            DefaultParam,
+        ],
+    )
+    plan = dependent._plan
+    assert plan.is_coroutine
+    assert {type(param) for param in plan.checks} == {
+        BotParam,
+        EventParam,
+        MatcherParam,
+    }
+    assert {field.name for field, _ in plan.lookups} == {
+        "bot",
+        "event",
+        "state",
+        "matcher",
+    }
+    assert {field.name for field, _ in plan.fields} == {"arg", "exception", "default"}
+    assert [field.name for field, _ in plan.depends] == ["sub"]
+
+    from plugins.param.param_bot import FooBot, sub_bot
+
+    dependent = Dependent.parse(call=sub_bot, allow_types=[BotParam])
+    assert [type(param) for param in dependent._plan.checks] == [BotParam]
+
+    async with app.test_api() as ctx:
+        bot = ctx.create_bot(base=FooBot)
+        assert await dependent(bot=bot) is bot
+
+
+@pytest.mark.asyncio
+async def test_depend_inline(app: App):
+    from plugins.param.param_depend import inline_depend
+
+    async with app.test_dependent(inline_depend, allow_types=[DependParam]) as ctx:
+        ctx.should_return((threading.get_ident(), threading.get_ident()))
@@ -19,6 +19,7 @@ from nonebot.permission import (
     MetaEvent,
     SuperUser,
     Permission,
+    checker_cost,
 )
 
 
@@ -54,6 +55,32 @@ async def test_permission(app: App):
         assert await Permission(truthy, skipped)(bot, event) is True
 
 
+@pytest.mark.asyncio
+async def test_permission_short_circuit(app: App):
+    called = []
+
+    @checker_cost(0)
+    async def truthy() -> bool:
+        called.append("truthy")
+        return True
+
+    @checker_cost(float("inf"))
+    async def expensive() -> bool:
+        called.append("expensive")
+        return False
+
+    event = make_fake_event()()
+
+    async with app.test_api() as ctx:
+        bot = ctx.create_bot()
+        assert await Permission(expensive, truthy)(bot, event) is True
+        assert called == ["truthy"]
+
+        called.clear()
+        assert await Permission(expensive)(bot, event) is False
+        assert called == ["expensive"]
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(("type", "expected"), [("message", True), ("notice", False)])
 async def test_message(type: str, expected: bool):
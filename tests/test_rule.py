@@ -1,13 +1,24 @@
+import gc
 import re
 import sys
+import asyncio
+import threading
 from typing import Match, Tuple, Union, Optional
 
 import pytest
 from nonebug import App
 
+from nonebot import on_keyword
 from nonebot.typing import T_State
+from nonebot.internal.checker import IO_BOUND_COST
 from nonebot.exception import ParserExit, SkippedException
 from utils import FakeMessage, FakeMessageSegment, make_fake_event
+from nonebot.utils import (
+    sync_policy,
+    run_sync_with_policy,
+    shutdown_sync_executors,
+    configure_sync_executors,
+)
 from nonebot.consts import (
     CMD_KEY,
     PREFIX_KEY,
@@ -31,6 +42,8 @@ from nonebot.rule import (
     RegexRule,
     IsTypeRule,
     CommandRule,
+    LiteralRule,
+    PrefixTable,
     EndswithRule,
     KeywordsRule,
     FullmatchRule,
@@ -45,6 +58,7 @@ from nonebot.rule import (
     endswith,
     fullmatch,
     startswith,
+    checker_cost,
     shell_command,
 )
 
@@ -81,6 +95,77 @@ async def test_rule(app: App):
         assert await Rule(truthy, skipped)(bot, event, {}) is False
 
 
+@pytest.mark.asyncio
+async def test_rule_short_circuit(app: App):
+    called = []
+
+    @checker_cost(0)
+    async def falsy() -> bool:
+        called.append("falsy")
+        return False
+
+    @checker_cost(float("inf"))
+    async def expensive() -> bool:
+        called.append("expensive")
+        return True
+
+    async def slow() -> bool:
+        called.append("slow")
+        await asyncio.sleep(0.02)
+        return True
+
+    event = make_fake_event()()
+
+    async with app.test_api() as ctx:
+        bot = ctx.create_bot()
+        assert await Rule(falsy, expensive)(bot, event, {}) is False
+        assert called == ["falsy"]
+
+        called.clear()
+        assert await Rule(expensive)(bot, event, {}) is True
+        assert called == ["expensive"]
+
+        rule = Rule(slow)
+        assert await rule(bot, event, {}) is True
+        assert rule._plan
+        assert [e.checker.call for e in rule._plan._inline] == [slow]
+        assert await rule(bot, event, {}) is True
+        assert [e.checker.call for e in rule._plan._concurrent] == [slow]
+
+
+@pytest.mark.asyncio
+async def test_rule_executor_wait(app: App):
+    release = threading.Event()
+
+    def block() -> None:
+        release.wait()
+
+    @sync_policy("thread")
+    def fast() -> bool:
+        return True
+
+    event = make_fake_event()()
+
+    configure_sync_executors(thread_workers=1)
+    try:
+        async with app.test_api() as ctx:
+            bot = ctx.create_bot()
+            blocker = asyncio.create_task(run_sync_with_policy("thread", block))
+            await asyncio.sleep(0)
+            asyncio.get_running_loop().call_later(0.05, release.set)
+
+            rule = Rule(fast)
+            assert await rule(bot, event, {}) is True
+            # time spent waiting for the busy thread is not counted
+            assert rule._plan
+            (entry,) = rule._plan._entries
+            assert entry.cost < IO_BOUND_COST
+            await blocker
+    finally:
+        configure_sync_executors()
+        shutdown_sync_executors()
+
+
 @pytest.mark.asyncio
 async def test_trie(app: App):
     TrieRule.add_prefix("/fake-prefix", TRIE_VALUE("/", ("fake-prefix",)))
@@ -143,9 +228,70 @@ async def test_trie(app: App):
             command_whitespace="      ",
         )
 
+        message = FakeMessage("/fake-prefix lazy")
+        event = make_fake_event(_message=message)()
+        state = {}
+        TrieRule.get_value(bot, event, state)
+        assert not dict.__contains__(state[PREFIX_KEY], CMD_KEY)
+        assert state[PREFIX_KEY].get(CMD_KEY) == ("fake-prefix",)
+        assert not dict.__contains__(state[PREFIX_KEY], CMD_ARG_KEY)
+        assert state[PREFIX_KEY][CMD_ARG_KEY] == FakeMessage("lazy")
+        assert message == FakeMessage("/fake-prefix lazy")
+
+        state = {}
+        TrieRule.get_value(bot, event, state)
+        assert not state[PREFIX_KEY] != CMD_RESULT(
+            command=("fake-prefix",),
+            raw_command="/fake-prefix",
+            command_arg=FakeMessage("lazy"),
+            command_start="/",
+            command_whitespace=" ",
+        )
+
+        message = FakeMessageSegment.text("/fake-prefix ") + FakeMessageSegment.image(
+            "fake url"
+        )
+        event = make_fake_event(_message=message)()
+        state = {}
+        TrieRule.get_value(bot, event, state)
+        arg = state[PREFIX_KEY][CMD_ARG_KEY]
+        arg[0].data["url"] = "changed url"
+        assert message[1].data["url"] == "fake url"
+
+        event = make_fake_event(_message=FakeMessage("no command"))()
+        state = {}
+        TrieRule.get_value(bot, event, state)
+        assert not dict.__contains__(state[PREFIX_KEY], CMD_KEY)
+        assert state[PREFIX_KEY][CMD_KEY] is None
+        assert state[PREFIX_KEY][CMD_ARG_KEY] is None
+
     del TrieRule.prefix["/fake-prefix"]
 
 
+def test_prefix_table():
+    table = PrefixTable()
+    assert not table.longest_prefix("/help")
+
+    table["/"] = TRIE_VALUE("/", ())
+    table["/help"] = TRIE_VALUE("/", ("help",))
+    table["/help-all"] = TRIE_VALUE("/", ("help-all",))
+    assert table.longest_prefix("/help me") == ("/help", TRIE_VALUE("/", ("help",)))
+    assert table.longest_prefix("/help-all").key == "/help-all"
+    assert table.longest_prefix("/other").key == "/"
+    assert not table.longest_prefix("help")
+    assert table.longest_prefix("help").key is None
+    assert table.longest_prefix("help").value is None
+    assert table.items("/help") == [
+        ("/help", TRIE_VALUE("/", ("help",))),
+        ("/help-all", TRIE_VALUE("/", ("help-all",))),
+    ]
+    assert len(table.items()) == 3
+
+    del table["/help-all"]
+    assert table.longest_prefix("/help-all").key == "/help"
+    assert len(table) == 2
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     ("msg", "ignorecase", "type", "text", "expected"),
@@ -298,6 +444,71 @@ async def test_keyword(
         assert await dependent(event=event, state=state) == expected
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("msg", "text"),
+    [
+        (("ab", "a"), "abc"),
+        (("a", "ab"), "abc"),
+        (("c", "bc"), "abc"),
+        (("bc", "c"), "abc"),
+        (("c", "c\n"), "abc\n"),
+        (("\n",), "\n\n"),
+        (("", "c"), "abc"),
+        (("b",), "abc"),
+        (("abcd",), "abc"),
+        (("ab",), ""),
+    ],
+)
+async def test_literal(msg: Tuple[str, ...], text: str):
+    event = make_fake_event(_message=FakeMessage(text))()
+
+    prefix = re.match(f"^(?:{'|'.join(map(re.escape, msg))})", text)
+    state = {}
+    assert await StartswithRule(msg)(event, state) is bool(prefix)
+    assert state.get(STARTSWITH_KEY) == (prefix and prefix.group())
+
+    suffix = re.search(f"(?:{'|'.join(map(re.escape, msg))})$", text)
+    state = {}
+    assert await EndswithRule(msg)(event, state) is bool(suffix)
+    assert state.get(ENDSWITH_KEY) == (suffix and suffix.group())
+
+    key = text and next((k for k in msg if k in text), None)
+    state = {}
+    assert await KeywordsRule(*msg)(event, state) is bool(key)
+    assert state.get(KEYWORD_KEY) == (key or None)
+
+    result = LiteralRule.scan(text)
+    assert result is LiteralRule.scan(text)
+    assert all(literal in text for literal in result.found)
+
+
+@pytest.mark.asyncio
+async def test_literal_release(app: App):
+    literal = "release-literal"
+    first = KeywordsRule(literal)
+    second = StartswithRule((literal,))
+    assert LiteralRule.literals[literal] == 2
+
+    del first
+    gc.collect()
+    assert LiteralRule.literals[literal] == 1
+    assert literal in LiteralRule.scan(literal).found
+
+    del second
+    gc.collect()
+    assert literal not in LiteralRule.literals
+    assert literal not in LiteralRule.scan(literal).found
+
+    with app.provider.context({}):
+        matcher = on_keyword({literal})
+        assert LiteralRule.literals[literal] == 1
+        matcher.destroy()
+        del matcher
+        gc.collect()
+    assert literal not in LiteralRule.literals
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     ("cmds", "force_whitespace", "cmd", "whitespace", "arg_text", "expected"),
@@ -495,6 +706,28 @@ async def test_regex(
         assert result.span() == matched.span()
 
 
+@pytest.mark.parametrize(
+    ("pattern", "flags", "literal"),
+    [
+        (r"foo", 0, "foo"),
+        (r"^foo\d+barbaz$", 0, "barbaz"),
+        (r"(?P<key>ab)c", 0, "ab"),
+        (r"(?:hello)+ world", 0, " world"),
+        (r"(?:hello)* w", 0, " w"),
+        (r"foo|barbaz", 0, None),
+        (r"[abc]\d.", 0, None),
+        (r"foo", re.IGNORECASE, None),
+        (r"(?i)foo", 0, None),
+        (r"(?i:foo)b", 0, "b"),
+    ],
+)
+def test_regex_literal(pattern: str, flags: int, literal: Optional[str]):
+    checker = RegexRule(pattern, flags)
+    assert checker.literal == literal
+    if literal is not None:
+        assert literal in LiteralRule.scan(f"-{literal}-").found
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("expected", [True, False])
 async def test_to_me(expected: bool):
@@ -0,0 +1,190 @@
+import asyncio
+from typing import List, Tuple
+
+import pytest
+from nonebug import App
+
+from utils import make_fake_event
+from nonebot.message import (
+    EventBatcher,
+    EventScheduler,
+    handle_event,
+    get_event_scheduler,
+)
+
+
+def _handler(gate: asyncio.Event, handled: List[Tuple[str, str]]):
+    async def handler(bot, event) -> None:
+        await gate.wait()
+        handled.append((bot.self_id, event.get_event_name()))
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_scheduler_drop_oldest(app: App):
+    gate = asyncio.Event()
+    handled: List[Tuple[str, str]] = []
+    scheduler = EventScheduler(_handler(gate, handled), max_concurrency=1, queue_size=2)
+
+    async with app.test_api() as ctx:
+        bot = ctx.create_bot(self_id="bot")
+        for name in ("e1", "e2", "e3", "e4"):
+            assert scheduler.submit(bot, make_fake_event(_name=name)())
+
+        stats = scheduler.stats()
+        assert stats.running == 1
+        assert stats.queued == 2
+        assert stats.dropped == 1
+        assert stats.peak_queued == 2
+
+        gate.set()
+        while scheduler.running or scheduler.queued:
+            await asyncio.sleep(0)
+
+    assert handled == [("bot", "e1"), ("bot", "e3"), ("bot", "e4")]
+    stats = scheduler.stats()
+    assert stats.dispatched == 3
+    assert stats.wait_time_max >= stats.wait_time_avg > 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_bot_concurrency(app: App):
+    gate = asyncio.Event()
+    handled: List[Tuple[str, str]] = []
+    scheduler = EventScheduler(_handler(gate, handled), bot_concurrency=1)
+
+    async with app.test_api() as ctx:
+        bot1 = ctx.create_bot(self_id="bot1")
+        bot2 = ctx.create_bot(self_id="bot2")
+        scheduler.submit(bot1, make_fake_event(_name="e1")())
+        scheduler.submit(bot1, make_fake_event(_name="e2")())
+        scheduler.submit(bot2, make_fake_event(_name="e3")())
+        assert scheduler.running == 2
+        assert scheduler.queued == 1
+
+        gate.set()
+        await scheduler.shutdown()
+
+    assert sorted(handled) == [("bot1", "e1"), ("bot2", "e3")]
+    assert scheduler.stats().dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_overload_policy(app: App):
+    gate = asyncio.Event()
+    handled: List[Tuple[str, str]] = []
+    scheduler = EventScheduler(
+        _handler(gate, handled),
+        max_concurrency=1,
+        queue_size=2,
+        overload_policy="drop_meta_event",
+    )
+
+    async with app.test_api() as ctx:
+        bot = ctx.create_bot(self_id="bot")
+        scheduler.submit(bot, make_fake_event(_name="running")())
+        scheduler.submit(bot, make_fake_event(_name="msg")())
+        scheduler.submit(bot, make_fake_event(_type="meta_event", _name="meta")())
+        assert scheduler.submit(bot, make_fake_event(_name="new")())
+        assert not scheduler.submit(
+            bot, make_fake_event(_type="meta_event", _name="heartbeat")()
+        )
+        assert scheduler.stats().dropped == 1
+        assert scheduler.stats().rejected == 1
+
+        scheduler.configure(max_concurrency=1, queue_size=2, overload_policy="reject")
+        assert not scheduler.submit(bot, make_fake_event(_name="rejected")())
+        assert scheduler.stats().rejected == 2
+
+        gate.set()
+        while scheduler.running or scheduler.queued:
+            await asyncio.sleep(0)
+
+    assert handled == [("bot", "running"), ("bot", "msg"), ("bot", "new")]
+
+
+@pytest.mark.asyncio
+async def test_handle_event_scheduler(app: App, monkeypatch: pytest.MonkeyPatch):
+    gate = asyncio.Event()
+    handled: List[Tuple[str, str]] = []
+    scheduler = get_event_scheduler()
+    assert not scheduler.limited
+
+    monkeypatch.setattr(scheduler, "handler", _handler(gate, handled))
+    scheduler.configure(max_concurrency=1, queue_size=1, overload_policy="reject")
+    try:
+        assert scheduler.limited
+        async with app.test_api() as ctx:
+            bot = ctx.create_bot(self_id="bot")
+            first = asyncio.create_task(
+                handle_event(bot, make_fake_event(_name="e1")())
+            )
+            second = asyncio.create_task(
+                handle_event(bot, make_fake_event(_name="e2")())
+            )
+            await asyncio.sleep(0)
+            assert scheduler.running == 1
+            assert scheduler.queued == 1
+
+            rejected = scheduler.stats().rejected
+            await handle_event(bot, make_fake_event(_name="e3")())
+            assert scheduler.stats().rejected == rejected + 1
+
+            gate.set()
+            await asyncio.gather(first, second)
+            assert handled == [("bot", "e1"), ("bot", "e2")]
+    finally:
+        scheduler.configure()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_plugin_concurrency():
+    async def handler(bot, event) -> None: ...
+
+    scheduler = EventScheduler(handler)
+    async with scheduler.plugin_limit("plugin"):
+        pass
+
+    scheduler.configure(plugin_concurrency=1)
+    limit = scheduler.plugin_limit("plugin")
+    assert limit is scheduler.plugin_limit("plugin")
+    assert limit is not scheduler.plugin_limit("other")
+
+    async with limit:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limit.acquire(), 0.01)
+
+    with pytest.raises(ValueError, match="plugin_concurrency"):
+        scheduler.configure(plugin_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_event_batcher(app: App):
+    batches: List[Tuple[str, List[str]]] = []
+
+    async def handler(bot, events) -> None:
+        batches.append((bot.self_id, [event.get_event_name() for event in events]))
+
+    batcher = EventBatcher(handler, max_batch_size=2, max_delay=0.01)
+
+    async with app.test_api() as ctx:
+        bot1 = ctx.create_bot(self_id="bot1")
+        bot2 = ctx.create_bot(self_id="bot2")
+        for name in ("e1", "e2", "e3"):
+            batcher.submit(bot1, make_fake_event(_name=name)())
+        batcher.submit(bot2, make_fake_event(_name="e4")())
+        assert batcher.buffered == 2
+
+        await asyncio.sleep(0.05)
+        assert not batcher.buffered
+
+        batcher.submit(bot2, make_fake_event(_name="e5")())
+        await batcher.shutdown()
+
+    assert batches == [
+        ("bot1", ["e1", "e2"]),
+        ("bot1", ["e3"]),
+        ("bot2", ["e4"]),
+        ("bot2", ["e5"]),
+    ]
@@ -1,36 +1,80 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 import pytest
 
 from utils import make_fake_event
+from nonebot.message import SessionLanes, IgnoredException
 
 
 @pytest.mark.asyncio
-async def test_matcher_mutex():
-    from nonebot.plugins.single_session import matcher_mutex, _running_matcher
+async def test_session_lanes():
+    lanes = SessionLanes(max_depth=2)
+    order = []
 
-    am = asynccontextmanager(matcher_mutex)
+    async def run(session_id: str, name: str, gate: asyncio.Event):
+        async with lanes.enter(session_id):
+            order.append(f"{name} start")
+            await gate.wait()
+            order.append(f"{name} end")
+
+    gate = asyncio.Event()
+    tasks = [
+        asyncio.create_task(run("a", "a1", gate)),
+        asyncio.create_task(run("a", "a2", gate)),
+        asyncio.create_task(run("b", "b1", gate)),
+    ]
+    await asyncio.sleep(0)
+    assert order == ["a1 start", "b1 start"]
+    assert lanes.depth("a") == 2
+    assert len(lanes) == 2
+
+    with pytest.raises(asyncio.QueueFull):
+        async with lanes.enter("a"):
+            pass
+
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert order.index("a1 end") < order.index("a2 start")
+    assert not len(lanes)
+    assert lanes.depth("a") == 0
+
+
+@pytest.mark.asyncio
+async def test_session_lane():
+    from nonebot.plugins.single_session import session_lane, _session_lanes
+
+    lane = asynccontextmanager(session_lane)
     event = make_fake_event()()
     event_1 = make_fake_event()()
     event_2 = make_fake_event(_session_id="test1")()
     event_3 = make_fake_event(_session_id=None)()
 
-    async with am(event) as ctx:
-        assert ctx is False
-    assert not _running_matcher
-
-    async with am(event) as ctx:
-        async with am(event_1) as ctx_1:
-            assert ctx is False
-            assert ctx_1 is True
-    assert not _running_matcher
-
-    async with am(event) as ctx:
-        async with am(event_2) as ctx_2:
-            assert ctx is False
-            assert ctx_2 is False
-    assert not _running_matcher
-
-    async with am(event_3) as ctx_3:
-        assert ctx_3 is False
-    assert not _running_matcher
+    async with lane(event):
+        assert _session_lanes.depth("test") == 1
+        async with lane(event_2):
+            assert _session_lanes.depth("test1") == 1
+        async with lane(event_3):
+            pass
+        waiting_lane = lane(event_1)
+        waiting = asyncio.create_task(waiting_lane.__aenter__())
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        assert _session_lanes.depth("test") == 2
+    await waiting
+    assert _session_lanes.depth("test") == 1
+    await waiting_lane.__aexit__(None, None, None)
+    assert not len(_session_lanes)
+
+
+@pytest.mark.asyncio
+async def test_session_lane_full(monkeypatch: pytest.MonkeyPatch):
+    from nonebot.plugins import single_session
+
+    monkeypatch.setattr(single_session, "_session_lanes", SessionLanes(max_depth=1))
+    lane = asynccontextmanager(single_session.session_lane)
+
+    async with lane(make_fake_event()()):
+        with pytest.raises(IgnoredException):
+            async with lane(make_fake_event()()):
+                pass
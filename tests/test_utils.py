@@ -1,13 +1,27 @@
+import os
 import json
+import pickle
+import threading
+from copy import deepcopy
 from typing import Dict, List, Union, Literal, TypeVar, ClassVar
 
+import pytest
+
 from utils import FakeMessage, FakeMessageSegment
 from nonebot.utils import (
+    LayeredState,
+    CachedSyncPolicy,
     DataclassEncoder,
+    run_sync,
     escape_tag,
+    sync_policy,
+    get_sync_policy,
     is_gen_callable,
+    get_executor_stats,
     is_async_gen_callable,
     is_coroutine_callable,
+    shutdown_sync_executors,
+    configure_sync_executors,
     generic_check_issubclass,
 )
 
@@ -119,3 +133,88 @@ def test_dataclass_encoder():
         '"data": {"content": [{"type": "text", "data": {"text": "text"}}]}'
         "}"
     )
+
+
+def test_layered_state():
+    shared = {"a": 1, "b": 2}
+    state = LayeredState(shared)
+    sibling = LayeredState(shared)
+
+    state["a"] = 3
+    state["c"] = 4
+    assert state == {"a": 3, "b": 2, "c": 4}
+    assert sibling == {"a": 1, "b": 2}
+    assert shared == {"a": 1, "b": 2}
+
+    copied = state.copy()
+    copied["c"] = 5
+    assert state["c"] == 4
+
+    del state["b"]
+    assert "b" not in state
+    assert state.pop("a") == 3
+    assert state.pop("missing", None) is None
+    assert state == {"c": 4}
+    assert shared == {"a": 1, "b": 2}
+
+    sibling.clear()
+    assert not sibling
+    assert shared == {"a": 1, "b": 2}
+
+    layered = LayeredState(LayeredState(shared, {"c": 3}), {"a": 7})
+    assert isinstance(layered, dict)
+    assert len(layered) == 3
+    assert list(layered) == ["a", "b", "c"]
+    assert dict(layered) == {"a": 7, "b": 2, "c": 3}
+    assert {**layered} == {"a": 7, "b": 2, "c": 3}
+    assert json.loads(json.dumps(layered)) == {"a": 7, "b": 2, "c": 3}
+    assert layered.get("b") == 2
+    assert layered.setdefault("b", 5) == 2
+    assert deepcopy(layered) == layered
+    assert pickle.loads(pickle.dumps(layered)) == layered
+
+    merged = {"d": 6}
+    LayeredState(shared, {"a": 7}).merge_into(merged)
+    assert merged == {"a": 7, "b": 2, "d": 6}
+
+
+def _current_pid() -> int:
+    return os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_sync_policy():
+    @sync_policy("inline")
+    def inline_call() -> int:
+        return threading.get_ident()
+
+    @sync_policy("thread")
+    def thread_call() -> int:
+        return threading.get_ident()
+
+    assert get_sync_policy(inline_call) == "inline"
+    assert get_sync_policy(_current_pid) == "default"
+    cached = CachedSyncPolicy(_current_pid)
+    assert cached.get() == "default"
+
+    try:
+        assert await run_sync(inline_call)() == threading.get_ident()
+        assert await run_sync(thread_call)() != threading.get_ident()
+
+        stats = get_executor_stats()
+        assert stats["thread"].pending == 0
+        assert stats["thread"].queue_depth == 0
+
+        configure_sync_executors(
+            {f"{__name__}:_current_pid": "process"}, process_workers=1
+        )
+        assert get_sync_policy(_current_pid) == "process"
+        assert cached.get() == "process"
+        assert get_executor_stats()["process"].max_workers == 1
+        assert await run_sync(_current_pid)() != os.getpid()
+    finally:
+        configure_sync_executors()
+        shutdown_sync_executors()
+
+    assert get_sync_policy(_current_pid) == "default"
+    assert cached.get() == "default"
@@ -0,0 +1,115 @@
+import os
+import asyncio
+from collections import defaultdict
+
+import pytest
+from nonebug import App
+
+import nonebot
+from nonebot.worker import WorkerPool
+from utils import FakeBot, FakeAdapter, FakeMessageEvent
+from nonebot.message import handle_event, set_event_forwarder
+
+
+@pytest.mark.asyncio
+async def test_worker_pool(app: App):
+    sent = []
+
+    class EchoAdapter(FakeAdapter):
+        async def _call_api(self, bot, api: str, **data):
+            if api == "echo":
+                return data["text"]
+            sent.append(data["message"])
+
+    bot = FakeBot(EchoAdapter(nonebot.get_driver()), "bot")
+    events = [
+        FakeMessageEvent(text=f"msg{i}", session_id=f"s{i % 3}") for i in range(6)
+    ]
+
+    pool = WorkerPool(2, "dynamic.worker:init")
+    batches = []
+    send = pool._send
+
+    async def _send(worker, bot, kind, payload):
+        batches.append((kind, len(payload)))
+        await send(worker, bot, kind, payload)
+
+    pool._send = _send
+    await pool.start()
+    try:
+        await pool.handle_events(bot, events)
+    finally:
+        await pool.stop()
+
+    shards = {pool.shard(bot, event) for event in events}
+    assert len(batches) == len(shards)
+    assert all(kind == "events" for kind, _ in batches)
+    assert sum(size for _, size in batches) == len(events)
+
+    pids = defaultdict(set)
+    for message in sent:
+        text, pid = message.split(":")
+        assert int(pid) != os.getpid()
+        pids[pool.shard(bot, events[int(text[3:])])].add(pid)
+
+    assert sorted(message.split(":")[0] for message in sent) == [
+        f"msg{i}" for i in range(6)
+    ]
+    assert all(len(shard_pids) == 1 for shard_pids in pids.values())
+    assert len(set.union(*pids.values())) == len(pids)
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_forward(app: App):
+    sent = []
+
+    class EchoAdapter(FakeAdapter):
+        async def _call_api(self, bot, api: str, **data):
+            if api == "echo":
+                return data["text"]
+            sent.append(data["message"])
+
+    bot = FakeBot(EchoAdapter(nonebot.get_driver()), "bot")
+
+    pool = WorkerPool(1, "dynamic.worker:init")
+    await pool.start()
+    set_event_forwarder(pool)
+    try:
+        await handle_event(bot, FakeMessageEvent(text="forwarded", session_id="s"))
+    finally:
+        set_event_forwarder(None)
+        await pool.stop()
+
+    assert len(sent) == 1
+    text, pid = sent[0].split(":")
+    assert text == "forwarded"
+    assert int(pid) != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_respawn(app: App):
+    sent = []
+
+    class EchoAdapter(FakeAdapter):
+        async def _call_api(self, bot, api: str, **data):
+            if api == "echo":
+                return data["text"]
+            sent.append(data["message"])
+
+    bot = FakeBot(EchoAdapter(nonebot.get_driver()), "bot")
+
+    pool = WorkerPool(1, "dynamic.worker:init")
+    await pool.start()
+    try:
+        await pool.handle_event(bot, FakeMessageEvent(text="before", session_id="s"))
+        dead = pool._workers[0]
+        dead.process.kill()
+        while pool._workers[0] is dead:
+            await asyncio.sleep(0.01)
+
+        await pool.handle_event(bot, FakeMessageEvent(text="after", session_id="s"))
+    finally:
+        await pool.stop()
+
+    assert [message.split(":")[0] for message in sent] == ["before", "after"]
+    assert sent[0].split(":")[1] != sent[1].split(":")[1]
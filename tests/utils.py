@@ -3,7 +3,14 @@ from typing import Type, Union, Mapping, Iterable, Optional
 
 from pydantic import Extra, create_model
 
-from nonebot.adapters import Bot, Event, Adapter, Message, MessageSegment
+from nonebot.adapters import (
+    Bot,
+    Event,
+    Adapter,
+    Message,
+    MessageSegment,
+    CompactMessageSegment,
+)
 
 
 def escape_text(s: str, *, escape_comma: bool = True) -> str:
@@ -75,6 +82,43 @@ class FakeMessage(Message[FakeMessageSegment]):
         return super().__add__(other)
 
 
+class FakeCompactMessageSegment(CompactMessageSegment["FakeCompactMessage"]):
+    __slots__ = ()
+
+    @classmethod
+    @override
+    def get_message_class(cls):
+        return FakeCompactMessage
+
+    @override
+    def __str__(self) -> str:
+        return (self.plain_text or "") if self.type == "text" else f"[fake:{self.type}]"
+
+    @classmethod
+    def text(cls, text: str):
+        return cls("text", {"text": text})
+
+    @classmethod
+    def image(cls, url: str):
+        return cls("image", {"url": url})
+
+    @override
+    def is_text(self) -> bool:
+        return self.type == "text"
+
+
+class FakeCompactMessage(Message[FakeCompactMessageSegment]):
+    @classmethod
+    @override
+    def get_segment_class(cls):
+        return FakeCompactMessageSegment
+
+    @staticmethod
+    @override
+    def _construct(msg: str):
+        yield FakeCompactMessageSegment.text(msg)
+
+
 def make_fake_event(
     _base: Optional[Type[Event]] = None,
     _type: str = "message",
@@ -124,3 +168,42 @@ def make_fake_event(
             return _to_me
 
     return create_model("FakeEvent", __base__=FakeEvent, **fields)
+
+
+class FakeBot(Bot):
+    @override
+    async def send(self, event: Event, message: Union[str, Message], **kwargs):
+        return await self.call_api("send", message=str(message), **kwargs)
+
+
+class FakeMessageEvent(Event):
+    text: str
+    session_id: str = "test"
+
+    @override
+    def get_type(self) -> str:
+        return "message"
+
+    @override
+    def get_event_name(self) -> str:
+        return "message"
+
+    @override
+    def get_event_description(self) -> str:
+        return self.text
+
+    @override
+    def get_user_id(self) -> str:
+        return self.session_id
+
+    @override
+    def get_session_id(self) -> str:
+        return self.session_id
+
+    @override
+    def get_message(self) -> "Message":
+        return FakeMessage(self.text)
+
+    @override
+    def is_tome(self) -> bool:
+        return True